@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.adapters.password_hasher_argon2 import PasswordHasherArgon2
+from src.infrastructure.crypto import argon2_hasher
+
+PASSWORD = "Benchmark_pw123!"
+CLIENTS = 16
+LOGINS = 32
+
+def main():
+    password_hash = argon2_hasher.hash(PASSWORD)
+
+    start = time.perf_counter()
+    for _ in range(LOGINS):
+        assert argon2_hasher.verify(PASSWORD, password_hash)
+    serial = time.perf_counter() - start
+    print(f"{'serial (calling thread)':<32} {LOGINS / serial:8.1f} verifies/s")
+
+    for budget_mib in (64, 128, 256, 512):
+        hasher = PasswordHasherArgon2(memory_budget_mib=budget_mib, max_pending=LOGINS, timeout=60)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CLIENTS) as clients:
+            results = list(clients.map(lambda _: hasher.verify(PASSWORD, password_hash), range(LOGINS)))
+        elapsed = time.perf_counter() - start
+
+        assert all(results)
+        print(f"{f'pool, {budget_mib} MiB budget ({hasher.pool.max_workers} workers)':<32} {LOGINS / elapsed:8.1f} verifies/s")
+        hasher.pool.shutdown()
+
+    print(f"\n{os.cpu_count()} CPU core(s), {argon2_hasher.MEMORY_COST // 1024} MiB per verify, {CLIENTS} concurrent clients")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.crypto import fernet_box
+
+FIELD_COUNT = 100_000
+
+def _timed(label: str, function, *args):
+
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.3f} s  {FIELD_COUNT / elapsed:12,.0f} fields/s")
+    return result
+
+def main():
+    fernet_box.disable_decrypt_cache()
+    fields = [f"field-value-{i:06d}" for i in range(FIELD_COUNT)]
+
+    print(f"{FIELD_COUNT:,} fields, {fernet_box.BATCH_WORKERS} batch worker(s), chunk size {fernet_box.BATCH_CHUNK_SIZE}")
+
+    tokens = _timed("encrypt (scalar)", lambda: [fernet_box.encrypt(value) for value in fields])
+    _timed("encrypt_many", fernet_box.encrypt_many, fields)
+    _timed("decrypt (scalar)", lambda: [fernet_box.decrypt(token) for token in tokens])
+    plaintexts = _timed("decrypt_many", fernet_box.decrypt_many, tokens)
+
+    assert plaintexts == fields
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.infrastructure.crypto import aead_box, fernet_box
+
+ROW_COUNT = 20_000
+
+SAMPLE_ROW = ('Alexandra', 'van der Berg', 'Stationsplein', '12', '3011AB', 'alexandra@example.com',
+              '12345678', 'AB1234567')
+
+COLUMNS = ('first_name_enc', 'last_name_enc', 'street_enc', 'house_no_enc', 'zip_enc', 'email_enc',
+           'phone_enc', 'license_enc')
+
+def _timed(label: str, function, count: int):
+
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed:8.3f} s  {count / elapsed:12,.0f} fields/s")
+    return result
+
+def _database_size(rows) -> int:
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.db')
+        conn = sqlite3.connect(path)
+        conn.execute(f"CREATE TABLE travellers (id INTEGER PRIMARY KEY, {', '.join(f'{c} TEXT NOT NULL' for c in COLUMNS)})")
+        conn.executemany(f"INSERT INTO travellers ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", rows)
+        conn.commit()
+        conn.execute("VACUUM")
+        conn.close()
+        return os.path.getsize(path)
+
+def main():
+    fernet_box.disable_decrypt_cache()
+    plaintexts = [value for _ in range(ROW_COUNT) for value in SAMPLE_ROW]
+    field_count = len(plaintexts)
+
+    print(f"{ROW_COUNT:,} traveller rows, {field_count:,} encrypted fields")
+    print(f"\n{'Field':<12} {'Plain':>6} {'Fernet':>7} {'AES-GCM':>8}")
+    for value in SAMPLE_ROW:
+        print(f"{value[:12]:<12} {len(value):>6} {len(fernet_box.encrypt(value)):>7} {len(aead_box.encrypt(value)):>8}")
+
+    results = {}
+    for name, box in (('fernet', fernet_box), ('aesgcm', aead_box)):
+        print(f"\n{name}")
+        tokens = _timed("encrypt", lambda: [box.encrypt(value) for value in plaintexts], field_count)
+        decrypted = _timed("decrypt", lambda: [box.decrypt(token) for token in tokens], field_count)
+        assert decrypted == plaintexts
+
+        rows = [tokens[i:i + len(COLUMNS)] for i in range(0, field_count, len(COLUMNS))]
+        results[name] = _database_size(rows)
+        print(f"  {'database size':<22} {results[name] / 1024 / 1024:8.2f} MiB")
+
+    print(f"\nAES-GCM database is {results['aesgcm'] / results['fernet']:.0%} of the Fernet database")
+
+if __name__ == "__main__":
+    main()
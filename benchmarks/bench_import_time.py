@@ -0,0 +1,57 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    'src.infrastructure.config',
+    'src.infrastructure.crypto.fernet_box',
+    'src.infrastructure.crypto.argon2_hasher',
+    'src.infrastructure.logging.sec_logger',
+    'src.infrastructure.db.sqlite',
+    'src.application.facade',
+    'um_members',
+)
+
+RUNS = 5
+TOP_CONTRIBUTORS = 8
+
+def _import_times(module: str, cwd: str):
+
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import sys; sys.path.insert(0, {ROOT!r}); import {module}"],
+        cwd=cwd, capture_output=True, text=True, check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def main():
+    with tempfile.TemporaryDirectory() as cwd:
+        print(f"{RUNS} fresh interpreter(s) per module, best cumulative time, working directory {cwd}")
+        print(f"{'Module':<45} {'Import ms':>10}  Created data/")
+
+        slowest = None
+        for module in MODULES:
+            samples = [_import_times(module, cwd) for _ in range(RUNS)]
+            best = min(samples, key=lambda times: times[module][1])
+            created = os.path.exists(os.path.join(cwd, 'data'))
+            print(f"{module:<45} {best[module][1] / 1000:>10.1f}  {'yes' if created else 'no'}")
+
+            if slowest is None or best[module][1] > slowest[2]:
+                slowest = (module, best, best[module][1])
+
+        module, times, _ = slowest
+        print(f"\nLargest self times while importing {module}:")
+        for name, (self_us, cumulative_us) in sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:TOP_CONTRIBUTORS]:
+            print(f"  {name:<43} {self_us / 1000:>10.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+
+
+import functools
+import os
+from src.application.facade import App
+from src.application.concurrency import BoundedExecutor
+from src.application.async_ports import (
+    AsyncUserRepo, AsyncTravellerRepo, AsyncScooterRepo, AsyncRestoreCodeRepo, AsyncLogStateRepo,
+    AsyncPasswordHasher, AsyncCryptoBox, AsyncSecLogger, AsyncBackupStore, AsyncKeyManager, AsyncTokenHasher,
+    AsyncLoginRateLimiter
+)
+
+HASHING_OPERATIONS = frozenset({
+    'login', 'change_password', 'create_sys_admin', 'reset_sys_admin_password',
+    'create_service_engineer', 'reset_service_engineer_password'
+})
+
+CRYPTO_OPERATIONS = frozenset({
+    'search_travellers', 'view_logs', 'get_unread_suspicious_count', 'mark_all_seen',
+    'retire_old_encryption_keys'
+})
+
+BACKUP_OPERATIONS = frozenset({
+    'create_backup', 'restore_any_backup', 'restore_with_code'
+})
+
+class AsyncApp:
+    def __init__(self, app: App, db_workers: int = 8, hashing_workers: int = None, crypto_workers: int = None,
+                 backup_workers: int = 1, timeout: float = None):
+
+        cpu_count = os.cpu_count() or 1
+
+        self.app = app
+        self.db_executor = BoundedExecutor('um-db', db_workers, timeout=timeout)
+        self.hashing_executor = BoundedExecutor('um-hash', hashing_workers or min(4, cpu_count), timeout=timeout)
+        self.crypto_executor = BoundedExecutor('um-crypto', crypto_workers or cpu_count, timeout=timeout)
+        self.backup_executor = BoundedExecutor('um-backup', backup_workers, max_pending=0)
+
+        self.user_repo = AsyncUserRepo(app.user_repo, self.db_executor)
+        self.traveller_repo = AsyncTravellerRepo(app.traveller_repo, self.db_executor)
+        self.scooter_repo = AsyncScooterRepo(app.scooter_repo, self.db_executor)
+        self.restore_code_repo = AsyncRestoreCodeRepo(app.restore_code_repo, self.db_executor)
+        self.log_state_repo = AsyncLogStateRepo(app.log_state_repo, self.crypto_executor)
+        self.password_hasher = AsyncPasswordHasher(app.password_hasher, self.hashing_executor)
+        self.crypto_box = AsyncCryptoBox(app.crypto_box, self.crypto_executor)
+        self.logger = AsyncSecLogger(app.logger, self.crypto_executor)
+        self.backup_store = AsyncBackupStore(app.backup_store, self.backup_executor)
+        self.key_manager = AsyncKeyManager(app.key_manager, self.crypto_executor)
+        self.token_hasher = AsyncTokenHasher(app.token_hasher, self.hashing_executor)
+        self.login_rate_limiter = AsyncLoginRateLimiter(app.login_rate_limiter, self.db_executor)
+
+    def _executor_for(self, operation: str) -> BoundedExecutor:
+
+        if operation in HASHING_OPERATIONS:
+            return self.hashing_executor
+        if operation in CRYPTO_OPERATIONS:
+            return self.crypto_executor
+        if operation in BACKUP_OPERATIONS:
+            return self.backup_executor
+        return self.db_executor
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        method = getattr(self.app, name)
+        if not callable(method):
+            return method
+
+        executor = self._executor_for(name)
+
+        @functools.wraps(method)
+        async def call(*args, **kwargs):
+            return await executor.run(method, *args, **kwargs)
+
+        return call
+
+    def close(self, wait: bool = True):
+        for executor in (self.db_executor, self.hashing_executor, self.crypto_executor, self.backup_executor):
+            executor.shutdown(wait=wait)
+        self.app.close()
@@ -0,0 +1,199 @@
+
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from src.application.concurrency import AsyncPort
+
+class AsyncUserRepo(AsyncPort):
+    async def get_by_username_norm(self, username_norm: str) -> Optional[Dict[str, Any]]:
+        return await self._call('get_by_username_norm', username_norm)
+
+    async def add(self, username_norm: str, pw_hash: str, role: str, first_name: str, last_name: str,
+                  registered_at: str) -> int:
+        return await self._call('add', username_norm, pw_hash, role, first_name, last_name, registered_at)
+
+    async def update_password(self, user_id: int, new_hash: str) -> None:
+        return await self._call('update_password', user_id, new_hash)
+
+    async def cache_stats(self) -> Optional[Dict[str, Any]]:
+        return await self._call('cache_stats')
+
+class AsyncTravellerRepo(AsyncPort):
+    async def add(self, customer_id: str, first_name: str, last_name: str, birthday: str, gender: str, street: str,
+                  house_no: str, zip_code: str, city: str, email: str, phone: str, license: str,
+                  registered_at: str) -> int:
+        return await self._call('add', customer_id, first_name, last_name, birthday, gender, street, house_no,
+                                zip_code, city, email, phone, license, registered_at)
+
+    async def all(self) -> List[Dict[str, Any]]:
+        return await self._call('all')
+
+    async def get_by_id(self, traveller_id: int) -> Optional[Dict[str, Any]]:
+        return await self._call('get_by_id', traveller_id)
+
+    async def update(self, traveller_id: int, expected_version: int = None, **kwargs) -> bool:
+        return await self._call('update', traveller_id, expected_version, **kwargs)
+
+    async def delete(self, traveller_id: int) -> bool:
+        return await self._call('delete', traveller_id)
+
+    async def find_registered(self, emails: Iterable[str] = (), licenses: Iterable[str] = (),
+                              exclude_id: int = None) -> Dict[str, Set[str]]:
+        return await self._call('find_registered', emails, licenses, exclude_id)
+
+    async def backfill_lookup_hashes(self) -> int:
+        return await self._call('backfill_lookup_hashes')
+
+class AsyncScooterRepo(AsyncPort):
+    async def add(self, brand: str, model: str, serial_number: str, max_speed: int, battery_capacity: int, soc: int,
+                  latitude: float, longitude: float, in_service_date: str, status: str = 'active') -> int:
+        return await self._call('add', brand, model, serial_number, max_speed, battery_capacity, soc, latitude,
+                                longitude, in_service_date, status)
+
+    async def get_by_id(self, scooter_id: int):
+        return await self._call('get_by_id', scooter_id)
+
+    async def get_by_serial(self, serial_number: str):
+        return await self._call('get_by_serial', serial_number)
+
+    async def update(self, scooter_id: int, expected_version: int = None, **kwargs) -> bool:
+        return await self._call('update', scooter_id, expected_version, **kwargs)
+
+    async def find_ids(self, **filters) -> List[int]:
+        return await self._call('find_ids', **filters)
+
+    async def update_many(self, scooter_ids: List[int], **kwargs) -> Dict[str, Any]:
+        return await self._call('update_many', scooter_ids, **kwargs)
+
+    async def delete_many(self, scooter_ids: List[int]) -> Dict[str, Any]:
+        return await self._call('delete_many', scooter_ids)
+
+    async def search(self, search_term: str):
+        return await self._call('search', search_term)
+
+    async def all(self):
+        return await self._call('all')
+
+    async def delete(self, scooter_id: int) -> bool:
+        return await self._call('delete', scooter_id)
+
+    async def fleet_summary(self) -> Dict[str, Any]:
+        return await self._call('fleet_summary')
+
+    async def maintenance_due(self, cutoff_date: str = None, mileage_delta: int = None,
+                              include_out_of_service: bool = True, sort_by: str = 'last_maintenance_date',
+                              descending: bool = False, limit: int = 20,
+                              offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        return await self._call('maintenance_due', cutoff_date, mileage_delta, include_out_of_service, sort_by,
+                                descending, limit, offset)
+
+    async def snapshot(self):
+        return await self._call('snapshot')
+
+class AsyncRestoreCodeRepo(AsyncPort):
+    async def insert(self, backup_name: str, user_id: int, code_hash: str, lookup_id: str = None) -> int:
+        return await self._call('insert', backup_name, user_id, code_hash, lookup_id)
+
+    async def consume(self, user_id: int, backup_name: str, candidate_code: str,
+                      max_age_seconds: int = None) -> bool:
+        return await self._call('consume', user_id, backup_name, candidate_code, max_age_seconds)
+
+    async def purge(self, max_age_seconds: int) -> int:
+        return await self._call('purge', max_age_seconds)
+
+class AsyncLogStateRepo(AsyncPort):
+    async def get_unread_suspicious_count(self, user_id: int) -> int:
+        return await self._call('get_unread_suspicious_count', user_id)
+
+    async def mark_all_seen(self, user_id: int) -> None:
+        return await self._call('mark_all_seen', user_id)
+
+class AsyncPasswordHasher(AsyncPort):
+    async def hash(self, password: str) -> str:
+        return await self._call('hash', password)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._call('verify', password, password_hash)
+
+    async def needs_rehash(self, password_hash: str) -> bool:
+        return await self._call('needs_rehash', password_hash)
+
+class AsyncCryptoBox(AsyncPort):
+    async def encrypt(self, plaintext: str) -> Union[str, bytes]:
+        return await self._call('encrypt', plaintext)
+
+    async def decrypt(self, ciphertext: Union[str, bytes]) -> str:
+        return await self._call('decrypt', ciphertext)
+
+    async def encrypt_many(self, plaintexts: List[str]) -> List[Union[str, bytes]]:
+        return await self._call('encrypt_many', plaintexts)
+
+    async def decrypt_many(self, ciphertexts: List[Union[str, bytes]]) -> List[str]:
+        return await self._call('decrypt_many', ciphertexts)
+
+    async def invalidate_cache(self) -> None:
+        return await self._call('invalidate_cache')
+
+    async def cache_stats(self) -> Optional[Dict[str, Any]]:
+        return await self._call('cache_stats')
+
+class AsyncSecLogger(AsyncPort):
+    async def log(self, event: str, user: str = None, details: dict = None, suspicious: bool = False) -> None:
+        return await self._call('log', event, user, details, suspicious)
+
+    async def read_all(self) -> List[Dict[str, Any]]:
+        return await self._call('read_all')
+
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        return self._port.subscribe(listener)
+
+    def unsubscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        return self._port.unsubscribe(listener)
+
+class AsyncBackupStore(AsyncPort):
+    async def create_backup(self, progress=None, mode: str = 'full') -> str:
+        return await self._call('create_backup', progress, mode)
+
+    async def restore_from_backup(self, backup_name: str) -> None:
+        return await self._call('restore_from_backup', backup_name)
+
+class AsyncKeyManager(AsyncPort):
+    async def rotate_key(self) -> str:
+        return await self._call('rotate_key')
+
+    async def start_reencryption(self) -> bool:
+        return await self._call('start_reencryption')
+
+    async def stop_reencryption(self, timeout: float = None) -> bool:
+        return await self._call('stop_reencryption', timeout)
+
+    async def reencryption_status(self) -> Dict[str, Any]:
+        return await self._call('reencryption_status')
+
+    async def has_pending_reencryption(self) -> bool:
+        return await self._call('has_pending_reencryption')
+
+    async def retire_old_keys(self) -> int:
+        return await self._call('retire_old_keys')
+
+class AsyncTokenHasher(AsyncPort):
+    async def hash(self, token: str) -> str:
+        return await self._call('hash', token)
+
+    async def verify(self, token: str, token_hash: str) -> bool:
+        return await self._call('verify', token, token_hash)
+
+class AsyncLoginRateLimiter(AsyncPort):
+    async def is_locked(self, username: str) -> bool:
+        return await self._call('is_locked', username)
+
+    async def record_failure(self, username: str) -> bool:
+        return await self._call('record_failure', username)
+
+    async def clear(self, username: str) -> None:
+        return await self._call('clear', username)
+
+    async def prune(self) -> int:
+        return await self._call('prune')
+
+    async def stats(self) -> Dict[str, Any]:
+        return await self._call('stats')
@@ -0,0 +1,60 @@
+
+
+import asyncio
+import functools
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+class BoundedExecutor:
+    def __init__(self, name: str, max_workers: int, max_pending: int = None, timeout: float = None):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+
+        self.name = name
+        self.max_workers = max_workers
+        self.max_in_flight = max_workers + (max_workers if max_pending is None else max_pending)
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._semaphores = weakref.WeakKeyDictionary()
+        self._semaphores_lock = threading.Lock()
+
+    def _semaphore_for(self, loop):
+
+        with self._semaphores_lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_in_flight)
+            return semaphore
+
+    async def run(self, fn, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore_for(loop)
+
+        await semaphore.acquire()
+        try:
+            work = self._executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            semaphore.release()
+            raise
+        work.add_done_callback(functools.partial(_release_on_loop, loop, semaphore))
+
+        return await asyncio.wait_for(asyncio.wrap_future(work, loop=loop), self.timeout)
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+def _release_on_loop(loop, semaphore, _future):
+
+    try:
+        loop.call_soon_threadsafe(semaphore.release)
+    except RuntimeError:
+        pass
+
+class AsyncPort:
+    def __init__(self, port, executor: BoundedExecutor):
+        self._port = port
+        self._executor = executor
+
+    async def _call(self, name: str, *args, **kwargs):
+        return await self._executor.run(getattr(self._port, name), *args, **kwargs)
@@ -1,13 +1,18 @@
 
 
 import secrets
+from datetime import date, datetime, timedelta
 from src.application.use_cases.auth import login as auth_login, change_password as auth_change_password
+from src.application.security.anomaly import AnomalyDetector
 from src.application.security.acl import CurrentUser, require_admin, require_engineer_or_admin, require_super_admin
-from src.domain.validators import validate_username, validate_password, validate_zip, validate_phone, validate_license, validate_gender, validate_city, validate_birthday, validate_soc, validate_latitude, validate_longitude, validate_email
+from src.domain.validators import validate_username, validate_password, validate_zip, validate_phone, validate_license, validate_gender, validate_city, validate_birthday, validate_soc, validate_latitude, validate_longitude, validate_email, validate_date
 from src.domain.errors import ValidationError
-from src.domain.constants import ROLES
+from src.domain.constants import ROLES, BACKUP_MODES
 from src.domain.models import User, Traveller, RestoreCode
 from src.domain.policies import can_create_sys_admin, can_create_backup, can_generate_restore_code, can_restore_any_backup, can_restore_with_code, can_consume_restore_code
+from src.domain.policies import MAINTENANCE_INTERVAL_DAYS, MAINTENANCE_MILEAGE_INTERVAL, MAINTENANCE_PAGE_SIZE_MAX
+from src.domain.policies import HISTORY_RAW_DAYS, HISTORY_DOWNSAMPLE_MINUTES, HISTORY_RETENTION_DAYS
+from src.domain.policies import RESTORE_CODE_TTL_HOURS
 from src.domain.services import generate_customer_id
 from src.application.ports.user_repo import UserRepo
 from src.application.ports.traveller_repo import TravellerRepo
@@ -18,11 +23,21 @@ from src.application.ports.password_hasher import PasswordHasher
 from src.application.ports.crypto_box import CryptoBox
 from src.application.ports.sec_logger import SecLogger
 from src.application.ports.backup_store import BackupStore
+from src.application.ports.unit_of_work import UnitOfWork
+from src.application.ports.query_stats import QueryStats
+from src.application.ports.scooter_history_repo import ScooterHistoryRepo
+from src.application.ports.key_manager import KeyManager
+from src.application.ports.token_hasher import TokenHasher
+from src.application.ports.login_rate_limiter import LoginRateLimiter
+
+TELEMETRY_FIELDS = ('soc', 'latitude', 'longitude')
 
 class App:
     def __init__(self, user_repo: UserRepo, traveller_repo: TravellerRepo, scooter_repo: ScooterRepo, 
                  restore_code_repo: RestoreCodeRepo, log_state_repo: LogStateRepo, password_hasher: PasswordHasher, 
-                 crypto_box: CryptoBox, logger: SecLogger, backup_store: BackupStore):
+                 crypto_box: CryptoBox, logger: SecLogger, backup_store: BackupStore, unit_of_work: UnitOfWork,
+                 query_stats: QueryStats, scooter_history: ScooterHistoryRepo, key_manager: KeyManager,
+                 token_hasher: TokenHasher, login_rate_limiter: LoginRateLimiter):
 
         self.user_repo = user_repo
         self.traveller_repo = traveller_repo
@@ -33,6 +48,23 @@ class App:
         self.crypto_box = crypto_box
         self.logger = logger
         self.backup_store = backup_store
+        self.unit_of_work = unit_of_work
+        self.query_stats = query_stats
+        self.scooter_history = scooter_history
+        self.key_manager = key_manager
+        self.token_hasher = token_hasher
+        self.login_rate_limiter = login_rate_limiter
+
+        self.anomaly_detector = AnomalyDetector(on_anomaly=self._report_anomaly)
+        self.logger.subscribe(self.anomaly_detector.observe)
+
+    def close(self):
+        self.logger.unsubscribe(self.anomaly_detector.observe)
+
+    def _report_anomaly(self, anomaly: dict):
+        self.logger.log('suspicious_activity', anomaly['user'] or 'system',
+                        {'reason': anomaly['rule'], 'count': anomaly['count'],
+                         'window_seconds': anomaly['window_seconds']}, True)
     
     def login(self, username: str, password: str) -> CurrentUser:
         return auth_login(self, username, password)
@@ -69,15 +101,6 @@ class App:
     def update_sys_admin(self, current_user: CurrentUser, admin_username: str, **kwargs):
         require_super_admin(current_user)
         
-        
-        admin_user = self.user_repo.get_by_username_norm(admin_username)
-        if not admin_user:
-            raise ValidationError("System Admin not found")
-        
-        if admin_user['role'] != ROLES[1]:  
-            raise ValidationError("User is not a System Admin")
-        
-        
         update_data = {}
         
         if 'first_name' in kwargs:
@@ -88,59 +111,63 @@ class App:
         if not update_data:
             raise ValidationError("No valid fields to update")
         
-        
-        success = self.user_repo.update_profile(admin_user['id'], **update_data)
-        if not success:
-            raise ValidationError("Failed to update System Admin")
-        
-        self.logger.log('sys_admin_updated', current_user.username_norm, 
-                       {'updated_username': admin_username, 'updated_fields': list(update_data.keys())}, False)
+        with self.unit_of_work.begin():
+            admin_user = self.user_repo.get_by_username_norm(admin_username)
+            if not admin_user:
+                raise ValidationError("System Admin not found")
+            
+            if admin_user['role'] != ROLES[1]:  
+                raise ValidationError("User is not a System Admin")
+            
+            success = self.user_repo.update_profile(admin_user['id'], **update_data)
+            if not success:
+                raise ValidationError("Failed to update System Admin")
+            
+            self.logger.log('sys_admin_updated', current_user.username_norm, 
+                           {'updated_username': admin_username, 'updated_fields': list(update_data.keys())}, False)
         
         return True
     
     def delete_sys_admin(self, current_user: CurrentUser, admin_username: str):
         require_super_admin(current_user)
         
-        
-        admin_user = self.user_repo.get_by_username_norm(admin_username)
-        if not admin_user:
-            raise ValidationError("System Admin not found")
-        
-        if admin_user['role'] != ROLES[1]:  
-            raise ValidationError("User is not a System Admin")
-        
-        
-        success = self.user_repo.delete(admin_user['id'])
-        if not success:
-            raise ValidationError("Failed to delete System Admin")
-        
-        self.logger.log('sys_admin_deleted', current_user.username_norm, 
-                       {'deleted_username': admin_username}, False)
+        with self.unit_of_work.begin():
+            admin_user = self.user_repo.get_by_username_norm(admin_username)
+            if not admin_user:
+                raise ValidationError("System Admin not found")
+            
+            if admin_user['role'] != ROLES[1]:  
+                raise ValidationError("User is not a System Admin")
+            
+            success = self.user_repo.delete(admin_user['id'])
+            if not success:
+                raise ValidationError("Failed to delete System Admin")
+            
+            self.logger.log('sys_admin_deleted', current_user.username_norm, 
+                           {'deleted_username': admin_username}, False)
         
         return True
     
     def reset_sys_admin_password(self, current_user: CurrentUser, admin_username: str, new_password: str):
         require_super_admin(current_user)
         
-        
-        admin_user = self.user_repo.get_by_username_norm(admin_username)
-        if not admin_user:
-            raise ValidationError("System Admin not found")
-        
-        if admin_user['role'] != ROLES[1]:  
-            raise ValidationError("User is not a System Admin")
-        
-        
         validated_password = validate_password(new_password)
         new_hash = self.password_hasher.hash(validated_password)
         
-        
-        success = self.user_repo.update_password(admin_user['id'], new_hash)
-        if not success:
-            raise ValidationError("Failed to reset System Admin password")
-        
-        self.logger.log('sys_admin_password_reset', current_user.username_norm, 
-                       {'reset_username': admin_username}, False)
+        with self.unit_of_work.begin():
+            admin_user = self.user_repo.get_by_username_norm(admin_username)
+            if not admin_user:
+                raise ValidationError("System Admin not found")
+            
+            if admin_user['role'] != ROLES[1]:  
+                raise ValidationError("User is not a System Admin")
+            
+            success = self.user_repo.update_password(admin_user['id'], new_hash)
+            if not success:
+                raise ValidationError("Failed to reset System Admin password")
+            
+            self.logger.log('sys_admin_password_reset', current_user.username_norm, 
+                           {'reset_username': admin_username}, False)
         
         return True
     
@@ -178,34 +205,57 @@ class App:
             license=license_no
         )
         
-        self.traveller_repo.add(
-            traveller.customer_id,
-            traveller.first_name,
-            traveller.last_name,
-            traveller.birthday,
-            traveller.gender,
-            traveller.street,
-            traveller.house_no,
-            traveller.zip_code,
-            traveller.city,
-            traveller.email,
-            traveller.phone,
-            traveller.license,
-            traveller.registered_at
-        )
+        with self.unit_of_work.begin():
+            self._reject_registered_traveller(email, license_no)
+
+            self.traveller_repo.add(
+                traveller.customer_id,
+                traveller.first_name,
+                traveller.last_name,
+                traveller.birthday,
+                traveller.gender,
+                traveller.street,
+                traveller.house_no,
+                traveller.zip_code,
+                traveller.city,
+                traveller.email,
+                traveller.phone,
+                traveller.license,
+                traveller.registered_at
+            )
         return traveller.customer_id
+
+    def find_registered_travellers(self, current_user: CurrentUser, emails=(), licenses=()):
+        require_engineer_or_admin(current_user)
+        return self.traveller_repo.find_registered(list(emails), list(licenses))
+
+    def _reject_registered_traveller(self, email: str = None, license_no: str = None, exclude_id: int = None):
+        registered = self.traveller_repo.find_registered(
+            [email] if email is not None else [],
+            [license_no] if license_no is not None else [],
+            exclude_id
+        )
+
+        if registered['email']:
+            raise ValidationError("A traveller with this email address is already registered")
+        if registered['license']:
+            raise ValidationError("A traveller with this driving license is already registered")
     
     def search_travellers(self, current_user: CurrentUser, search_term: str):
         require_engineer_or_admin(current_user)
         travellers = self.traveller_repo.all()
+        names = self.crypto_box.decrypt_many(
+            [traveller[column] for traveller in travellers for column in ('first_name_enc', 'last_name_enc')]
+        )
+        
+        from src.domain.services import matches_partial
         
         matches = []
-        for traveller in travellers:
-            first_name = self.crypto_box.decrypt(traveller['first_name_enc'])
-            last_name = self.crypto_box.decrypt(traveller['last_name_enc'])
+        for index, traveller in enumerate(travellers):
+            first_name = names[2 * index]
+            last_name = names[2 * index + 1]
             customer_id = traveller['customer_id']
             
-            from src.domain.services import matches_partial
             if (matches_partial(first_name, search_term) or 
                 matches_partial(last_name, search_term) or 
                 matches_partial(customer_id, search_term)):
@@ -222,15 +272,9 @@ class App:
         
         return traveller
 
-    def update_traveller(self, current_user: CurrentUser, traveller_id: int, **kwargs):
+    def update_traveller(self, current_user: CurrentUser, traveller_id: int, expected_version: int = None, **kwargs):
         require_engineer_or_admin(current_user)
         
-        
-        traveller = self.traveller_repo.get_by_id(traveller_id)
-        if not traveller:
-            raise ValidationError("Traveller not found")
-        
-        
         update_data = {}
         
         if 'first_name' in kwargs:
@@ -259,38 +303,49 @@ class App:
         if not update_data:
             raise ValidationError("No valid fields to update")
         
-        success = self.traveller_repo.update(traveller_id, **update_data)
-        if not success:
-            raise ValidationError("Failed to update traveller")
-        
-        self.logger.log('traveller_updated', current_user.username_norm, 
-                       {'traveller_id': traveller_id, 'updated_fields': list(update_data.keys())}, False)
+        with self.unit_of_work.begin():
+            traveller = self.traveller_repo.get_by_id(traveller_id)
+            if not traveller:
+                raise ValidationError("Traveller not found")
+            
+            if 'email' in update_data or 'license' in update_data:
+                self._reject_registered_traveller(update_data.get('email'), update_data.get('license'), traveller_id)
+            
+            success = self.traveller_repo.update(traveller_id, expected_version, **update_data)
+            if not success:
+                raise ValidationError("Failed to update traveller")
+            
+            self.logger.log('traveller_updated', current_user.username_norm, 
+                           {'traveller_id': traveller_id, 'updated_fields': list(update_data.keys())}, False)
         
         return True
 
     def delete_traveller(self, current_user: CurrentUser, traveller_id: int):
         require_engineer_or_admin(current_user)
         
-        
-        traveller = self.traveller_repo.get_by_id(traveller_id)
-        if not traveller:
-            raise ValidationError("Traveller not found")
-        
-        success = self.traveller_repo.delete(traveller_id)
-        if not success:
-            raise ValidationError("Failed to delete traveller")
-        
-        self.logger.log('traveller_deleted', current_user.username_norm, 
-                       {'traveller_id': traveller_id}, False)
+        with self.unit_of_work.begin():
+            traveller = self.traveller_repo.get_by_id(traveller_id)
+            if not traveller:
+                raise ValidationError("Traveller not found")
+            
+            success = self.traveller_repo.delete(traveller_id)
+            if not success:
+                raise ValidationError("Failed to delete traveller")
+            
+            self.logger.log('traveller_deleted', current_user.username_norm, 
+                           {'traveller_id': traveller_id}, False)
         
         return True
     
-    def create_backup(self, current_user: CurrentUser):
+    def create_backup(self, current_user: CurrentUser, progress=None, mode: str = 'full'):
 
         if not can_create_backup(current_user.role):
             raise ValidationError("Access denied. Insufficient permissions.")
+
+        if mode not in BACKUP_MODES:
+            raise ValidationError(f"Backup type must be one of: {', '.join(BACKUP_MODES)}")
         
-        return self.backup_store.create_backup()
+        return self.backup_store.create_backup(progress, mode)
     
     def generate_restore_code(self, current_user: CurrentUser, backup_name: str, target_username: str):
 
@@ -305,11 +360,12 @@ class App:
         
         restore_code_model = RestoreCode.new(backup_name, target_user['id'])
         
-        restore_code = secrets.token_urlsafe(32)
-        code_hash = self.password_hasher.hash_token(restore_code)
+        lookup_id = secrets.token_urlsafe(8)
+        secret = secrets.token_urlsafe(32)
+        code_hash = self.token_hasher.hash(secret)
         
-        self.restore_code_repo.insert(backup_name, target_user['id'], code_hash)
-        return restore_code
+        self.restore_code_repo.insert(backup_name, target_user['id'], code_hash, lookup_id)
+        return f"{lookup_id}.{secret}"
     
     def restore_any_backup(self, current_user: CurrentUser, backup_name: str):
 
@@ -317,6 +373,7 @@ class App:
             raise ValidationError("Access denied. Super Admin cannot restore backups directly.")
         
         self.backup_store.restore_from_backup(backup_name)
+        self.traveller_repo.backfill_lookup_hashes()
         return True
     
     def restore_with_code(self, current_user: CurrentUser, backup_name: str, restore_code: str):
@@ -327,10 +384,12 @@ class App:
         if not can_consume_restore_code(current_user.role):
             raise ValidationError("Access denied. Super Admin cannot consume restore codes.")
         
-        success = self.restore_code_repo.consume(current_user.id, backup_name, restore_code)
+        success = self.restore_code_repo.consume(current_user.id, backup_name, restore_code.strip(),
+                                                 RESTORE_CODE_TTL_HOURS * 3600)
         
         if success:
             self.backup_store.restore_from_backup(backup_name)
+            self.traveller_repo.backfill_lookup_hashes()
             return True
         else:
             raise ValidationError("Invalid or already used restore code")
@@ -346,6 +405,59 @@ class App:
     def mark_all_seen(self, current_user: CurrentUser):
         require_admin(current_user)
         return self.log_state_repo.mark_all_seen(current_user.id)
+    
+    def view_query_stats(self, current_user: CurrentUser):
+        require_admin(current_user)
+        stats = self.query_stats.snapshot()
+        stats['decrypt_cache'] = self.crypto_box.cache_stats()
+        stats['user_cache'] = self.user_repo.cache_stats()
+        stats['login_rate_limiter'] = self.login_rate_limiter.stats()
+        stats['anomaly_detector'] = self.anomaly_detector.stats()
+        return stats
+    
+    def reset_query_stats(self, current_user: CurrentUser):
+        require_admin(current_user)
+        self.query_stats.reset()
+        
+        self.logger.log('query_stats_reset', current_user.username_norm, {}, False)
+
+    def encryption_key_status(self, current_user: CurrentUser):
+        require_super_admin(current_user)
+        return self.key_manager.reencryption_status()
+
+    def rotate_encryption_key(self, current_user: CurrentUser):
+        require_super_admin(current_user)
+
+        if self.key_manager.reencryption_status()['running']:
+            raise ValidationError("Re-encryption is still running. Wait for it to finish before rotating again.")
+
+        fingerprint = self.key_manager.rotate_key()
+        self.crypto_box.invalidate_cache()
+        self.key_manager.start_reencryption()
+
+        self.logger.log('encryption_key_rotated', current_user.username_norm, {'primary_key': fingerprint}, False)
+        return self.key_manager.reencryption_status()
+
+    def retire_old_encryption_keys(self, current_user: CurrentUser) -> int:
+        require_super_admin(current_user)
+
+        status = self.key_manager.reencryption_status()
+        if status['running']:
+            raise ValidationError("Re-encryption is still running. Wait for it to finish before retiring old keys.")
+        if status['key_count'] < 2:
+            raise ValidationError("There are no old keys to retire.")
+
+        try:
+            retired = self.key_manager.retire_old_keys()
+        except RuntimeError as e:
+            self.logger.log('encryption_keys_retire_refused', current_user.username_norm, {'reason': str(e)}, True)
+            raise ValidationError(str(e))
+        self.crypto_box.invalidate_cache()
+
+        self.logger.log('encryption_keys_retired', current_user.username_norm,
+                        {'retired': retired, 'warning': 'backups encrypted under retired keys can no longer be restored'},
+                        False)
+        return retired
 
     def add_scooter(self, current_user: CurrentUser, brand: str, model: str, serial_number: str, 
                     top_speed: int, battery_capacity: int, soc: int, target_soc_min: int, target_soc_max: int,
@@ -364,34 +476,37 @@ class App:
         latitude = validate_latitude(latitude)
         longitude = validate_longitude(longitude)
         mileage = int(mileage)
-        last_maintenance_date = _validate_input(last_maintenance_date, "Last maintenance date")
-        in_service_date = _validate_input(in_service_date, "In service date")
+        last_maintenance_date = validate_date(last_maintenance_date, "Last maintenance date")
+        in_service_date = validate_date(in_service_date, "In service date")
         status = _validate_input(status, "Status")
 
-        existing = self.scooter_repo.get_by_serial(serial_number)
-        if existing:
-            raise ValidationError("Scooter with this serial number already exists")
-
-        scooter_id = self.scooter_repo.add(
-            brand=brand,
-            model=model,
-            serial_number=serial_number,
-            top_speed=top_speed,
-            battery_capacity=battery_capacity,
-            soc=soc,
-            target_soc_min=target_soc_min,
-            target_soc_max=target_soc_max,
-            latitude=latitude,
-            longitude=longitude,
-            out_of_service=out_of_service,
-            mileage=mileage,
-            last_maintenance_date=last_maintenance_date,
-            in_service_date=in_service_date,
-            status=status
-        )
-
-        self.logger.log('scooter_created', current_user.username_norm, 
-                       {'scooter_id': scooter_id, 'serial_number': serial_number}, False)
+        with self.unit_of_work.begin():
+            existing = self.scooter_repo.get_by_serial(serial_number)
+            if existing:
+                raise ValidationError("Scooter with this serial number already exists")
+
+            scooter_id = self.scooter_repo.add(
+                brand=brand,
+                model=model,
+                serial_number=serial_number,
+                top_speed=top_speed,
+                battery_capacity=battery_capacity,
+                soc=soc,
+                target_soc_min=target_soc_min,
+                target_soc_max=target_soc_max,
+                latitude=latitude,
+                longitude=longitude,
+                out_of_service=out_of_service,
+                mileage=mileage,
+                last_maintenance_date=last_maintenance_date,
+                in_service_date=in_service_date,
+                status=status
+            )
+
+            self.scooter_history.record(scooter_id, soc, latitude, longitude)
+
+            self.logger.log('scooter_created', current_user.username_norm, 
+                           {'scooter_id': scooter_id, 'serial_number': serial_number}, False)
         
         return scooter_id
     
@@ -399,50 +514,192 @@ class App:
         require_engineer_or_admin(current_user)
         return self.scooter_repo.search(search_term)
     
-    def update_scooter(self, current_user: CurrentUser, scooter_id: int, **kwargs):
+    def update_scooter(self, current_user: CurrentUser, scooter_id: int, expected_version: int = None, **kwargs):
         require_engineer_or_admin(current_user)
 
-        scooter = self.scooter_repo.get_by_id(scooter_id)
-        if not scooter:
-            raise ValidationError("Scooter not found")
+        kwargs = _validate_scooter_updates(kwargs)
 
-        if 'soc' in kwargs:
-            kwargs['soc'] = validate_soc(kwargs['soc'])
-        if 'latitude' in kwargs:
-            kwargs['latitude'] = validate_latitude(kwargs['latitude'])
-        if 'longitude' in kwargs:
-            kwargs['longitude'] = validate_longitude(kwargs['longitude'])
-        if 'max_speed' in kwargs:
-            kwargs['max_speed'] = int(kwargs['max_speed'])
-        if 'battery_capacity' in kwargs:
-            kwargs['battery_capacity'] = int(kwargs['battery_capacity'])
+        with self.unit_of_work.begin():
+            scooter = self.scooter_repo.get_by_id(scooter_id)
+            if not scooter:
+                raise ValidationError("Scooter not found")
 
-        success = self.scooter_repo.update(scooter_id, **kwargs)
-        
-        if success:
+            if 'last_maintenance_date' in kwargs and 'last_maintenance_mileage' not in kwargs:
+                kwargs['last_maintenance_mileage'] = kwargs.get('mileage', scooter['mileage'])
+
+            success = self.scooter_repo.update(scooter_id, expected_version, **kwargs)
+            
+            if success:
+
+                if any(field in kwargs for field in TELEMETRY_FIELDS):
+                    current = {**scooter, **kwargs}
+                    self.scooter_history.record(scooter_id, current['soc'], current['latitude'], current['longitude'])
 
-            self.logger.log('scooter_updated', current_user.username_norm, 
-                           {'scooter_id': scooter_id, 'updates': list(kwargs.keys())}, False)
+                self.logger.log('scooter_updated', current_user.username_norm, 
+                               {'scooter_id': scooter_id, 'updates': list(kwargs.keys())}, False)
         
         return success
     
+    def batch_update_scooters(self, current_user: CurrentUser, scooter_ids: list = None, filters: dict = None, **kwargs):
+        require_engineer_or_admin(current_user)
+
+        updates = _validate_scooter_updates(kwargs)
+        if not updates:
+            raise ValidationError("No updates provided")
+
+        with self.unit_of_work.begin():
+            target_ids = self._resolve_scooter_batch(scooter_ids, filters)
+
+            try:
+                result = self.scooter_repo.update_many(target_ids, **updates)
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+            if any(field in updates for field in TELEMETRY_FIELDS):
+                for scooter_id in result['updated']:
+                    current = self.scooter_repo.get_by_id(scooter_id)
+                    self.scooter_history.record(scooter_id, current['soc'], current['latitude'], current['longitude'])
+
+            self.logger.log('scooters_batch_updated', current_user.username_norm, 
+                           {'requested': len(target_ids), 'updated': len(result['updated']),
+                            'failed': len(result['failed']), 'filters': filters or {},
+                            'updates': list(updates.keys())}, False)
+
+        return result
+
+    def batch_delete_scooters(self, current_user: CurrentUser, scooter_ids: list = None, filters: dict = None):
+        require_admin(current_user)
+
+        with self.unit_of_work.begin():
+            target_ids = self._resolve_scooter_batch(scooter_ids, filters)
+
+            result = self.scooter_repo.delete_many(target_ids)
+
+            self.logger.log('scooters_batch_deleted', current_user.username_norm, 
+                           {'requested': len(target_ids), 'deleted': len(result['deleted']),
+                            'failed': len(result['failed']), 'filters': filters or {},
+                            'scooter_ids': result['deleted']}, False)
+
+        return result
+
+    def _resolve_scooter_batch(self, scooter_ids, filters):
+        if (scooter_ids is None) == (not filters):
+            raise ValidationError("Provide either a list of scooter IDs or filters")
+
+        if scooter_ids is not None:
+            target_ids = list(dict.fromkeys(int(scooter_id) for scooter_id in scooter_ids))
+        else:
+            try:
+                target_ids = self.scooter_repo.find_ids(**filters)
+            except ValueError as e:
+                raise ValidationError(str(e))
+
+        if not target_ids:
+            raise ValidationError("No scooters match the selection")
+
+        return target_ids
+    
+    def get_scooter_history(self, current_user: CurrentUser, scooter_id: int, start: str, end: str):
+        require_engineer_or_admin(current_user)
+
+        start_ts = _parse_timestamp(start, "Start")
+        end_ts = _parse_timestamp(end, "End")
+        if end_ts < start_ts:
+            raise ValidationError("End must be after start")
+
+        samples = self.scooter_history.query_range(int(scooter_id), start_ts, end_ts)
+        for sample in samples:
+            sample['ts'] = datetime.fromtimestamp(sample['ts']).isoformat()
+        return samples
+
+    def apply_history_retention(self, current_user: CurrentUser):
+        require_admin(current_user)
+        return self._apply_history_retention(current_user.username_norm)
+
+    def run_maintenance_jobs(self):
+        return {
+            'scooter_history': self._apply_history_retention('system'),
+            'traveller_lookup_backfill': self.traveller_repo.backfill_lookup_hashes(),
+            'restore_codes_purged': self.restore_code_repo.purge(RESTORE_CODE_TTL_HOURS * 3600),
+            'login_buckets_pruned': self.login_rate_limiter.prune(),
+            'reencryption': self.key_manager.has_pending_reencryption() and self.key_manager.start_reencryption()
+        }
+
+    def _apply_history_retention(self, username: str):
+        result = self.scooter_history.apply_retention(
+            raw_seconds=HISTORY_RAW_DAYS * 86400,
+            resolution=HISTORY_DOWNSAMPLE_MINUTES * 60,
+            keep_seconds=HISTORY_RETENTION_DAYS * 86400
+        )
+
+        if result['purged'] or result['downsampled']:
+            self.logger.log('scooter_history_retention', username, result, False)
+
+        return result
+    
     def get_scooter(self, current_user: CurrentUser, scooter_id: int):
         require_engineer_or_admin(current_user)
         return self.scooter_repo.get_by_id(scooter_id)
     
+    def fleet_summary(self, current_user: CurrentUser):
+        require_admin(current_user)
+        return self.scooter_repo.fleet_summary()
+    
+    def fleet_snapshot(self, current_user: CurrentUser):
+        require_admin(current_user)
+        return self.scooter_repo.snapshot()
+    
+    def maintenance_due(self, current_user: CurrentUser, max_days: int = MAINTENANCE_INTERVAL_DAYS,
+                        max_mileage_delta: int = MAINTENANCE_MILEAGE_INTERVAL, include_out_of_service: bool = True,
+                        sort_by: str = 'last_maintenance_date', descending: bool = False,
+                        page: int = 1, page_size: int = 20):
+        require_engineer_or_admin(current_user)
+
+        if page < 1:
+            raise ValidationError("Page must be 1 or higher")
+        if page_size < 1 or page_size > MAINTENANCE_PAGE_SIZE_MAX:
+            raise ValidationError(f"Page size must be 1-{MAINTENANCE_PAGE_SIZE_MAX}")
+
+        cutoff_date = None
+        if max_days is not None:
+            cutoff_date = (date.today() - timedelta(days=int(max_days))).isoformat()
+        mileage_delta = int(max_mileage_delta) if max_mileage_delta is not None else None
+
+        try:
+            scooters, total = self.scooter_repo.maintenance_due(
+                cutoff_date=cutoff_date,
+                mileage_delta=mileage_delta,
+                include_out_of_service=include_out_of_service,
+                sort_by=sort_by,
+                descending=descending,
+                limit=page_size,
+                offset=(page - 1) * page_size
+            )
+        except ValueError as e:
+            raise ValidationError(str(e))
+
+        return {
+            'scooters': scooters,
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'pages': (total + page_size - 1) // page_size
+        }
+    
     def delete_scooter(self, current_user: CurrentUser, scooter_id: int):
         require_admin(current_user)
 
-        scooter = self.scooter_repo.get_by_id(scooter_id)
-        if not scooter:
-            raise ValidationError("Scooter not found")
+        with self.unit_of_work.begin():
+            scooter = self.scooter_repo.get_by_id(scooter_id)
+            if not scooter:
+                raise ValidationError("Scooter not found")
 
-        success = self.scooter_repo.delete(scooter_id)
-        
-        if success:
+            success = self.scooter_repo.delete(scooter_id)
+            
+            if success:
 
-            self.logger.log('scooter_deleted', current_user.username_norm, 
-                           {'scooter_id': scooter_id, 'serial_number': scooter['serial_number']}, False)
+                self.logger.log('scooter_deleted', current_user.username_norm, 
+                               {'scooter_id': scooter_id, 'serial_number': scooter['serial_number']}, False)
         
         return success
 
@@ -517,21 +774,52 @@ class App:
 
         validated_username = validate_username(engineer_username)
 
-        engineer = self.user_repo.get_by_username_norm(validated_username)
-        if not engineer:
-            raise ValidationError("Service Engineer not found")
-        
-        if engineer['role'] != ROLES[2]:
-            raise ValidationError("User is not a Service Engineer")
-
         validated_password = validate_password(new_password)
 
         new_hash = self.password_hasher.hash(validated_password)
 
-        self.user_repo.update_password(engineer['id'], new_hash)
-
-        self.logger.log('service_engineer_password_reset', current_user.username_norm, 
-                       {'engineer_username': validated_username}, False)
+        with self.unit_of_work.begin():
+            engineer = self.user_repo.get_by_username_norm(validated_username)
+            if not engineer:
+                raise ValidationError("Service Engineer not found")
+            
+            if engineer['role'] != ROLES[2]:
+                raise ValidationError("User is not a Service Engineer")
+
+            self.user_repo.update_password(engineer['id'], new_hash)
+
+            self.logger.log('service_engineer_password_reset', current_user.username_norm, 
+                           {'engineer_username': validated_username}, False)
+
+def _validate_scooter_updates(updates: dict) -> dict:
+    updates = dict(updates)
+
+    if 'soc' in updates:
+        updates['soc'] = validate_soc(updates['soc'])
+    if 'latitude' in updates:
+        updates['latitude'] = validate_latitude(updates['latitude'])
+    if 'longitude' in updates:
+        updates['longitude'] = validate_longitude(updates['longitude'])
+    if 'max_speed' in updates:
+        updates['max_speed'] = int(updates['max_speed'])
+    if 'battery_capacity' in updates:
+        updates['battery_capacity'] = int(updates['battery_capacity'])
+    if 'mileage' in updates:
+        updates['mileage'] = int(updates['mileage'])
+    if 'last_maintenance_date' in updates:
+        updates['last_maintenance_date'] = validate_date(updates['last_maintenance_date'], "Last maintenance date")
+    if 'status' in updates:
+        updates['status'] = _validate_input(updates['status'], "Status")
+    if 'out_of_service' in updates:
+        updates['out_of_service'] = 1 if updates['out_of_service'] else 0
+
+    return updates
+
+def _parse_timestamp(value: str, field: str) -> int:
+    try:
+        return int(datetime.fromisoformat(str(value)).timestamp())
+    except ValueError:
+        raise ValidationError(f"{field} must be YYYY-MM-DD or YYYY-MM-DDTHH:MM format")
 
 def _validate_input(value: str, field: str) -> str:
     if value is None:
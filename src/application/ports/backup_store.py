@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 
 class BackupStore(ABC):
     @abstractmethod
-    def create_backup(self) -> str:
+    def create_backup(self, progress=None, mode: str = 'full') -> str:
         pass
     
     @abstractmethod
@@ -1,12 +1,29 @@
 
 
 from abc import ABC, abstractmethod
+from typing import Optional, Dict, Any, List, Union
 
 class CryptoBox(ABC):
     @abstractmethod
-    def encrypt(self, plaintext: str) -> str:
+    def encrypt(self, plaintext: str) -> Union[str, bytes]:
         pass
     
     @abstractmethod
-    def decrypt(self, ciphertext: str) -> str:
+    def decrypt(self, ciphertext: Union[str, bytes]) -> str:
+        pass
+    
+    @abstractmethod
+    def encrypt_many(self, plaintexts: List[str]) -> List[Union[str, bytes]]:
+        pass
+    
+    @abstractmethod
+    def decrypt_many(self, ciphertexts: List[Union[str, bytes]]) -> List[str]:
+        pass
+    
+    @abstractmethod
+    def invalidate_cache(self) -> None:
+        pass
+    
+    @abstractmethod
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
         pass
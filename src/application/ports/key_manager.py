@@ -0,0 +1,29 @@
+
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+class KeyManager(ABC):
+    @abstractmethod
+    def rotate_key(self) -> str:
+        pass
+    
+    @abstractmethod
+    def start_reencryption(self) -> bool:
+        pass
+    
+    @abstractmethod
+    def stop_reencryption(self, timeout: float = None) -> bool:
+        pass
+    
+    @abstractmethod
+    def reencryption_status(self) -> Dict[str, Any]:
+        pass
+    
+    @abstractmethod
+    def has_pending_reencryption(self) -> bool:
+        pass
+    
+    @abstractmethod
+    def retire_old_keys(self) -> int:
+        pass
@@ -0,0 +1,25 @@
+
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+class LoginRateLimiter(ABC):
+    @abstractmethod
+    def is_locked(self, username: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def record_failure(self, username: str) -> bool:
+        pass
+    
+    @abstractmethod
+    def clear(self, username: str) -> None:
+        pass
+    
+    @abstractmethod
+    def prune(self) -> int:
+        pass
+    
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        pass
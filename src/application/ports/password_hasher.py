@@ -8,9 +8,9 @@ class PasswordHasher(ABC):
         pass
     
     @abstractmethod
-    def hash_token(self, token: str) -> str:
+    def verify(self, password: str, password_hash: str) -> bool:
         pass
     
     @abstractmethod
-    def verify(self, password: str, password_hash: str) -> bool:
+    def needs_rehash(self, password_hash: str) -> bool:
         pass
@@ -0,0 +1,13 @@
+
+
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+class QueryStats(ABC):
+    @abstractmethod
+    def snapshot(self) -> Dict[str, Any]:
+        pass
+    
+    @abstractmethod
+    def reset(self) -> None:
+        pass
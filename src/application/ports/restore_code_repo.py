@@ -4,9 +4,13 @@ from abc import ABC, abstractmethod
 
 class RestoreCodeRepo(ABC):
     @abstractmethod
-    def insert(self, backup_name: str, user_id: int, code_hash: str) -> int:
+    def insert(self, backup_name: str, user_id: int, code_hash: str, lookup_id: str = None) -> int:
         pass
     
     @abstractmethod
-    def consume(self, user_id: int, backup_name: str, candidate_code: str) -> bool:
+    def consume(self, user_id: int, backup_name: str, candidate_code: str, max_age_seconds: int = None) -> bool:
+        pass
+    
+    @abstractmethod
+    def purge(self, max_age_seconds: int) -> int:
         pass
@@ -0,0 +1,17 @@
+
+
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any
+
+class ScooterHistoryRepo(ABC):
+    @abstractmethod
+    def record(self, scooter_id: int, soc: int, latitude: float, longitude: float, ts: int = None) -> None:
+        pass
+    
+    @abstractmethod
+    def query_range(self, scooter_id: int, start_ts: int, end_ts: int) -> List[Dict[str, Any]]:
+        pass
+    
+    @abstractmethod
+    def apply_retention(self, raw_seconds: int, resolution: int, keep_seconds: int) -> Dict[str, int]:
+        pass
@@ -1,6 +1,7 @@
 
 
 from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Tuple
 
 class ScooterRepo(ABC):
     @abstractmethod
@@ -18,7 +19,19 @@ class ScooterRepo(ABC):
         pass
     
     @abstractmethod
-    def update(self, scooter_id: int, **kwargs) -> bool:
+    def update(self, scooter_id: int, expected_version: int = None, **kwargs) -> bool:
+        pass
+    
+    @abstractmethod
+    def find_ids(self, **filters) -> List[int]:
+        pass
+    
+    @abstractmethod
+    def update_many(self, scooter_ids: List[int], **kwargs) -> Dict[str, Any]:
+        pass
+    
+    @abstractmethod
+    def delete_many(self, scooter_ids: List[int]) -> Dict[str, Any]:
         pass
     
     @abstractmethod
@@ -32,3 +45,17 @@ class ScooterRepo(ABC):
     @abstractmethod
     def delete(self, scooter_id: int) -> bool:
         pass
+    
+    @abstractmethod
+    def fleet_summary(self) -> Dict[str, Any]:
+        pass
+    
+    @abstractmethod
+    def maintenance_due(self, cutoff_date: str = None, mileage_delta: int = None, include_out_of_service: bool = True,
+                        sort_by: str = 'last_maintenance_date', descending: bool = False,
+                        limit: int = 20, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        pass
+    
+    @abstractmethod
+    def snapshot(self):
+        pass
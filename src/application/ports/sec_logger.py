@@ -1,7 +1,7 @@
 
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Callable, List, Dict, Any
 
 class SecLogger(ABC):
     @abstractmethod
@@ -11,3 +11,11 @@ class SecLogger(ABC):
     @abstractmethod
     def read_all(self) -> List[Dict[str, Any]]:
         pass
+    
+    @abstractmethod
+    def subscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        pass
+
+    @abstractmethod
+    def unsubscribe(self, listener: Callable[[Dict[str, Any]], None]) -> None:
+        pass
@@ -0,0 +1,12 @@
+
+
+from abc import ABC, abstractmethod
+
+class TokenHasher(ABC):
+    @abstractmethod
+    def hash(self, token: str) -> str:
+        pass
+    
+    @abstractmethod
+    def verify(self, token: str, token_hash: str) -> bool:
+        pass
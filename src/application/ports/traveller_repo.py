@@ -1,7 +1,7 @@
 
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Set
 
 class TravellerRepo(ABC):
     @abstractmethod
@@ -18,9 +18,18 @@ class TravellerRepo(ABC):
         pass
     
     @abstractmethod
-    def update(self, traveller_id: int, **kwargs) -> bool:
+    def update(self, traveller_id: int, expected_version: int = None, **kwargs) -> bool:
         pass
     
     @abstractmethod
     def delete(self, traveller_id: int) -> bool:
+        pass
+    
+    @abstractmethod
+    def find_registered(self, emails: Iterable[str] = (), licenses: Iterable[str] = (),
+                        exclude_id: int = None) -> Dict[str, Set[str]]:
+        pass
+    
+    @abstractmethod
+    def backfill_lookup_hashes(self) -> int:
         pass
\ No newline at end of file
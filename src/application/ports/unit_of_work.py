@@ -0,0 +1,9 @@
+
+
+from abc import ABC, abstractmethod
+from typing import ContextManager
+
+class UnitOfWork(ABC):
+    @abstractmethod
+    def begin(self) -> ContextManager:
+        pass
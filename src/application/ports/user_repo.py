@@ -15,3 +15,7 @@ class UserRepo(ABC):
     @abstractmethod
     def update_password(self, user_id: int, new_hash: str) -> None:
         pass
+    
+    @abstractmethod
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        pass
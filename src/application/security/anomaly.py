@@ -0,0 +1,109 @@
+
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, FrozenSet
+from src.application.security.expiring_lru import ExpiringLRU
+from src.domain.policies import (
+    ANOMALY_EVENT_RATE_LIMIT, ANOMALY_EVENT_RATE_WINDOW_MINUTES,
+    ANOMALY_TRAVELLER_DELETE_LIMIT, ANOMALY_TRAVELLER_DELETE_WINDOW_MINUTES,
+    ANOMALY_RESTORE_FAILURE_LIMIT, ANOMALY_RESTORE_FAILURE_WINDOW_MINUTES,
+    ANOMALY_LOGIN_SPRAY_LIMIT, ANOMALY_LOGIN_SPRAY_WINDOW_MINUTES, ANOMALY_TRACKER_MAX_ENTRIES
+)
+
+IGNORED_EVENTS = frozenset({'suspicious_activity'})
+BUCKETS_PER_WINDOW = 12
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    threshold: int
+    window_seconds: int
+    events: Optional[FrozenSet[str]] = None
+    per_user: bool = True
+
+    def matches(self, event: str) -> bool:
+
+        return self.events is None or event in self.events
+
+DEFAULT_RULES = (
+    Rule('event_rate_spike', ANOMALY_EVENT_RATE_LIMIT, ANOMALY_EVENT_RATE_WINDOW_MINUTES * 60),
+    Rule('mass_traveller_deletes', ANOMALY_TRAVELLER_DELETE_LIMIT, ANOMALY_TRAVELLER_DELETE_WINDOW_MINUTES * 60,
+         frozenset({'traveller_deleted'})),
+    Rule('repeated_restore_failures', ANOMALY_RESTORE_FAILURE_LIMIT, ANOMALY_RESTORE_FAILURE_WINDOW_MINUTES * 60,
+         frozenset({'restore_failed'})),
+    Rule('login_failure_spray', ANOMALY_LOGIN_SPRAY_LIMIT, ANOMALY_LOGIN_SPRAY_WINDOW_MINUTES * 60,
+         frozenset({'login_failed'}), per_user=False)
+)
+
+class WindowCounter:
+    def __init__(self, window_seconds: float, buckets: int = BUCKETS_PER_WINDOW):
+        self.bucket_seconds = window_seconds / buckets
+        self._counts = [0] * buckets
+        self._current = None
+        self.total = 0
+
+    def add(self, now: float) -> int:
+        bucket = int(now // self.bucket_seconds)
+        size = len(self._counts)
+
+        if self._current is None or bucket - self._current >= size:
+            self._counts = [0] * size
+            self.total = 0
+        else:
+            for stale in range(self._current + 1, bucket + 1):
+                self.total -= self._counts[stale % size]
+                self._counts[stale % size] = 0
+
+        if self._current is None or bucket > self._current:
+            self._current = bucket
+        self._counts[bucket % size] += 1
+        self.total += 1
+        return self.total
+
+class AnomalyDetector:
+    def __init__(self, rules=DEFAULT_RULES, on_anomaly=None, max_entries: int = ANOMALY_TRACKER_MAX_ENTRIES,
+                 clock=time.monotonic):
+        self.rules = tuple(rules)
+        self.on_anomaly = on_anomaly
+        self._clock = clock
+        ttl = max(rule.window_seconds for rule in self.rules) if self.rules else 60
+        self._counters = ExpiringLRU(max_entries, ttl, clock=clock)
+        self._lock = threading.Lock()
+        self.flagged = 0
+
+    def observe(self, record: dict):
+        event = record.get('event')
+        if event in IGNORED_EVENTS:
+            return []
+
+        user = record.get('user')
+        now = self._clock()
+        anomalies = []
+
+        with self._lock:
+            for rule in self.rules:
+                if not rule.matches(event):
+                    continue
+
+                key = (rule.name, user if rule.per_user else None)
+                counter = self._counters.get(key) or WindowCounter(rule.window_seconds)
+                count = counter.add(now)
+                self._counters.put(key, counter)
+
+                if count == rule.threshold:
+                    anomalies.append({'rule': rule.name, 'user': key[1], 'count': count,
+                                      'window_seconds': rule.window_seconds})
+
+            self.flagged += len(anomalies)
+
+        if self.on_anomaly:
+            for anomaly in anomalies:
+                self.on_anomaly(anomaly)
+        return anomalies
+
+    def stats(self):
+        stats = self._counters.stats()
+        stats['flagged'] = self.flagged
+        return stats
@@ -0,0 +1,76 @@
+import threading
+import time
+from collections import OrderedDict
+
+class ExpiringLRU:
+    def __init__(self, max_entries: int, ttl_seconds: float, clock=time.monotonic, evict_when_full: bool = True):
+        if max_entries < 1 or ttl_seconds <= 0:
+            raise ValueError("Tracker limits must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self.evict_when_full = evict_when_full
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+        self.expirations = 0
+        self.rejections = 0
+
+    def _expire(self, now: float):
+
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+            self.expirations += 1
+
+    def get(self, key, default=None):
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            entry = self._entries.get(key)
+            return default if entry is None else entry[1]
+
+    def put(self, key, value) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            if key not in self._entries and len(self._entries) >= self.max_entries and not self.evict_when_full:
+                self.rejections += 1
+                return False
+
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl_seconds, value)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            return True
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            return default if entry is None else entry[1]
+
+    def purge(self) -> int:
+        with self._lock:
+            before = self.expirations
+            self._expire(self._clock())
+            return self.expirations - before
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'rejections': self.rejections
+            }
@@ -1,29 +1,48 @@
 
 
-from datetime import datetime, timedelta
-from collections import defaultdict, deque
-from src.domain.policies import FAILED_LOGIN_THRESHOLD, FAILED_LOGIN_WINDOW_MINUTES
+import time
+from collections import deque
+from src.application.security.expiring_lru import ExpiringLRU
+from src.domain.policies import FAILED_LOGIN_THRESHOLD, FAILED_LOGIN_WINDOW_MINUTES, LOGIN_COOLDOWN_MINUTES
+from src.domain.policies import FAILED_LOGIN_TRACKER_MAX_ENTRIES
 
-_failed_logins = defaultdict(lambda: deque())
-
-def _clean_old_attempts(username: str):
-    now = datetime.now()
-    cutoff = now - timedelta(minutes=FAILED_LOGIN_WINDOW_MINUTES)
-    
-    attempts = _failed_logins[username]
-    while attempts and attempts[0] < cutoff:
-        attempts.popleft()
+_failed_logins = ExpiringLRU(FAILED_LOGIN_TRACKER_MAX_ENTRIES, FAILED_LOGIN_WINDOW_MINUTES * 60)
+_cooldowns = ExpiringLRU(FAILED_LOGIN_TRACKER_MAX_ENTRIES, LOGIN_COOLDOWN_MINUTES * 60, evict_when_full=False)
 
 def is_failed_login_suspicious(username: str) -> bool:
-    _clean_old_attempts(username)
-    attempts = _failed_logins[username]
-    
-    return len(attempts) >= FAILED_LOGIN_THRESHOLD
+    attempts = _failed_logins.get(username)
+    if attempts is None or len(attempts) < FAILED_LOGIN_THRESHOLD:
+        return False
+
+    return attempts[0] >= time.monotonic() - FAILED_LOGIN_WINDOW_MINUTES * 60
 
 def record_failed_login(username: str):
-    now = datetime.now()
-    _failed_logins[username].append(now)
+    attempts = _failed_logins.get(username) or deque(maxlen=FAILED_LOGIN_THRESHOLD)
+    attempts.append(time.monotonic())
+    _failed_logins.put(username, attempts)
 
 def clear_failed_logins(username: str):
-    if username in _failed_logins:
-        del _failed_logins[username]
+    _failed_logins.pop(username)
+    _cooldowns.pop(username)
+
+def is_in_cooldown(username: str) -> bool:
+    if _cooldowns.get(username) is not None:
+        return True
+    return len(_cooldowns) >= _cooldowns.max_entries and is_failed_login_suspicious(username)
+
+def set_cooldown(username: str):
+    _cooldowns.put(username, True)
+
+def purge_expired() -> int:
+    return _failed_logins.purge() + _cooldowns.purge()
+
+def tracker_stats():
+    failed, cooldowns = _failed_logins.stats(), _cooldowns.stats()
+    return {
+        'entries': failed['entries'],
+        'locked': cooldowns['entries'],
+        'max_entries': failed['max_entries'],
+        'evictions': failed['evictions'] + cooldowns['evictions'],
+        'expirations': failed['expirations'] + cooldowns['expirations'],
+        'rejected_cooldowns': cooldowns['rejections']
+    }
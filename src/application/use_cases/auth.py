@@ -1,33 +1,13 @@
 
 
-from datetime import datetime, timedelta
 from src.domain.validators import validate_username, validate_password
 from src.domain.errors import ValidationError
 from src.domain.policies import can_change_password
-from src.application.security.suspicious import record_failed_login, is_failed_login_suspicious, clear_failed_logins
 from src.application.security.acl import CurrentUser
 
-COOLDOWN_THRESHOLD = 5
-COOLDOWN_MINUTES = 2
-
-_cooldowns = {}
-
-def _is_in_cooldown(username: str) -> bool:
-    if username in _cooldowns:
-        cooldown_until = _cooldowns[username]
-        if datetime.now() < cooldown_until:
-            return True
-        else:
-            del _cooldowns[username]
-    return False
-
-def _set_cooldown(username: str):
-    cooldown_until = datetime.now() + timedelta(minutes=COOLDOWN_MINUTES)
-    _cooldowns[username] = cooldown_until
-
 def login(app, username: str, password: str) -> CurrentUser:
 
-    if _is_in_cooldown(username):
+    if app.login_rate_limiter.is_locked(username.lower()):
         raise ValidationError("Please wait a moment before trying again")
     
     try:
@@ -38,12 +18,9 @@ def login(app, username: str, password: str) -> CurrentUser:
     except ValidationError:
         
         app.logger.log('login_failed', username, {'reason': 'invalid_username_format'}, False)
-        record_failed_login(username)
-        
         
-        if is_failed_login_suspicious(username):
+        if app.login_rate_limiter.record_failure(username.lower()):
             app.logger.log('suspicious_activity', username, {'reason': 'multiple_failed_logins'}, True)
-            _set_cooldown(username)
             raise ValidationError("Please wait a moment before trying again")
 
         raise ValidationError("Invalid credentials")
@@ -54,19 +31,21 @@ def login(app, username: str, password: str) -> CurrentUser:
 
     if not app.password_hasher.verify(password, user['pw_hash']):
 
-        record_failed_login(username_norm)
+        locked = app.login_rate_limiter.record_failure(username_norm)
 
         app.logger.log('login_failed', username_norm, {'attempt': 'failed'}, False)
 
-        if is_failed_login_suspicious(username_norm):
+        if locked:
             app.logger.log('suspicious_activity', username_norm, {'reason': 'multiple_failed_logins'}, True)
-            _set_cooldown(username_norm)
             raise ValidationError("Please wait a moment before trying again")
         
         raise ValidationError("Invalid credentials")
 
-    clear_failed_logins(username_norm)
+    app.login_rate_limiter.clear(username_norm)
     app.logger.log('login_success', username_norm, {'user_id': user['id']}, False)
+
+    if app.password_hasher.needs_rehash(user['pw_hash']):
+        _rehash_password(app, user, password)
     
     return CurrentUser(
         id=user['id'],
@@ -74,6 +53,15 @@ def login(app, username: str, password: str) -> CurrentUser:
         username_norm=username_norm
     )
 
+def _rehash_password(app, user: dict, password: str):
+    try:
+        new_hash = app.password_hasher.hash(password)
+    except (ValidationError, ValueError):
+        return
+
+    app.user_repo.update_password(user['id'], new_hash)
+    app.logger.log('password_rehashed', user['username_norm'], {'user_id': user['id']}, False)
+
 def change_password(app, current_user: CurrentUser, old_password: str, new_password: str):
 
     if not can_change_password(current_user.role):
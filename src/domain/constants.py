@@ -2,6 +2,8 @@
 
 ROLES = ("SUPER_ADMIN", "SYS_ADMIN", "ENGINEER")
 
+BACKUP_MODES = ("full", "incremental", "differential")
+
 CITIES = [
     "Amsterdam", "Rotterdam", "The Hague", "Utrecht", "Eindhoven",
     "Tilburg", "Groningen", "Almere", "Breda", "Nijmegen"
@@ -2,3 +2,9 @@
 
 class ValidationError(Exception):
     pass
+
+class ConflictError(ValidationError):
+    pass
+
+class BusyError(ValidationError):
+    pass
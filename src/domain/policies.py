@@ -4,6 +4,28 @@ from .constants import ROLES
 
 FAILED_LOGIN_THRESHOLD = 3
 FAILED_LOGIN_WINDOW_MINUTES = 5
+LOGIN_COOLDOWN_MINUTES = 2
+FAILED_LOGIN_TRACKER_MAX_ENTRIES = 10000
+
+MAINTENANCE_INTERVAL_DAYS = 180
+MAINTENANCE_MILEAGE_INTERVAL = 1000
+MAINTENANCE_PAGE_SIZE_MAX = 100
+
+HISTORY_RAW_DAYS = 7
+HISTORY_DOWNSAMPLE_MINUTES = 15
+HISTORY_RETENTION_DAYS = 365
+
+RESTORE_CODE_TTL_HOURS = 24
+
+ANOMALY_EVENT_RATE_LIMIT = 60
+ANOMALY_EVENT_RATE_WINDOW_MINUTES = 1
+ANOMALY_TRAVELLER_DELETE_LIMIT = 10
+ANOMALY_TRAVELLER_DELETE_WINDOW_MINUTES = 5
+ANOMALY_RESTORE_FAILURE_LIMIT = 3
+ANOMALY_RESTORE_FAILURE_WINDOW_MINUTES = 10
+ANOMALY_LOGIN_SPRAY_LIMIT = 20
+ANOMALY_LOGIN_SPRAY_WINDOW_MINUTES = 5
+ANOMALY_TRACKER_MAX_ENTRIES = 10000
 
 def can_create_sys_admin(role: str) -> bool:
 
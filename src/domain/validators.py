@@ -131,6 +131,17 @@ def validate_birthday(birthday: str) -> str:
     
     return birthday
 
+def validate_date(date_str: str, field: str = "Date") -> str:
+
+    try:
+        parsed = datetime.strptime(date_str, '%Y-%m-%d')
+    except (TypeError, ValueError):
+        raise ValidationError(f"{field} must be YYYY-MM-DD format")
+
+    date_str = _validate_input(parsed.strftime('%Y-%m-%d'), field)
+    
+    return date_str
+
 def validate_email(email: str) -> str:
 
     if not re.match(r'^[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+$', email):
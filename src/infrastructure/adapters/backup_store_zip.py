@@ -4,8 +4,8 @@ from src.application.ports.backup_store import BackupStore
 from src.infrastructure.backup.zip_store import create_backup, restore_from_backup
 
 class BackupStoreZip(BackupStore):
-    def create_backup(self) -> str:
-        return create_backup()
+    def create_backup(self, progress=None, mode: str = 'full') -> str:
+        return create_backup(progress, mode)
     
     def restore_from_backup(self, backup_name: str) -> None:
         return restore_from_backup(backup_name)
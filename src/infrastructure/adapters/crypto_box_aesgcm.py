@@ -0,0 +1,28 @@
+
+
+from src.application.ports.crypto_box import CryptoBox
+from src.infrastructure.crypto.aead_box import encrypt, decrypt, encrypt_many, decrypt_many
+from src.infrastructure.crypto.fernet_box import enable_decrypt_cache, clear_decrypt_cache, decrypt_cache_stats
+
+class CryptoBoxAesGcm(CryptoBox):
+    def __init__(self, legacy_cache_entries: int = 0, cache_max_bytes: int = 4 * 1024 * 1024):
+        if legacy_cache_entries:
+            enable_decrypt_cache(legacy_cache_entries, cache_max_bytes)
+
+    def encrypt(self, plaintext: str) -> bytes:
+        return encrypt(plaintext)
+    
+    def decrypt(self, ciphertext) -> str:
+        return decrypt(ciphertext)
+    
+    def encrypt_many(self, plaintexts):
+        return encrypt_many(plaintexts)
+    
+    def decrypt_many(self, ciphertexts):
+        return decrypt_many(ciphertexts)
+    
+    def invalidate_cache(self) -> None:
+        return clear_decrypt_cache()
+    
+    def cache_stats(self):
+        return decrypt_cache_stats()
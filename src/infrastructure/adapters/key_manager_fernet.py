@@ -0,0 +1,29 @@
+
+
+from src.application.ports.key_manager import KeyManager
+from src.infrastructure.crypto.reencryption import (
+    rotate_keys, start_background, stop_background, status, has_pending, retire_old_keys, CHUNK_SIZE, PAUSE_SECONDS
+)
+
+class KeyManagerFernet(KeyManager):
+    def __init__(self, chunk_size: int = CHUNK_SIZE, pause_seconds: float = PAUSE_SECONDS):
+        self.chunk_size = chunk_size
+        self.pause_seconds = pause_seconds
+    
+    def rotate_key(self) -> str:
+        return rotate_keys()
+    
+    def start_reencryption(self) -> bool:
+        return start_background(self.chunk_size, self.pause_seconds)
+    
+    def stop_reencryption(self, timeout: float = None) -> bool:
+        return stop_background(timeout)
+    
+    def reencryption_status(self):
+        return status()
+    
+    def has_pending_reencryption(self) -> bool:
+        return has_pending()
+    
+    def retire_old_keys(self) -> int:
+        return retire_old_keys()
@@ -0,0 +1,28 @@
+
+
+from typing import Dict, Any
+from src.application.ports.login_rate_limiter import LoginRateLimiter
+from src.application.security.suspicious import (
+    record_failed_login, is_failed_login_suspicious, clear_failed_logins, is_in_cooldown, set_cooldown,
+    purge_expired, tracker_stats
+)
+
+class LoginRateLimiterMemory(LoginRateLimiter):
+    def is_locked(self, username: str) -> bool:
+        return is_in_cooldown(username)
+    
+    def record_failure(self, username: str) -> bool:
+        record_failed_login(username)
+        if is_failed_login_suspicious(username):
+            set_cooldown(username)
+            return True
+        return False
+    
+    def clear(self, username: str) -> None:
+        clear_failed_logins(username)
+    
+    def prune(self) -> int:
+        return purge_expired()
+    
+    def stats(self) -> Dict[str, Any]:
+        return tracker_stats()
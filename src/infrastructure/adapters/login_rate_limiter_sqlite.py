@@ -0,0 +1,21 @@
+
+
+from typing import Dict, Any
+from src.application.ports.login_rate_limiter import LoginRateLimiter
+from src.infrastructure.db.rate_limit_sqlite import is_locked, record_failure, clear, prune, stats
+
+class LoginRateLimiterSqlite(LoginRateLimiter):
+    def is_locked(self, username: str) -> bool:
+        return is_locked(username)
+    
+    def record_failure(self, username: str) -> bool:
+        return record_failure(username)
+    
+    def clear(self, username: str) -> None:
+        return clear(username)
+    
+    def prune(self) -> int:
+        return prune()
+    
+    def stats(self) -> Dict[str, Any]:
+        return stats()
@@ -1,14 +1,32 @@
 
 
 from src.application.ports.password_hasher import PasswordHasher
-from src.infrastructure.crypto.argon2_hasher import hash, hash_token, verify
+from src.infrastructure.config import ARGON2_MEMORY_BUDGET_MIB, ARGON2_MAX_PENDING, ARGON2_TIMEOUT_SECONDS
+from src.infrastructure.crypto.argon2_hasher import hash, verify, needs_rehash, load_parameters, current_parameters, memory_cost_of
+from src.infrastructure.crypto.argon2_pool import Argon2Pool
 
 class PasswordHasherArgon2(PasswordHasher):
+    def __init__(self, memory_budget_mib: int = ARGON2_MEMORY_BUDGET_MIB, max_workers: int = None,
+                 max_pending: int = ARGON2_MAX_PENDING, timeout: float = ARGON2_TIMEOUT_SECONDS):
+        self.pool = Argon2Pool(
+            memory_budget_bytes=memory_budget_mib * 1024 * 1024,
+            memory_per_task_bytes=load_parameters()['memory_cost'] * 1024,
+            max_workers=max_workers,
+            max_pending=max_pending,
+            timeout=timeout
+        )
+
+    def _configured_memory_bytes(self) -> int:
+        memory_bytes = current_parameters()['memory_cost'] * 1024
+        self.pool.resize(memory_bytes)
+        return memory_bytes
+
     def hash(self, password: str) -> str:
-        return hash(password)
-    
-    def hash_token(self, token: str) -> str:
-        return hash_token(token)
+        return self.pool.run(hash, password, memory_bytes=self._configured_memory_bytes())
     
     def verify(self, password: str, password_hash: str) -> bool:
-        return verify(password, password_hash)
+        memory_bytes = max(self._configured_memory_bytes(), memory_cost_of(password_hash) * 1024)
+        return self.pool.run(verify, password, password_hash, memory_bytes=memory_bytes)
+    
+    def needs_rehash(self, password_hash: str) -> bool:
+        return needs_rehash(password_hash)
@@ -0,0 +1,11 @@
+
+
+from src.application.ports.query_stats import QueryStats
+from src.infrastructure.db.instrumentation import snapshot, reset
+
+class QueryStatsSqlite(QueryStats):
+    def snapshot(self):
+        return snapshot()
+    
+    def reset(self) -> None:
+        return reset()
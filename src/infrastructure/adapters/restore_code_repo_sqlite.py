@@ -1,11 +1,14 @@
 
 
 from src.application.ports.restore_code_repo import RestoreCodeRepo
-from src.infrastructure.db.restore_code_repo_sqlite import insert, consume
+from src.infrastructure.db.restore_code_repo_sqlite import insert, consume, purge
 
 class RestoreCodeRepoSqlite(RestoreCodeRepo):
-    def insert(self, backup_name: str, user_id: int, code_hash: str) -> int:
-        return insert(backup_name, user_id, code_hash)
+    def insert(self, backup_name: str, user_id: int, code_hash: str, lookup_id: str = None) -> int:
+        return insert(backup_name, user_id, code_hash, lookup_id)
     
-    def consume(self, user_id: int, backup_name: str, candidate_code: str) -> bool:
-        return consume(user_id, backup_name, candidate_code)
+    def consume(self, user_id: int, backup_name: str, candidate_code: str, max_age_seconds: int = None) -> bool:
+        return consume(user_id, backup_name, candidate_code, max_age_seconds)
+    
+    def purge(self, max_age_seconds: int) -> int:
+        return purge(max_age_seconds)
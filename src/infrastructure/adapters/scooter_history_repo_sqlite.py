@@ -0,0 +1,14 @@
+
+
+from src.application.ports.scooter_history_repo import ScooterHistoryRepo
+from src.infrastructure.db.scooter_history_repo_sqlite import record, query_range, apply_retention
+
+class ScooterHistoryRepoSqlite(ScooterHistoryRepo):
+    def record(self, scooter_id: int, soc: int, latitude: float, longitude: float, ts: int = None) -> None:
+        return record(scooter_id, soc, latitude, longitude, ts)
+    
+    def query_range(self, scooter_id: int, start_ts: int, end_ts: int):
+        return query_range(scooter_id, start_ts, end_ts)
+    
+    def apply_retention(self, raw_seconds: int, resolution: int, keep_seconds: int):
+        return apply_retention(raw_seconds, resolution, keep_seconds)
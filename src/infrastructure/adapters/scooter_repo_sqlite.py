@@ -2,7 +2,8 @@
 
 from src.application.ports.scooter_repo import ScooterRepo
 from src.infrastructure.db.scooter_repo_sqlite import (
-    add, get_by_id, get_by_serial, update, search, all, delete
+    add, get_by_id, get_by_serial, update, search, all, delete, fleet_summary, maintenance_due,
+    find_ids, update_many, delete_many
 )
 
 class ScooterRepoSqlite(ScooterRepo):
@@ -20,8 +21,17 @@ class ScooterRepoSqlite(ScooterRepo):
     def get_by_serial(self, serial_number: str):
         return get_by_serial(serial_number)
     
-    def update(self, scooter_id: int, **kwargs) -> bool:
-        return update(scooter_id, **kwargs)
+    def update(self, scooter_id: int, expected_version: int = None, **kwargs) -> bool:
+        return update(scooter_id, expected_version, **kwargs)
+    
+    def find_ids(self, **filters):
+        return find_ids(**filters)
+    
+    def update_many(self, scooter_ids, **kwargs):
+        return update_many(scooter_ids, **kwargs)
+    
+    def delete_many(self, scooter_ids):
+        return delete_many(scooter_ids)
     
     def search(self, search_term: str):
         return search(search_term)
@@ -31,3 +41,15 @@ class ScooterRepoSqlite(ScooterRepo):
     
     def delete(self, scooter_id: int) -> bool:
         return delete(scooter_id)
+    
+    def fleet_summary(self):
+        return fleet_summary()
+    
+    def maintenance_due(self, cutoff_date: str = None, mileage_delta: int = None, include_out_of_service: bool = True,
+                        sort_by: str = 'last_maintenance_date', descending: bool = False,
+                        limit: int = 20, offset: int = 0):
+        return maintenance_due(cutoff_date, mileage_delta, include_out_of_service, sort_by, descending, limit, offset)
+    
+    def snapshot(self):
+        from src.infrastructure.analytics.fleet_snapshot import load_snapshot
+        return load_snapshot()
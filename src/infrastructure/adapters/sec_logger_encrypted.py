@@ -1,11 +1,18 @@
 
 
 from src.application.ports.sec_logger import SecLogger
-from src.infrastructure.logging.sec_logger import log, read_all
+from src.infrastructure.db.sqlite import on_commit
+from src.infrastructure.logging.sec_logger import log, read_all, add_listener, remove_listener
 
 class SecLoggerEncrypted(SecLogger):
     def log(self, event: str, user: str = None, details: dict = None, suspicious: bool = False) -> None:
-        return log(event, user, details, suspicious)
+        on_commit(lambda: log(event, user, details, suspicious))
     
     def read_all(self):
         return read_all()
+    
+    def subscribe(self, listener) -> None:
+        return add_listener(listener)
+
+    def unsubscribe(self, listener) -> None:
+        return remove_listener(listener)
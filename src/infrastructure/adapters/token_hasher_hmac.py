@@ -0,0 +1,11 @@
+
+
+from src.application.ports.token_hasher import TokenHasher
+from src.infrastructure.crypto.token_hmac import hash, verify
+
+class TokenHasherHmac(TokenHasher):
+    def hash(self, token: str) -> str:
+        return hash(token)
+    
+    def verify(self, token: str, token_hash: str) -> bool:
+        return verify(token, token_hash)
@@ -1,7 +1,7 @@
 
 
 from src.application.ports.traveller_repo import TravellerRepo
-from src.infrastructure.db.traveller_repo_sqlite import add, all, get_by_id, update, delete
+from src.infrastructure.db.traveller_repo_sqlite import add, all, get_by_id, update, delete, find_registered, backfill_lookup_hashes
 
 class TravellerRepoSqlite(TravellerRepo):
     def add(self, customer_id: str, first_name: str, last_name: str, birthday: str, gender: str,
@@ -14,8 +14,14 @@ class TravellerRepoSqlite(TravellerRepo):
     def get_by_id(self, traveller_id: int):
         return get_by_id(traveller_id)
     
-    def update(self, traveller_id: int, **kwargs) -> bool:
-        return update(traveller_id, **kwargs)
+    def update(self, traveller_id: int, expected_version: int = None, **kwargs) -> bool:
+        return update(traveller_id, expected_version, **kwargs)
     
     def delete(self, traveller_id: int) -> bool:
         return delete(traveller_id)
+    
+    def find_registered(self, emails=(), licenses=(), exclude_id: int = None):
+        return find_registered(emails, licenses, exclude_id)
+    
+    def backfill_lookup_hashes(self) -> int:
+        return backfill_lookup_hashes()
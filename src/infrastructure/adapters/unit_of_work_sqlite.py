@@ -0,0 +1,8 @@
+
+
+from src.application.ports.unit_of_work import UnitOfWork
+from src.infrastructure.db.sqlite import unit_of_work
+
+class UnitOfWorkSqlite(UnitOfWork):
+    def begin(self):
+        return unit_of_work()
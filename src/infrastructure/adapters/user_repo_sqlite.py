@@ -1,7 +1,7 @@
 
 
 from src.application.ports.user_repo import UserRepo
-from src.infrastructure.db.user_repo_sqlite import get_by_username_norm, add, update_password, update_profile, delete
+from src.infrastructure.db.user_repo_sqlite import get_by_username_norm, add, update_password, update_profile, delete, cache_stats
 
 class UserRepoSqlite(UserRepo):
     def get_by_username_norm(self, username_norm: str):
@@ -18,3 +18,6 @@ class UserRepoSqlite(UserRepo):
     
     def delete(self, user_id: int) -> bool:
         return delete(user_id)
+    
+    def cache_stats(self):
+        return cache_stats()
@@ -0,0 +1,104 @@
+
+
+from dataclasses import dataclass
+import numpy as np
+from src.infrastructure.db.sqlite import db_connection
+
+STATUS_CODES = ('active', 'maintenance', 'retired')
+EARTH_RADIUS_KM = 6371.0
+
+@dataclass
+class FleetSnapshot:
+    ids: np.ndarray
+    soc: np.ndarray
+    target_soc_min: np.ndarray
+    target_soc_max: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    mileage: np.ndarray
+    status: np.ndarray
+    out_of_service: np.ndarray
+
+    def __len__(self):
+        return len(self.ids)
+
+    def below_target_mask(self) -> np.ndarray:
+
+        return self.soc < self.target_soc_min
+
+    def above_target_mask(self) -> np.ndarray:
+
+        return self.soc > self.target_soc_max
+
+    def status_mask(self, status: str) -> np.ndarray:
+
+        return self.status == STATUS_CODES.index(status)
+
+    def status_counts(self) -> dict:
+
+        counts = np.bincount(self.status, minlength=len(STATUS_CODES))
+        return {status: int(count) for status, count in zip(STATUS_CODES, counts)}
+
+    def soc_histogram(self, bins: int = 10):
+
+        return np.histogram(self.soc, bins=bins, range=(0, 100))
+
+    def distances_to(self, latitude: float, longitude: float) -> np.ndarray:
+
+        return _haversine_km(self.latitude, self.longitude, np.float64(latitude), np.float64(longitude))
+
+    def distance_matrix(self, latitudes=None, longitudes=None) -> np.ndarray:
+
+        if latitudes is None or longitudes is None:
+            latitudes, longitudes = self.latitude, self.longitude
+
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        return _haversine_km(self.latitude[:, np.newaxis], self.longitude[:, np.newaxis],
+                             latitudes[np.newaxis, :], longitudes[np.newaxis, :])
+
+    def subset(self, mask) -> 'FleetSnapshot':
+
+        return FleetSnapshot(
+            ids=self.ids[mask],
+            soc=self.soc[mask],
+            target_soc_min=self.target_soc_min[mask],
+            target_soc_max=self.target_soc_max[mask],
+            latitude=self.latitude[mask],
+            longitude=self.longitude[mask],
+            mileage=self.mileage[mask],
+            status=self.status[mask],
+            out_of_service=self.out_of_service[mask]
+        )
+
+def _haversine_km(lat1, lon1, lat2, lon2):
+
+    lat1, lon1, lat2, lon2 = np.radians(lat1), np.radians(lon1), np.radians(lat2), np.radians(lon2)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+def load_snapshot() -> FleetSnapshot:
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, soc, target_soc_min, target_soc_max, latitude, longitude, mileage,
+                   CASE status WHEN 'active' THEN 0 WHEN 'maintenance' THEN 1 ELSE 2 END,
+                   out_of_service
+            FROM scooters ORDER BY id
+        """)
+        rows = cursor.fetchall()
+
+    columns = list(zip(*rows)) if rows else [()] * 9
+
+    return FleetSnapshot(
+        ids=np.array(columns[0], dtype=np.int64),
+        soc=np.array(columns[1], dtype=np.int16),
+        target_soc_min=np.array(columns[2], dtype=np.int16),
+        target_soc_max=np.array(columns[3], dtype=np.int16),
+        latitude=np.array(columns[4], dtype=np.float64),
+        longitude=np.array(columns[5], dtype=np.float64),
+        mileage=np.array(columns[6], dtype=np.int64),
+        status=np.array(columns[7], dtype=np.int8),
+        out_of_service=np.array(columns[8], dtype=bool)
+    )
@@ -0,0 +1,119 @@
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+from src.infrastructure.config import DATABASE_FILE, BACKUP_FOLDER, ensure_directories_exist
+from src.infrastructure.db.sqlite import CHANGE_TRACKED_TABLES
+
+def create_temp_db():
+
+    ensure_directories_exist()
+    temp_fd, temp_path = tempfile.mkstemp(prefix='.tmp_', suffix='.db', dir=BACKUP_FOLDER)
+    os.fchmod(temp_fd, 0o600)
+    os.close(temp_fd)
+    return Path(temp_path)
+
+def read_change_state(conn):
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('change_log', 'backup_meta')")
+    if len(cursor.fetchall()) < 2:
+        return None, 0
+
+    cursor.execute("SELECT value FROM backup_meta WHERE key = 'epoch'")
+    row = cursor.fetchone()
+    cursor.execute("SELECT COALESCE(MAX(seq), 0) FROM change_log")
+    return (row[0] if row else None), cursor.fetchone()[0]
+
+def current_epoch():
+
+    conn = sqlite3.connect(DATABASE_FILE)
+    try:
+        return read_change_state(conn)[0]
+    finally:
+        conn.close()
+
+def create_delta_db(since_seq: int):
+
+    delta_db = create_temp_db()
+
+    conn = sqlite3.connect(DATABASE_FILE, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS delta", (str(delta_db),))
+        conn.execute("BEGIN")
+        try:
+            epoch, seq = read_change_state(conn)
+            conn.execute("""
+                CREATE TABLE delta.deleted_rows (
+                    table_name TEXT NOT NULL,
+                    row_id INTEGER NOT NULL,
+                    PRIMARY KEY (table_name, row_id)
+                )
+            """)
+
+            changed = {}
+            for table in CHANGE_TRACKED_TABLES:
+                conn.execute(f"CREATE TABLE delta.{table} AS SELECT * FROM main.{table} WHERE 0")
+                cursor = conn.execute(f"""
+                    INSERT INTO delta.{table}
+                    SELECT t.* FROM change_log c JOIN main.{table} t ON t.id = c.row_id
+                    WHERE c.seq > ? AND c.table_name = ?
+                """, (since_seq, table))
+                upserted = cursor.rowcount
+                cursor = conn.execute(f"""
+                    INSERT INTO delta.deleted_rows (table_name, row_id)
+                    SELECT c.table_name, c.row_id FROM change_log c
+                    WHERE c.seq > ? AND c.table_name = ?
+                      AND NOT EXISTS (SELECT 1 FROM main.{table} t WHERE t.id = c.row_id)
+                """, (since_seq, table))
+                changed[table] = {'upserted': upserted, 'deleted': cursor.rowcount}
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("DETACH DATABASE delta")
+
+    except Exception:
+        conn.close()
+        if delta_db.exists():
+            delta_db.unlink()
+        raise
+
+    conn.close()
+    return delta_db, epoch, seq, changed
+
+def _columns(conn, schema: str, table: str):
+
+    return [(row[1], row[2]) for row in conn.execute(f"PRAGMA {schema}.table_info({table})").fetchall()]
+
+def apply_delta(target_db, delta_db):
+
+    conn = sqlite3.connect(target_db, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS delta", (str(delta_db),))
+        conn.execute("BEGIN")
+        try:
+            for table in CHANGE_TRACKED_TABLES:
+                conn.execute(f"""
+                    DELETE FROM main.{table} WHERE id IN (
+                        SELECT row_id FROM delta.deleted_rows WHERE table_name = ?
+                    )
+                """, (table,))
+
+                existing = {name for name, _ in _columns(conn, 'main', table)}
+                columns = _columns(conn, 'delta', table)
+                for name, declared_type in columns:
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE main.{table} ADD COLUMN {name} {declared_type}")
+
+                column_list = ', '.join(name for name, _ in columns)
+                conn.execute(f"INSERT OR REPLACE INTO main.{table} ({column_list}) SELECT {column_list} FROM delta.{table}")
+
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("DETACH DATABASE delta")
+    finally:
+        conn.close()
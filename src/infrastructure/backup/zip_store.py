@@ -3,76 +3,91 @@
 import zipfile
 import shutil
 import os
+import json
 import sqlite3
 from datetime import datetime
-from pathlib import Path
-from src.infrastructure.config import DATABASE_FILE, BACKUP_FOLDER
+from src.infrastructure.config import DATABASE_FILE, BACKUP_FOLDER, ensure_directories_exist
 from src.infrastructure.logging.sec_logger import log
+from src.infrastructure.backup.incremental import read_change_state, current_epoch, create_delta_db, apply_delta, create_temp_db
+
+CORE_TABLES = ('users', 'travellers')
+BACKUP_PAGES_PER_STEP = 256
+BACKUP_STEP_SLEEP_SECONDS = 0.005
+BACKUP_MAX_RESTARTS = 3
+MANIFEST_NAME = 'manifest.json'
+DELTA_FILE_NAME = 'delta.db'
+BACKUP_SUFFIXES = {'full': '_um.zip', 'incremental': '_um_incr.zip', 'differential': '_um_diff.zip'}
+
+def _drop_non_core_objects(conn):
+
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT type, name FROM sqlite_master
+        WHERE type IN ('view', 'table', 'trigger') AND name NOT LIKE 'sqlite_%'
+    """)
+    objects = [(kind, name) for kind, name in cursor.fetchall() if name not in CORE_TABLES]
 
-def _create_selective_backup_db():
-
-    import tempfile
+    for kind, name in sorted(objects, key=lambda item: item[0] == 'table'):
+        conn.execute(f'DROP {kind.upper()} IF EXISTS "{name.replace(chr(34), chr(34) * 2)}"')
 
-    CORE_TABLES = ['users', 'travellers']
-    
-    def _validate_table_name(table_name: str) -> bool:
+    cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'")
+    if cursor.fetchone():
+        placeholders = ','.join('?' for _ in CORE_TABLES)
+        conn.execute(f"DELETE FROM sqlite_sequence WHERE name NOT IN ({placeholders})", CORE_TABLES)
 
-        return table_name in CORE_TABLES
+    conn.commit()
 
-    temp_fd, temp_path = tempfile.mkstemp(suffix='.db')
-    temp_db = Path(temp_path)
-    
-    try:
+class _BackupRestarted(Exception):
+    pass
 
-        with sqlite3.connect(DATABASE_FILE) as source_conn:
-            with sqlite3.connect(temp_db) as target_conn:
+def _copy_database(source_conn, target_conn, progress=None):
 
-                for table in CORE_TABLES:
+    state = {'remaining': None, 'total': None, 'restarts': 0}
 
-                    if not _validate_table_name(table):
-                        raise ValueError(f"Invalid table name: {table}")
+    def _report(status, remaining, total):
+        if state['remaining'] is not None and remaining > state['remaining']:
+            state['restarts'] += 1
+            if state['restarts'] > BACKUP_MAX_RESTARTS:
+                raise _BackupRestarted()
+        state['remaining'], state['total'] = remaining, total
+        if progress:
+            progress(total - remaining, total)
 
-                    cursor = source_conn.cursor()
-                    cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table}'")
-                    schema = cursor.fetchone()
-                    
-                    if schema:
+    try:
+        source_conn.backup(target_conn, pages=BACKUP_PAGES_PER_STEP, progress=_report,
+                           sleep=BACKUP_STEP_SLEEP_SECONDS)
+    except _BackupRestarted:
+        source_conn.backup(target_conn, pages=-1)
+        if progress:
+            progress(state['total'], state['total'])
 
-                        target_conn.execute(schema[0])
+def _create_selective_backup_db(progress=None):
 
-                        cursor.execute(f"SELECT * FROM {table}")
-                        rows = cursor.fetchall()
-                        
-                        if rows:
+    temp_db = create_temp_db()
 
-                            cursor.execute(f"PRAGMA table_info({table})")
-                            columns = [col[1] for col in cursor.fetchall()]
-                            placeholders = ','.join(['?' for _ in columns])
-
-                            target_conn.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})", rows)
-
-                cursor = source_conn.cursor()
-                cursor.execute("SELECT sql FROM sqlite_master WHERE type='index' AND sql IS NOT NULL")
-                indexes = cursor.fetchall()
-                
-                for index in indexes:
-                    index_sql = index[0]
+    try:
+        source_conn = sqlite3.connect(DATABASE_FILE)
+        target_conn = sqlite3.connect(temp_db)
+        try:
+            _copy_database(source_conn, target_conn, progress)
+        finally:
+            source_conn.close()
+
+        try:
+            target_conn.execute("PRAGMA journal_mode=DELETE")
+            epoch, seq = read_change_state(target_conn)
+            _drop_non_core_objects(target_conn)
+            target_conn.execute("VACUUM")
+        finally:
+            target_conn.close()
 
-                    if any(table in index_sql for table in CORE_TABLES):
-                        target_conn.execute(index_sql)
-                
-                target_conn.commit()
-                
     except Exception as e:
 
         if temp_db.exists():
             temp_db.unlink()
         raise e
-    finally:
 
-        os.close(temp_fd)
-    
-    return temp_db
+    return temp_db, epoch, seq
 
 def _merge_restore_data(restored_db_path):
 
@@ -101,13 +116,10 @@ def _merge_restore_data(restored_db_path):
 
 def _backup_session_tables():
 
-    import tempfile
-    
     if not DATABASE_FILE.exists():
         return None
     
-    temp_fd, temp_path = tempfile.mkstemp(suffix='.db')
-    temp_db = Path(temp_path)
+    temp_db = create_temp_db()
     
     try:
         with sqlite3.connect(DATABASE_FILE) as source_conn:
@@ -143,10 +155,7 @@ def _backup_session_tables():
     except Exception as e:
         if temp_db.exists():
             temp_db.unlink()
-        os.close(temp_fd)
         return None
-    finally:
-        os.close(temp_fd)
     
     return temp_db
 
@@ -158,7 +167,8 @@ def _create_session_tables(conn):
             granted_to_user_id INTEGER NOT NULL,
             code_hash TEXT NOT NULL,
             used INTEGER DEFAULT 0,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            lookup_id TEXT
         )
     """)
     
@@ -194,30 +204,123 @@ def _restore_session_tables(target_conn, session_backup_path):
         
         target_conn.commit()
 
-def create_backup():
+def _read_manifest(backup_path):
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    backup_name = f"{timestamp}_um.zip"
-    backup_path = BACKUP_FOLDER / backup_name
-    
-    try:
+    with zipfile.ZipFile(backup_path, 'r') as zipf:
+        names = zipf.namelist()
+        if MANIFEST_NAME in names:
+            return json.loads(zipf.read(MANIFEST_NAME))
+        if DATABASE_FILE.name in names:
+            return {'type': 'full', 'name': backup_path.name, 'parent': None, 'epoch': None, 'seq': None}
+    return None
 
-        temp_db = _create_selective_backup_db()
-        
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            if temp_db.exists():
-                zipf.write(temp_db, DATABASE_FILE.name)
+def _find_parent(mode: str, epoch: str):
 
-        if temp_db.exists():
-            temp_db.unlink()
+    if epoch is None:
+        return None
+
+    candidates = []
+    for backup_path in BACKUP_FOLDER.glob('*.zip'):
+        try:
+            manifest = _read_manifest(backup_path)
+        except (zipfile.BadZipFile, ValueError, KeyError):
+            continue
 
-        log('backup_created', 'system', {'backup_name': backup_name}, False)
+        if not manifest or manifest.get('epoch') != epoch or manifest.get('seq') is None:
+            continue
+        if mode == 'differential' and manifest['type'] != 'full':
+            continue
+        candidates.append(manifest)
+
+    if not candidates:
+        return None
+    return max(candidates, key=lambda manifest: (manifest['seq'], manifest['name']))
+
+def create_backup(progress=None, mode: str = 'full'):
+
+    if mode not in BACKUP_SUFFIXES:
+        raise ValueError(f"Unknown backup mode: {mode}")
+
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    temp_db = None
+    
+    try:
+        ensure_directories_exist()
+
+        parent = _find_parent(mode, current_epoch()) if mode != 'full' else None
+        if parent is None:
+            mode = 'full'
+
+        if mode == 'full':
+            temp_db, epoch, seq = _create_selective_backup_db(progress)
+            manifest = {'type': 'full', 'parent': None, 'base': None}
+            archive_name = DATABASE_FILE.name
+        else:
+            temp_db, epoch, seq, changed = create_delta_db(parent['seq'])
+            manifest = {'type': mode, 'parent': parent['name'], 'base': parent.get('base') or parent['name'],
+                        'changed': changed}
+            archive_name = DELTA_FILE_NAME
+
+        backup_name = f"{timestamp}{BACKUP_SUFFIXES[mode]}"
+        counter = 1
+        while (BACKUP_FOLDER / backup_name).exists():
+            counter += 1
+            backup_name = f"{timestamp}_{counter}{BACKUP_SUFFIXES[mode]}"
+        manifest.update({'name': backup_name, 'epoch': epoch, 'seq': seq, 'created_at': datetime.now().isoformat()})
+        if manifest['base'] is None:
+            manifest['base'] = backup_name
+
+        with zipfile.ZipFile(BACKUP_FOLDER / backup_name, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            zipf.write(temp_db, archive_name)
+            zipf.writestr(MANIFEST_NAME, json.dumps(manifest))
+
+        log('backup_created', 'system', {'backup_name': backup_name, 'type': mode, 'parent': manifest['parent']}, False)
         
         return backup_name
         
     except Exception as e:
         log('backup_failed', 'system', {'error': str(e)}, True)
         raise e
+    finally:
+        if temp_db is not None and temp_db.exists():
+            temp_db.unlink()
+
+def _resolve_chain(backup_name: str):
+
+    chain = []
+    seen = set()
+    name = backup_name
+
+    while True:
+        backup_path = BACKUP_FOLDER / name
+        if not backup_path.exists():
+            raise FileNotFoundError(f"Backup {name} in the chain of {backup_name} not found")
+
+        manifest = _read_manifest(backup_path)
+        if manifest is None:
+            raise ValueError(f"Backup {name} does not contain database file")
+
+        if chain and manifest.get('epoch') != chain[0][1]['epoch']:
+            raise ValueError(f"Backup {name} does not belong to the chain of {backup_name}")
+
+        chain.append((backup_path, manifest))
+        if manifest['type'] == 'full':
+            break
+
+        seen.add(name)
+        name = manifest['parent']
+        if name in seen:
+            raise ValueError(f"Backup chain of {backup_name} is cyclic")
+
+    chain.reverse()
+    return chain
+
+def _extract_member(backup_path, member: str, target_path):
+
+    with zipfile.ZipFile(backup_path, 'r') as zipf:
+        with zipf.open(member) as source:
+            with open(target_path, 'wb') as target:
+                shutil.copyfileobj(source, target)
 
 def restore_from_backup(backup_name: str):
 
@@ -228,13 +331,13 @@ def restore_from_backup(backup_name: str):
         raise FileNotFoundError(f"Backup {backup_name} not found")
 
     try:
-        with zipfile.ZipFile(backup_path, 'r') as zipf:
-            if DATABASE_FILE.name not in zipf.namelist():
-                log('restore_failed', 'system', {'backup_name': backup_name, 'reason': 'invalid_backup_format'}, True)
-                raise ValueError(f"Backup {backup_name} does not contain database file")
+        chain = _resolve_chain(backup_name)
     except zipfile.BadZipFile:
         log('restore_failed', 'system', {'backup_name': backup_name, 'reason': 'corrupted_backup'}, True)
         raise ValueError(f"Backup {backup_name} is corrupted or not a valid zip file")
+    except (FileNotFoundError, ValueError, KeyError) as e:
+        log('restore_failed', 'system', {'backup_name': backup_name, 'reason': 'invalid_backup_format'}, True)
+        raise ValueError(str(e))
 
     log('restore_started', 'system', {'backup_name': backup_name}, False)
 
@@ -242,10 +345,17 @@ def restore_from_backup(backup_name: str):
     
     try:
 
-        with zipfile.ZipFile(backup_path, 'r') as zipf:
-            with zipf.open(DATABASE_FILE.name) as source:
-                with open(temp_db, 'wb') as target:
-                    shutil.copyfileobj(source, target)
+        base_path = chain[0][0]
+        _extract_member(base_path, DATABASE_FILE.name, temp_db)
+
+        temp_delta = DATABASE_FILE.with_suffix('.delta')
+        try:
+            for delta_path, _ in chain[1:]:
+                _extract_member(delta_path, DELTA_FILE_NAME, temp_delta)
+                apply_delta(temp_db, temp_delta)
+        finally:
+            if temp_delta.exists():
+                temp_delta.unlink()
 
         temp_db_file = open(temp_db, 'rb+')
         temp_db_file.flush()
@@ -254,10 +364,19 @@ def restore_from_backup(backup_name: str):
 
         _merge_restore_data(temp_db)
 
-        if DATABASE_FILE.exists():
-            DATABASE_FILE.unlink()
-        
-        shutil.move(str(temp_db), str(DATABASE_FILE))
+        restored_conn = sqlite3.connect(temp_db)
+        live_conn = sqlite3.connect(DATABASE_FILE)
+        try:
+            restored_conn.backup(live_conn)
+        finally:
+            restored_conn.close()
+            live_conn.close()
+        temp_db.unlink()
+
+        from src.infrastructure.db.sqlite import migrate
+        from src.infrastructure.db.user_repo_sqlite import clear_cache
+        migrate()
+        clear_cache()
 
         log('restore_completed', 'system', {'backup_name': backup_name}, False)
         
@@ -4,12 +4,35 @@ from pathlib import Path
 
 DATA_DIR = Path("data")
 DATABASE_FILE = DATA_DIR / "app.db"
+RATE_LIMIT_DATABASE_FILE = DATA_DIR / "ratelimit.db"
 ENCRYPTION_KEY_FILE = DATA_DIR / "keys" / "app.key"
+FIELD_KEY_FILE = DATA_DIR / "keys" / "fields.key"
+LOOKUP_KEY_FILE = DATA_DIR / "keys" / "lookup.key"
+TOKEN_KEY_FILE = DATA_DIR / "keys" / "token.key"
 ENCRYPTION_LOGS_FILE = DATA_DIR / "logs.enc"
+ENCRYPTION_LOGS_LOCK_FILE = DATA_DIR / "logs.lock"
 BACKUP_FOLDER = DATA_DIR / "backups"
+SLOW_QUERY_LOG_FILE = DATA_DIR / "slow_queries.log"
+ARGON2_PARAMS_FILE = DATA_DIR / "argon2_params.json"
+
+SLOW_QUERY_THRESHOLD_MS = 100
+
+USER_CACHE_MAX_ENTRIES = 256
+USER_CACHE_TTL_SECONDS = 30.0
+
+FIELD_ENCRYPTION = "aesgcm"
+
+ARGON2_MEMORY_BUDGET_MIB = 256
+ARGON2_MAX_PENDING = 32
+ARGON2_TIMEOUT_SECONDS = 10.0
+
+_directories_ready = False
 
 def ensure_directories_exist():
+    global _directories_ready
+    if _directories_ready:
+        return
+
     for directory in [DATA_DIR, DATA_DIR / "keys", DATA_DIR / "backups"]:
         directory.mkdir(parents=True, exist_ok=True)
-
-ensure_directories_exist()
\ No newline at end of file
+    _directories_ready = True
\ No newline at end of file
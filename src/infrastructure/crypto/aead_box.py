@@ -0,0 +1,173 @@
+
+
+import base64
+import hashlib
+import os
+import struct
+import threading
+from src.infrastructure.config import FIELD_KEY_FILE
+from src.infrastructure.crypto import fernet_box
+
+FORMAT_VERSION = 1
+KEY_ID_SIZE = 4
+NONCE_SIZE = 12
+HEADER = struct.Struct('>B4s')
+OVERHEAD = HEADER.size + NONCE_SIZE + 16
+
+def _write_keys(keys):
+
+    FIELD_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = FIELD_KEY_FILE.with_suffix('.tmp')
+    with open(temp_file, 'wb') as f:
+        f.write(b'\n'.join(base64.urlsafe_b64encode(key) for key in keys) + b'\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(temp_file, 0o600)
+    os.replace(temp_file, FIELD_KEY_FILE)
+
+def _get_keys():
+    if FIELD_KEY_FILE.exists():
+        with open(FIELD_KEY_FILE, 'rb') as f:
+            return [base64.urlsafe_b64decode(line.strip()) for line in f.read().splitlines() if line.strip()]
+    else:
+        keys = [os.urandom(32)]
+        _write_keys(keys)
+        return keys
+
+def _key_file_mtime():
+
+    try:
+        return FIELD_KEY_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+def _key_id(key: bytes) -> bytes:
+
+    return hashlib.sha256(key).digest()[:KEY_ID_SIZE]
+
+_key_lock = threading.RLock()
+_key_mtime = None
+_keyring = None
+
+def _install_keys(keys):
+    global _key_mtime, _keyring
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+    _key_mtime = _key_file_mtime()
+    _keyring = (tuple(keys), _key_id(keys[0]), {_key_id(key): AESGCM(key) for key in reversed(keys)})
+
+def _get_keyring():
+
+    keyring = _keyring
+    if keyring is None:
+        with _key_lock:
+            if _keyring is None:
+                _install_keys(_get_keys())
+            keyring = _keyring
+    return keyring
+
+def reload_keys() -> bool:
+    global _key_mtime
+    with _key_lock:
+        keys = _get_keys()
+        if _keyring is not None and tuple(keys) == _keyring[0]:
+            _key_mtime = _key_file_mtime()
+            return False
+        _install_keys(keys)
+        return True
+
+def _reload_if_rotated():
+
+    if _keyring is not None and _key_file_mtime() != _key_mtime:
+        reload_keys()
+    return _get_keyring()
+
+def primary_key_fingerprint() -> str:
+    keys, _, _ = _get_keyring()
+    return hashlib.sha256(keys[0]).hexdigest()[:16]
+
+def key_count() -> int:
+    keys, _, _ = _get_keyring()
+    return len(keys)
+
+def rotate_key() -> str:
+    with _key_lock:
+        keys = [os.urandom(32)] + _get_keys()
+        _write_keys(keys)
+        _install_keys(keys)
+        return primary_key_fingerprint()
+
+def retire_old_keys() -> int:
+    with _key_lock:
+        keys = _get_keys()
+        _write_keys(keys[:1])
+        _install_keys(keys[:1])
+        return len(keys) - 1
+
+def _encrypt_with(keyring, text: str) -> bytes:
+
+    _, primary_id, ciphers = keyring
+    header = HEADER.pack(FORMAT_VERSION, primary_id)
+    nonce = os.urandom(NONCE_SIZE)
+    return header + nonce + ciphers[primary_id].encrypt(nonce, text.encode(), header)
+
+def encrypt(text: str) -> bytes:
+    return _encrypt_with(_reload_if_rotated(), text)
+
+def _decrypt(token: bytes) -> str:
+    from cryptography.exceptions import InvalidTag
+
+    if len(token) < OVERHEAD:
+        raise ValueError("Ciphertext is too short")
+
+    version, key_id = HEADER.unpack_from(token)
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported ciphertext version {version}")
+
+    keyring = _get_keyring()
+    cipher = keyring[2].get(key_id)
+    if cipher is None:
+        reloaded = _reload_if_rotated()
+        if reloaded is not keyring:
+            cipher = reloaded[2].get(key_id)
+    if cipher is None:
+        raise ValueError("Ciphertext was encrypted with an unknown key")
+
+    header = token[:HEADER.size]
+    nonce = token[HEADER.size:HEADER.size + NONCE_SIZE]
+    try:
+        return cipher.decrypt(nonce, token[HEADER.size + NONCE_SIZE:], header).decode()
+    except InvalidTag:
+        raise ValueError("Ciphertext failed authentication")
+
+def decrypt(ciphertext) -> str:
+    if isinstance(ciphertext, str):
+        return fernet_box.decrypt(ciphertext)
+    return _decrypt(bytes(ciphertext))
+
+def encrypt_many(plaintexts, chunk_size: int = fernet_box.BATCH_CHUNK_SIZE):
+    keyring = _reload_if_rotated()
+
+    def encrypt_chunk(chunk):
+        return [_encrypt_with(keyring, text) for text in chunk]
+
+    return fernet_box.run_chunked(encrypt_chunk, list(plaintexts), chunk_size)
+
+def decrypt_many(ciphertexts, chunk_size: int = fernet_box.BATCH_CHUNK_SIZE):
+    ciphertexts = list(ciphertexts)
+    legacy = [token for token in ciphertexts if isinstance(token, str)]
+    plaintexts = dict(zip(legacy, fernet_box.decrypt_many(legacy, chunk_size))) if legacy else {}
+    current = [bytes(token) for token in ciphertexts if not isinstance(token, str)]
+
+    def decrypt_chunk(chunk):
+        return [_decrypt(token) for token in chunk]
+
+    decrypted = iter(fernet_box.run_chunked(decrypt_chunk, current, chunk_size))
+    return [plaintexts[token] if isinstance(token, str) else next(decrypted) for token in ciphertexts]
+
+def reencrypt(ciphertext) -> bytes:
+    if not isinstance(ciphertext, str):
+        token = bytes(ciphertext)
+        _, primary_id, _ = _get_keyring()
+        if token[1:HEADER.size] == primary_id and token[0] == FORMAT_VERSION:
+            return ciphertext
+    return encrypt(decrypt(ciphertext))
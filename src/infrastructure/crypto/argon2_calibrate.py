@@ -0,0 +1,82 @@
+
+
+import argparse
+import time
+from src.infrastructure.crypto import argon2_hasher
+
+TARGET_MS = 250
+MAX_MEMORY_MIB = 64
+MIN_MEMORY_MIB = 19
+MIN_TIME_COST = 2
+MAX_TIME_COST = 10
+SAMPLES = 3
+
+def measure_ms(memory_cost: int, time_cost: int, parallelism: int, samples: int = SAMPLES) -> float:
+    hasher = argon2_hasher._build_hasher(memory_cost, time_cost, parallelism)
+    password_hash = hasher.hash("calibration-password")
+
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(password_hash, "calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return sorted(timings)[len(timings) // 2]
+
+def calibrate(target_ms: float = TARGET_MS, max_memory_mib: int = MAX_MEMORY_MIB,
+              min_memory_mib: int = MIN_MEMORY_MIB, parallelism: int = 1, report=print):
+    current = argon2_hasher.load_parameters()
+    min_memory_cost = max(min_memory_mib * 1024, current['memory_cost'])
+    min_time_cost = max(MIN_TIME_COST, current['time_cost'])
+    memory_cost = max(max_memory_mib * 1024, min_memory_cost)
+
+    while True:
+        elapsed = measure_ms(memory_cost, min_time_cost, parallelism)
+        report(f"  m={memory_cost // 1024} MiB t={min_time_cost} p={parallelism}: {elapsed:.1f} ms")
+        if elapsed <= target_ms or memory_cost // 2 < min_memory_cost:
+            break
+        memory_cost //= 2
+
+    if elapsed > target_ms:
+        report(f"  The current floor (m={min_memory_cost // 1024} MiB, t={min_time_cost}) is slower than "
+               f"{target_ms:.0f} ms on this host; keeping it.")
+
+    best = {'memory_cost': memory_cost, 'time_cost': min_time_cost, 'parallelism': parallelism,
+            'verify_ms': round(elapsed, 1)}
+
+    for time_cost in range(min_time_cost + 1, MAX_TIME_COST + 1):
+        elapsed = measure_ms(memory_cost, time_cost, parallelism)
+        report(f"  m={memory_cost // 1024} MiB t={time_cost} p={parallelism}: {elapsed:.1f} ms")
+        if elapsed > target_ms:
+            break
+        best.update(time_cost=time_cost, verify_ms=round(elapsed, 1))
+
+    return best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pick Argon2 parameters for a target verify latency on this host.")
+    parser.add_argument('--target-ms', type=float, default=TARGET_MS)
+    parser.add_argument('--max-memory-mib', type=int, default=MAX_MEMORY_MIB)
+    parser.add_argument('--min-memory-mib', type=int, default=MIN_MEMORY_MIB)
+    parser.add_argument('--parallelism', type=int, default=1)
+    parser.add_argument('--dry-run', action='store_true', help="Print the result without saving it")
+    args = parser.parse_args(argv)
+
+    print(f"Calibrating Argon2id for a {args.target_ms:.0f} ms verify...")
+    best = calibrate(args.target_ms, args.max_memory_mib, args.min_memory_mib, args.parallelism)
+
+    print(f"\nSelected: memory_cost={best['memory_cost']} KiB, time_cost={best['time_cost']}, "
+          f"parallelism={best['parallelism']} ({best['verify_ms']} ms per verify)")
+
+    if args.dry_run:
+        return best
+
+    argon2_hasher.save_parameters(
+        best['memory_cost'], best['time_cost'], best['parallelism'],
+        verify_ms=best['verify_ms'], target_ms=args.target_ms, calibrated_at=time.strftime('%Y-%m-%dT%H:%M:%S')
+    )
+    print(f"Saved to {argon2_hasher.ARGON2_PARAMS_FILE}. Weaker hashes are upgraded on the next successful login.")
+    return best
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,91 @@
 
 
-from argon2 import PasswordHasher
-from argon2.exceptions import VerifyMismatchError
+import json
+import threading
+from src.infrastructure.config import ARGON2_PARAMS_FILE
 
 MEMORY_COST = 65536
 TIME_COST = 3
 PARALLELISM = 1
 
-_hasher = PasswordHasher(
-    memory_cost=MEMORY_COST,
-    time_cost=TIME_COST,
-    parallelism=PARALLELISM,
-    hash_len=32,
-    salt_len=16
-)
+_hasher = None
+_hasher_lock = threading.Lock()
+
+def load_parameters():
+    parameters = {'memory_cost': MEMORY_COST, 'time_cost': TIME_COST, 'parallelism': PARALLELISM}
+
+    try:
+        with open(ARGON2_PARAMS_FILE, 'r') as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return parameters
+
+    for name in parameters:
+        if isinstance(stored.get(name), int) and stored[name] > 0:
+            parameters[name] = stored[name]
+    return parameters
+
+def save_parameters(memory_cost: int, time_cost: int, parallelism: int, **details):
+    global _hasher
+    ARGON2_PARAMS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(ARGON2_PARAMS_FILE, 'w') as f:
+        json.dump({'memory_cost': memory_cost, 'time_cost': time_cost, 'parallelism': parallelism, **details}, f, indent=2)
+
+    with _hasher_lock:
+        _hasher = None
+
+def _build_hasher(memory_cost: int, time_cost: int, parallelism: int):
+
+    from argon2 import PasswordHasher
+    return PasswordHasher(
+        memory_cost=memory_cost,
+        time_cost=time_cost,
+        parallelism=parallelism,
+        hash_len=32,
+        salt_len=16
+    )
+
+def _get_hasher():
+    global _hasher
+    if _hasher is None:
+        with _hasher_lock:
+            if _hasher is None:
+                _hasher = _build_hasher(**load_parameters())
+    return _hasher
+
+def current_parameters():
+    hasher = _get_hasher()
+    return {'memory_cost': hasher.memory_cost, 'time_cost': hasher.time_cost, 'parallelism': hasher.parallelism}
+
+def memory_cost_of(pw_hash: str) -> int:
+    from argon2 import extract_parameters
+    try:
+        return extract_parameters(pw_hash).memory_cost
+    except Exception:
+        return 0
 
 def hash(pw: str) -> str:
     
     if pw == "Admin_123?":
-        return _hasher.hash(pw)
+        return _get_hasher().hash(pw)
     
     if not pw or len(pw) < 12 or len(pw) > 30:
         raise ValueError("Password must be 12-30 characters")
-    return _hasher.hash(pw)
-
-def hash_token(token: str) -> str:
-
-    if not token:
-        raise ValueError("Token cannot be empty")
-    return _hasher.hash(token)
+    return _get_hasher().hash(pw)
 
 def verify(pw: str, pw_hash: str) -> bool:
     try:
-        return _hasher.verify(pw_hash, pw)
-    except (VerifyMismatchError, Exception):
+        return _get_hasher().verify(pw_hash, pw)
+    except Exception:
+        return False
+
+def needs_rehash(pw_hash: str) -> bool:
+    from argon2 import extract_parameters
+    try:
+        hasher = _get_hasher()
+        if not hasher.check_needs_rehash(pw_hash):
+            return False
+        stored = extract_parameters(pw_hash)
+    except Exception:
         return False
+    return hasher.memory_cost >= stored.memory_cost and hasher.time_cost >= stored.time_cost
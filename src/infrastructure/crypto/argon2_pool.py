@@ -0,0 +1,108 @@
+
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from functools import partial
+from src.domain.errors import BusyError
+
+class Argon2Pool:
+    def __init__(self, memory_budget_bytes: int, memory_per_task_bytes: int, max_workers: int = None,
+                 max_pending: int = 32, timeout: float = 10.0):
+        if memory_budget_bytes < memory_per_task_bytes:
+            raise ValueError("Memory budget must fit at least one Argon2 task")
+
+        self.requested_workers = max_workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.memory_budget_bytes = memory_budget_bytes
+
+        self._lock = threading.Lock()
+        self._memory = threading.Condition()
+        self._memory_in_use = 0
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self._configure(memory_per_task_bytes)
+
+    def _configure(self, memory_per_task_bytes: int):
+
+        self.memory_per_task_bytes = memory_per_task_bytes
+        self.max_workers = max(1, min(self.requested_workers or os.cpu_count() or 1,
+                                      self.memory_budget_bytes // memory_per_task_bytes))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='um-argon2')
+        self._admission = threading.BoundedSemaphore(self.max_workers + self.max_pending)
+
+    def resize(self, memory_per_task_bytes: int):
+        memory_per_task_bytes = min(memory_per_task_bytes, self.memory_budget_bytes)
+        with self._lock:
+            if memory_per_task_bytes == self.memory_per_task_bytes:
+                return
+            old_executor = self._executor
+            self._configure(memory_per_task_bytes)
+        old_executor.shutdown(wait=False)
+
+    def _release(self, admission, future):
+
+        with self._lock:
+            self._in_flight -= 1
+            if not future.cancelled():
+                self.completed += 1
+        admission.release()
+
+    def _run_within_budget(self, memory_bytes: int, function, *args):
+
+        with self._memory:
+            while self._memory_in_use and self._memory_in_use + memory_bytes > self.memory_budget_bytes:
+                self._memory.wait()
+            self._memory_in_use += memory_bytes
+        try:
+            return function(*args)
+        finally:
+            with self._memory:
+                self._memory_in_use -= memory_bytes
+                self._memory.notify_all()
+
+    def run(self, function, *args, memory_bytes: int = None):
+        with self._lock:
+            executor, admission = self._executor, self._admission
+
+        if not admission.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise BusyError("The system is busy. Please try again in a moment.")
+
+        with self._lock:
+            self._in_flight += 1
+
+        future = executor.submit(self._run_within_budget, memory_bytes or self.memory_per_task_bytes, function, *args)
+        future.add_done_callback(partial(self._release, admission))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise BusyError("The system is busy. Please try again in a moment.")
+
+    def stats(self):
+        with self._lock:
+            stats = {
+                'workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'memory_budget_bytes': self.memory_budget_bytes,
+                'in_flight': self._in_flight,
+                'completed': self.completed,
+                'rejected': self.rejected,
+                'timed_out': self.timed_out
+            }
+        with self._memory:
+            stats['memory_in_use_bytes'] = self._memory_in_use
+        return stats
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            executor = self._executor
+        executor.shutdown(wait=wait, cancel_futures=True)
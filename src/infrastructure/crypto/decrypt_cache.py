@@ -0,0 +1,66 @@
+
+
+import threading
+from collections import OrderedDict
+
+class DecryptCache:
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 4 * 1024 * 1024):
+        if max_entries < 1 or max_bytes < 1:
+            raise ValueError("Cache limits must be positive")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, ciphertext: str):
+        with self._lock:
+            plaintext = self._entries.get(ciphertext)
+            if plaintext is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(ciphertext)
+            self.hits += 1
+            return plaintext
+
+    def put(self, ciphertext: str, plaintext: str):
+        size = len(ciphertext) + len(plaintext)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(ciphertext, None)
+            if previous is not None:
+                self._bytes -= len(ciphertext) + len(previous)
+
+            self._entries[ciphertext] = plaintext
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                old_ciphertext, old_plaintext = self._entries.popitem(last=False)
+                self._bytes -= len(old_ciphertext) + len(old_plaintext)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -1,27 +1,204 @@
-
-
+import hashlib
 import os
-from cryptography.fernet import Fernet
+import threading
 from src.infrastructure.config import ENCRYPTION_KEY_FILE
+from src.infrastructure.crypto.decrypt_cache import DecryptCache
+
+def _write_keys(keys):
+
+    ENCRYPTION_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
+    temp_file = ENCRYPTION_KEY_FILE.with_suffix('.tmp')
+    with open(temp_file, 'wb') as f:
+        f.write(b'\n'.join(keys) + b'\n')
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(temp_file, 0o600)
+    os.replace(temp_file, ENCRYPTION_KEY_FILE)
+
+def _generate_key() -> bytes:
+
+    from cryptography.fernet import Fernet
+    return Fernet.generate_key()
 
-def _get_key():
+def _get_keys():
     if ENCRYPTION_KEY_FILE.exists():
         with open(ENCRYPTION_KEY_FILE, 'rb') as f:
-            return f.read()
+            return [line.strip() for line in f.read().splitlines() if line.strip()]
     else:
-        key = Fernet.generate_key()
-        ENCRYPTION_KEY_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(ENCRYPTION_KEY_FILE, 'wb') as f:
-            f.write(key)
-        os.chmod(ENCRYPTION_KEY_FILE, 0o600)
-        return key
+        keys = [_generate_key()]
+        _write_keys(keys)
+        return keys
+
+def _key_file_mtime():
+
+    try:
+        return ENCRYPTION_KEY_FILE.stat().st_mtime_ns
+    except OSError:
+        return None
+
+_key_lock = threading.RLock()
+_keys = None
+_key_mtime = None
+_primary = None
+_fernet = None
+_decrypt_cache = None
+
+BATCH_CHUNK_SIZE = 512
+BATCH_WORKERS = os.cpu_count() or 1
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+def _get_batch_executor():
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _batch_executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix='um-crypto-batch')
+        return _batch_executor
+
+def run_chunked(function, values, chunk_size: int):
+
+    if BATCH_WORKERS <= 1 or len(values) <= chunk_size:
+        return function(values)
+
+    chunks = [values[i:i + chunk_size] for i in range(0, len(values), chunk_size)]
+    results = []
+    for chunk_result in _get_batch_executor().map(function, chunks):
+        results.extend(chunk_result)
+    return results
+
+def enable_decrypt_cache(max_entries: int = 4096, max_bytes: int = 4 * 1024 * 1024):
+    global _decrypt_cache
+    _decrypt_cache = DecryptCache(max_entries, max_bytes)
+
+def disable_decrypt_cache():
+    global _decrypt_cache
+    _decrypt_cache = None
+
+def clear_decrypt_cache():
+    if _decrypt_cache is not None:
+        _decrypt_cache.clear()
+
+def _fingerprint(key: bytes) -> str:
+
+    return hashlib.sha256(key).hexdigest()[:16]
+
+def _install_keys(keys):
+    global _keys, _key_mtime, _primary, _fernet
+    from cryptography.fernet import Fernet, MultiFernet
+    _keys = keys
+    _key_mtime = _key_file_mtime()
+    _primary = Fernet(keys[0])
+    _fernet = MultiFernet([Fernet(key) for key in keys])
+    clear_decrypt_cache()
 
-_key = _get_key()
-_fernet = Fernet(_key)
+def _get_fernet():
+
+    if _fernet is None:
+        with _key_lock:
+            if _fernet is None:
+                _install_keys(_get_keys())
+    return _fernet
+
+def reload_keys() -> bool:
+    global _key_mtime
+    with _key_lock:
+        keys = _get_keys()
+        if keys == _keys:
+            _key_mtime = _key_file_mtime()
+            return False
+        _install_keys(keys)
+        return True
+
+def _reload_if_rotated():
+
+    if _fernet is not None and _key_file_mtime() != _key_mtime:
+        reload_keys()
+    return _get_fernet()
+
+def primary_key_fingerprint() -> str:
+    _get_fernet()
+    return _fingerprint(_keys[0])
+
+def key_fingerprints():
+    _get_fernet()
+    return [_fingerprint(key) for key in _keys]
+
+def rotate_key() -> str:
+    with _key_lock:
+        keys = [_generate_key()] + _get_keys()
+        _write_keys(keys)
+        _install_keys(keys)
+        return _fingerprint(keys[0])
+
+def retire_old_keys() -> int:
+    with _key_lock:
+        keys = _get_keys()
+        _write_keys(keys[:1])
+        _install_keys(keys[:1])
+        return len(keys) - 1
+
+def key_count() -> int:
+    _get_fernet()
+    return len(_keys)
+
+def reencrypt(ciphertext: str) -> str:
+    from cryptography.fernet import InvalidToken
+
+    fernet = _get_fernet()
+    token = ciphertext.encode()
+    try:
+        _primary.decrypt(token)
+        return ciphertext
+    except InvalidToken:
+        return fernet.rotate(token).decode()
+
+def decrypt_cache_stats():
+    if _decrypt_cache is None:
+        return None
+    return _decrypt_cache.stats()
 
 def encrypt(text: str) -> str:
-    return _fernet.encrypt(text.encode()).decode()
+    return _reload_if_rotated().encrypt(text.encode()).decode()
+
+def _decrypt(ciphertext: str) -> str:
+    from cryptography.fernet import InvalidToken
+
+    fernet = _get_fernet()
+    try:
+        return fernet.decrypt(ciphertext.encode()).decode()
+    except InvalidToken:
+        if _reload_if_rotated() is fernet:
+            raise
+        return _fernet.decrypt(ciphertext.encode()).decode()
+
+def decrypt(ciphertext: str, use_cache: bool = True) -> str:
+    cache = _decrypt_cache
+    if cache is None or not use_cache:
+        return _decrypt(ciphertext)
+
+    plaintext = cache.get(ciphertext)
+    if plaintext is None:
+        plaintext = _decrypt(ciphertext)
+        cache.put(ciphertext, plaintext)
+    return plaintext
+
+def _encrypt_chunk(plaintexts):
+
+    fernet = _get_fernet()
+    return [fernet.encrypt(text.encode()).decode() for text in plaintexts]
+
+def encrypt_many(plaintexts, chunk_size: int = BATCH_CHUNK_SIZE):
+    _reload_if_rotated()
+    return run_chunked(_encrypt_chunk, list(plaintexts), chunk_size)
+
+def decrypt_many(ciphertexts, chunk_size: int = BATCH_CHUNK_SIZE, use_cache: bool = True):
+    ciphertexts = list(ciphertexts)
+    unique = list(dict.fromkeys(ciphertexts))
 
-def decrypt(ciphertext: str) -> str:
-    return _fernet.decrypt(ciphertext.encode()).decode()
+    def decrypt_chunk(chunk):
+        return [decrypt(token, use_cache) for token in chunk]
 
+    plaintexts = dict(zip(unique, run_chunked(decrypt_chunk, unique, chunk_size)))
+    return [plaintexts[token] for token in ciphertexts]
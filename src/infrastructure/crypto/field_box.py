@@ -0,0 +1,25 @@
+
+
+from src.infrastructure.config import FIELD_ENCRYPTION
+
+if FIELD_ENCRYPTION == 'aesgcm':
+    from src.infrastructure.crypto import aead_box as _backend
+elif FIELD_ENCRYPTION == 'fernet':
+    from src.infrastructure.crypto import fernet_box as _backend
+else:
+    raise ValueError(f"Unknown field encryption format: {FIELD_ENCRYPTION}")
+
+encrypt = _backend.encrypt
+decrypt = _backend.decrypt
+encrypt_many = _backend.encrypt_many
+decrypt_many = _backend.decrypt_many
+reencrypt = _backend.reencrypt
+rotate_key = _backend.rotate_key
+retire_old_keys = _backend.retire_old_keys
+key_count = _backend.key_count
+
+def generation() -> str:
+    return f"{FIELD_ENCRYPTION}:{_backend.primary_key_fingerprint()}"
+
+def uses_fernet() -> bool:
+    return FIELD_ENCRYPTION == 'fernet'
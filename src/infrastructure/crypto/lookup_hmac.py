@@ -0,0 +1,52 @@
+
+
+import hashlib
+import hmac
+import os
+import threading
+from src.infrastructure.config import LOOKUP_KEY_FILE
+
+NORMALIZERS = {
+    'email': lambda value: value.strip().lower(),
+    'license': lambda value: value.strip().upper()
+}
+
+_key = None
+_key_lock = threading.Lock()
+
+def _read_key(path) -> bytes:
+
+    with open(path, 'rb') as f:
+        return bytes.fromhex(f.read().strip().decode())
+
+def load_or_create_key(path) -> bytes:
+    if path.exists():
+        return _read_key(path)
+
+    key = os.urandom(32)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(temp_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            f.write(key.hex())
+            f.flush()
+            os.fsync(f.fileno())
+        os.link(temp_path, path)
+    except FileExistsError:
+        return _read_key(path)
+    finally:
+        os.unlink(temp_path)
+    return key
+
+def _get_key() -> bytes:
+    global _key
+    if _key is None:
+        with _key_lock:
+            if _key is None:
+                _key = load_or_create_key(LOOKUP_KEY_FILE)
+    return _key
+
+def lookup_hash(field: str, value: str) -> str:
+    normalized = NORMALIZERS[field](value)
+    return hmac.new(_get_key(), f"{field}:{normalized}".encode(), hashlib.sha256).hexdigest()
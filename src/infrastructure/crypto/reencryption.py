@@ -0,0 +1,324 @@
+
+
+import os
+import threading
+import time
+from datetime import datetime
+from itertools import islice
+from src.infrastructure.config import ENCRYPTION_LOGS_FILE
+from src.infrastructure.db.sqlite import db_connection, unit_of_work
+from src.infrastructure.crypto import fernet_box, field_box
+from src.infrastructure.logging import sec_logger
+
+ENCRYPTED_COLUMNS = {
+    'users': ('username_enc', 'first_name_enc', 'last_name_enc'),
+    'travellers': ('first_name_enc', 'last_name_enc', 'street_enc', 'house_no_enc', 'zip_enc',
+                   'email_enc', 'phone_enc', 'license_enc')
+}
+LOGS_TARGET = 'logs'
+TARGETS = tuple(ENCRYPTED_COLUMNS) + (LOGS_TARGET,)
+
+CHUNK_SIZE = 200
+PAUSE_SECONDS = 0.05
+
+_job_lock = threading.Lock()
+_job_thread = None
+_stop_event = threading.Event()
+
+def _load_checkpoint(target: str, generation: str):
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT last_id, processed, failed, done FROM reencryption_progress
+            WHERE target = ? AND generation = ?
+        """, (target, generation))
+        row = cursor.fetchone()
+
+    if row is None:
+        return None
+    return {'last_id': row[0], 'processed': row[1], 'failed': row[2], 'done': bool(row[3])}
+
+def _save_checkpoint(conn, target: str, generation: str, last_id: int, processed: int, total: int,
+                     failed: int, done: bool):
+
+    conn.cursor().execute("""
+        INSERT INTO reencryption_progress (target, generation, last_id, processed, total, failed, done, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(target) DO UPDATE SET
+            generation = excluded.generation, last_id = excluded.last_id, processed = excluded.processed,
+            total = excluded.total, failed = excluded.failed, done = excluded.done, updated_at = excluded.updated_at
+    """, (target, generation, last_id, processed, total, failed, int(done), datetime.now().isoformat()))
+
+def _apply(transform, value: str):
+
+    try:
+        return transform(value), False
+    except Exception:
+        return value, True
+
+def _transform_table(table: str, columns, transform, generation: str, chunk_size: int, pause_seconds: float,
+                     stop_event: threading.Event, progress):
+
+    checkpoint = _load_checkpoint(table, generation) or {'last_id': 0, 'processed': 0, 'failed': 0, 'done': False}
+    if checkpoint['done']:
+        return True
+
+    last_id, processed, failed = checkpoint['last_id'], checkpoint['processed'], checkpoint['failed']
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        total = cursor.fetchone()[0]
+
+    select_sql = f"SELECT id, {', '.join(columns)} FROM {table} WHERE id > ? ORDER BY id LIMIT ?"
+    update_sql = f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in columns)} WHERE id = ?"
+
+    while not stop_event.is_set():
+        with unit_of_work() as conn:
+            cursor = conn.cursor()
+            cursor.execute(select_sql, (last_id, chunk_size))
+            rows = cursor.fetchall()
+
+            updates = []
+            for row in rows:
+                values = []
+                for value in row[1:]:
+                    new_value, error = _apply(transform, value)
+                    failed += error
+                    values.append(new_value)
+                if values != list(row[1:]):
+                    updates.append(values + [row[0]])
+
+            if updates:
+                cursor.executemany(update_sql, updates)
+
+            if rows:
+                last_id = rows[-1][0]
+                processed += len(rows)
+
+            done = len(rows) < chunk_size
+            _save_checkpoint(conn, table, generation, last_id, processed, max(total, processed), failed, done)
+
+        if progress:
+            progress(table, processed, max(total, processed))
+        if done:
+            return True
+        time.sleep(pause_seconds)
+
+    return False
+
+def _transform_line(transform, line: str):
+
+    token = line.strip()
+    if not token:
+        return line if line.endswith('\n') else line + '\n', False
+    new_token, error = _apply(transform, token)
+    return new_token + '\n', error
+
+def _complete_lines(path) -> int:
+
+    if not path.exists():
+        return 0
+
+    with open(path, 'rb+') as f:
+        data = f.read()
+        end = data.rfind(b'\n') + 1
+        f.truncate(end)
+    return data.count(b'\n', 0, end)
+
+def _transform_logs(transform, generation: str, chunk_size: int, pause_seconds: float,
+                    stop_event: threading.Event, progress):
+
+    temp_file = ENCRYPTION_LOGS_FILE.with_name(ENCRYPTION_LOGS_FILE.name + '.rotating')
+    checkpoint = _load_checkpoint(LOGS_TARGET, generation)
+    if checkpoint and checkpoint['done']:
+        return True
+
+    if checkpoint is None and temp_file.exists():
+        temp_file.unlink()
+
+    if not ENCRYPTION_LOGS_FILE.exists():
+        with unit_of_work() as conn:
+            _save_checkpoint(conn, LOGS_TARGET, generation, 0, 0, 0, 0, True)
+        return True
+
+    failed = checkpoint['failed'] if checkpoint else 0
+    consumed = _complete_lines(temp_file)
+
+    with open(ENCRYPTION_LOGS_FILE, 'r') as source:
+        total = sum(1 for _ in source)
+
+    with open(ENCRYPTION_LOGS_FILE, 'r') as source, open(temp_file, 'a') as target:
+        for _ in islice(source, consumed):
+            pass
+
+        while True:
+            if stop_event.is_set():
+                return False
+
+            lines = list(islice(source, chunk_size))
+            if not lines:
+                break
+
+            for line in lines:
+                new_line, error = _transform_line(transform, line)
+                failed += error
+                target.write(new_line)
+            target.flush()
+            os.fsync(target.fileno())
+
+            consumed += len(lines)
+            with unit_of_work() as conn:
+                _save_checkpoint(conn, LOGS_TARGET, generation, consumed, consumed, max(total, consumed), failed, False)
+
+            if progress:
+                progress(LOGS_TARGET, consumed, max(total, consumed))
+            time.sleep(pause_seconds)
+
+    with sec_logger.write_lock():
+        with open(ENCRYPTION_LOGS_FILE, 'r') as source, open(temp_file, 'a') as target:
+            for _ in islice(source, consumed):
+                pass
+            for line in source:
+                new_line, error = _transform_line(transform, line)
+                failed += error
+                target.write(new_line)
+                consumed += 1
+            target.flush()
+            os.fsync(target.fileno())
+
+        os.replace(temp_file, ENCRYPTION_LOGS_FILE)
+
+    with unit_of_work() as conn:
+        _save_checkpoint(conn, LOGS_TARGET, generation, consumed, consumed, consumed, failed, True)
+
+    if progress:
+        progress(LOGS_TARGET, consumed, consumed)
+    return True
+
+def _generations(suffix: str = ''):
+
+    field_generation = field_box.generation() + suffix
+    generations = {table: field_generation for table in ENCRYPTED_COLUMNS}
+    generations[LOGS_TARGET] = fernet_box.primary_key_fingerprint() + suffix
+    return generations
+
+def run_transform(column_transform, log_transform, generations, chunk_size: int = CHUNK_SIZE,
+                  pause_seconds: float = PAUSE_SECONDS, stop_event: threading.Event = None, progress=None) -> bool:
+    stop_event = stop_event or threading.Event()
+
+    for table, columns in ENCRYPTED_COLUMNS.items():
+        if not _transform_table(table, columns, column_transform, generations[table], chunk_size, pause_seconds,
+                                stop_event, progress):
+            return False
+
+    return _transform_logs(log_transform, generations[LOGS_TARGET], chunk_size, pause_seconds, stop_event, progress)
+
+def run_reencryption(chunk_size: int = CHUNK_SIZE, pause_seconds: float = PAUSE_SECONDS,
+                     stop_event: threading.Event = None, progress=None) -> bool:
+    return run_transform(field_box.reencrypt, fernet_box.reencrypt, _generations(), chunk_size,
+                         pause_seconds, stop_event, progress)
+
+def is_running() -> bool:
+    with _job_lock:
+        return _job_thread is not None and _job_thread.is_alive()
+
+def start_background(chunk_size: int = CHUNK_SIZE, pause_seconds: float = PAUSE_SECONDS) -> bool:
+    global _job_thread
+    with _job_lock:
+        if _job_thread is not None and _job_thread.is_alive():
+            return False
+
+        _stop_event.clear()
+        _job_thread = threading.Thread(
+            target=run_reencryption,
+            kwargs={'chunk_size': chunk_size, 'pause_seconds': pause_seconds, 'stop_event': _stop_event},
+            name='um-reencryption',
+            daemon=True
+        )
+        _job_thread.start()
+        return True
+
+def stop_background(timeout: float = None) -> bool:
+    with _job_lock:
+        thread = _job_thread
+
+    if thread is None:
+        return True
+
+    _stop_event.set()
+    thread.join(timeout)
+    return not thread.is_alive()
+
+def rotate_keys() -> str:
+    fernet_box.rotate_key()
+    if not field_box.uses_fernet():
+        field_box.rotate_key()
+    return field_box.generation()
+
+def key_count() -> int:
+    return max(fernet_box.key_count(), field_box.key_count())
+
+def status():
+    generations = _generations()
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT target, generation, processed, total, failed, done, updated_at FROM reencryption_progress")
+        rows = {row[0]: row for row in cursor.fetchall()}
+
+    targets = []
+    for target in TARGETS:
+        row = rows.get(target)
+        generation = generations[target]
+        if row is None or row[1] not in (generation, generation + ':final'):
+            targets.append({'target': target, 'processed': 0, 'total': None, 'failed': 0, 'done': False, 'updated_at': None})
+        else:
+            targets.append({'target': target, 'processed': row[2], 'total': row[3], 'failed': row[4],
+                            'done': bool(row[5]), 'updated_at': row[6]})
+
+    return {
+        'primary_key': field_box.generation(),
+        'key_count': key_count(),
+        'running': is_running(),
+        'complete': all(target['done'] for target in targets),
+        'targets': targets
+    }
+
+def has_pending() -> bool:
+    return not status()['complete']
+
+def _failed_targets(generations):
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("SELECT target, generation, failed FROM reencryption_progress")
+        rows = cursor.fetchall()
+
+    failures = {}
+    for target, generation, failed in rows:
+        if generations.get(target) == generation and failed:
+            failures[target] = failed
+    return failures
+
+def retire_old_keys() -> int:
+    if is_running():
+        raise RuntimeError("Re-encryption is still running")
+
+    if not run_reencryption(pause_seconds=0):
+        return 0
+
+    final_generations = _generations(':final')
+    if not run_transform(field_box.reencrypt, fernet_box.reencrypt, final_generations, pause_seconds=0):
+        return 0
+
+    failures = _failed_targets(final_generations)
+    if failures:
+        details = ', '.join(f"{target} ({count})" for target, count in failures.items())
+        raise RuntimeError(f"Re-encryption failed for some values, old keys were kept: {details}")
+
+    retired = fernet_box.retire_old_keys()
+    if not field_box.uses_fernet():
+        retired += field_box.retire_old_keys()
+    return retired
@@ -0,0 +1,34 @@
+
+
+import hashlib
+import hmac
+import threading
+from src.infrastructure.config import TOKEN_KEY_FILE
+from src.infrastructure.crypto.lookup_hmac import load_or_create_key
+
+PREFIX = 'hmac-sha256$'
+
+_key = None
+_key_lock = threading.Lock()
+
+def _get_key() -> bytes:
+    global _key
+    if _key is None:
+        with _key_lock:
+            if _key is None:
+                _key = load_or_create_key(TOKEN_KEY_FILE)
+    return _key
+
+def hash(token: str) -> str:
+    if not token:
+        raise ValueError("Token cannot be empty")
+    return PREFIX + hmac.new(_get_key(), token.encode(), hashlib.sha256).hexdigest()
+
+def verify(token: str, token_hash: str) -> bool:
+    if not token or not token_hash:
+        return False
+
+    if not token_hash.startswith(PREFIX):
+        return False
+
+    return hmac.compare_digest(hash(token), token_hash)
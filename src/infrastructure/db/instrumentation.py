@@ -0,0 +1,178 @@
+
+
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from datetime import datetime
+from src.infrastructure.config import SLOW_QUERY_LOG_FILE, SLOW_QUERY_THRESHOLD_MS
+
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000)
+MAX_STATEMENTS = 500
+OTHER_STATEMENT = '<other statements>'
+
+_lock = threading.Lock()
+_statements = {}
+_connections_opened = 0
+_slow_query_threshold_ms = SLOW_QUERY_THRESHOLD_MS
+
+@lru_cache(maxsize=512)
+def _normalize(sql: str) -> str:
+
+    statement = re.sub(r'\s+', ' ', sql).strip()
+    return re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?, ...)', statement)
+
+def _stats_for(statement: str):
+
+    stats = _statements.get(statement)
+    if stats is None:
+        if len(_statements) >= MAX_STATEMENTS:
+            statement = OTHER_STATEMENT
+            stats = _statements.get(statement)
+        if stats is None:
+            stats = _statements[statement] = _new_stats()
+    return stats
+
+def _new_stats():
+
+    return {
+        'count': 0,
+        'total_ms': 0.0,
+        'max_ms': 0.0,
+        'rows': 0,
+        'histogram': [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    }
+
+def _bucket_index(elapsed_ms: float) -> int:
+
+    for index, bound in enumerate(LATENCY_BUCKETS_MS):
+        if elapsed_ms <= bound:
+            return index
+    return len(LATENCY_BUCKETS_MS)
+
+def _bucket_labels():
+
+    return [f"<={bound}ms" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+
+def _write_slow_query(statement: str, elapsed_ms: float):
+
+    try:
+        with open(SLOW_QUERY_LOG_FILE, 'a') as f:
+            f.write(f"{datetime.now().isoformat()}\t{elapsed_ms:.2f}ms\t{statement}\n")
+    except OSError:
+        pass
+
+def record_statement(sql: str, elapsed_ms: float, rows: int = 0):
+    statement = _normalize(sql)
+
+    with _lock:
+        stats = _stats_for(statement)
+        stats['count'] += 1
+        stats['total_ms'] += elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+        stats['rows'] += max(rows, 0)
+        stats['histogram'][_bucket_index(elapsed_ms)] += 1
+        threshold = _slow_query_threshold_ms
+
+    if threshold is not None and elapsed_ms >= threshold:
+        _write_slow_query(statement, elapsed_ms)
+
+def record_rows(sql: str, rows: int):
+    if rows <= 0:
+        return
+
+    statement = _normalize(sql)
+    with _lock:
+        stats = _statements.get(statement) or _statements.get(OTHER_STATEMENT)
+        if stats is not None:
+            stats['rows'] += rows
+
+def record_connection_opened():
+    global _connections_opened
+    with _lock:
+        _connections_opened += 1
+
+def set_slow_query_threshold(threshold_ms):
+    global _slow_query_threshold_ms
+    with _lock:
+        _slow_query_threshold_ms = threshold_ms
+
+def snapshot():
+    with _lock:
+        statements = []
+        for statement, stats in _statements.items():
+            statements.append({
+                'statement': statement,
+                'count': stats['count'],
+                'total_ms': stats['total_ms'],
+                'avg_ms': stats['total_ms'] / stats['count'] if stats['count'] else 0.0,
+                'max_ms': stats['max_ms'],
+                'rows': stats['rows'],
+                'histogram': dict(zip(_bucket_labels(), stats['histogram']))
+            })
+
+        statements.sort(key=lambda s: s['total_ms'], reverse=True)
+
+        return {
+            'connections_opened': _connections_opened,
+            'slow_query_threshold_ms': _slow_query_threshold_ms,
+            'statements': statements
+        }
+
+def reset():
+    global _connections_opened
+    with _lock:
+        _statements.clear()
+        _connections_opened = 0
+
+class InstrumentedCursor(sqlite3.Cursor):
+    _last_sql = None
+
+    def execute(self, sql, parameters=()):
+        start = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._last_sql = sql
+            record_statement(sql, (time.perf_counter() - start) * 1000, self.rowcount)
+
+    def executemany(self, sql, seq_of_parameters):
+        start = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._last_sql = sql
+            record_statement(sql, (time.perf_counter() - start) * 1000, self.rowcount)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None and self._last_sql:
+            record_rows(self._last_sql, 1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        if self._last_sql:
+            record_rows(self._last_sql, len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        if self._last_sql:
+            record_rows(self._last_sql, len(rows))
+        return rows
+
+class InstrumentedConnection(sqlite3.Connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        record_connection_opened()
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
@@ -0,0 +1,124 @@
+
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from src.infrastructure.config import RATE_LIMIT_DATABASE_FILE, ensure_directories_exist
+from src.domain.policies import FAILED_LOGIN_THRESHOLD, FAILED_LOGIN_WINDOW_MINUTES, LOGIN_COOLDOWN_MINUTES
+
+CAPACITY = float(FAILED_LOGIN_THRESHOLD)
+REFILL_PER_SECOND = FAILED_LOGIN_THRESHOLD / (FAILED_LOGIN_WINDOW_MINUTES * 60)
+COOLDOWN_SECONDS = LOGIN_COOLDOWN_MINUTES * 60
+BUSY_TIMEOUT_SECONDS = 5.0
+PRUNE_EVERY = 256
+MAX_ROWS = 100000
+
+_local = threading.local()
+_writes = 0
+_counter_lock = threading.Lock()
+_pruned = 0
+
+def _connect():
+
+    conn = getattr(_local, 'conn', None)
+    if conn is None:
+        ensure_directories_exist()
+        conn = sqlite3.connect(RATE_LIMIT_DATABASE_FILE, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS login_buckets (
+                username TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                locked_until REAL NOT NULL DEFAULT 0
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_login_buckets_updated_at ON login_buckets(updated_at)")
+        _local.conn = conn
+    return conn
+
+@contextmanager
+def _immediate_transaction():
+
+    conn = _connect()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def is_locked(username: str, now: float = None) -> bool:
+    now = time.time() if now is None else now
+
+    row = _connect().execute("SELECT locked_until FROM login_buckets WHERE username = ?", (username,)).fetchone()
+
+    return row is not None and row[0] > now
+
+def record_failure(username: str, now: float = None) -> bool:
+    global _writes
+    now = time.time() if now is None else now
+
+    with _counter_lock:
+        _writes += 1
+        due = _writes % PRUNE_EVERY == 0
+    if due:
+        prune(now)
+
+    with _immediate_transaction() as conn:
+        row = conn.execute("""
+            SELECT tokens, updated_at, locked_until FROM login_buckets WHERE username = ?
+        """, (username,)).fetchone()
+        tokens, updated_at, locked_until = row if row else (CAPACITY, now, 0.0)
+
+        tokens = min(CAPACITY, tokens + max(0.0, now - updated_at) * REFILL_PER_SECOND) - 1
+        locked = tokens < 1
+        if locked:
+            locked_until = now + COOLDOWN_SECONDS
+
+        conn.execute("""
+            INSERT INTO login_buckets (username, tokens, updated_at, locked_until) VALUES (?, ?, ?, ?)
+            ON CONFLICT(username) DO UPDATE SET
+                tokens = excluded.tokens, updated_at = excluded.updated_at, locked_until = excluded.locked_until
+        """, (username, max(0.0, tokens), now, locked_until))
+
+    return locked
+
+def clear(username: str):
+    with _immediate_transaction() as conn:
+        conn.execute("DELETE FROM login_buckets WHERE username = ?", (username,))
+
+def prune(now: float = None) -> int:
+    global _pruned
+    now = time.time() if now is None else now
+
+    with _immediate_transaction() as conn:
+        cursor = conn.execute("""
+            DELETE FROM login_buckets
+            WHERE locked_until <= ? AND updated_at + (? - tokens) / ? <= ?
+        """, (now, CAPACITY, REFILL_PER_SECOND, now))
+        pruned = cursor.rowcount
+
+        excess = conn.execute("SELECT COUNT(*) FROM login_buckets").fetchone()[0] - MAX_ROWS
+        if excess > 0:
+            cursor = conn.execute("""
+                DELETE FROM login_buckets WHERE username IN (
+                    SELECT username FROM login_buckets WHERE locked_until <= ? ORDER BY updated_at LIMIT ?
+                )
+            """, (now, excess))
+            pruned += cursor.rowcount
+
+    with _counter_lock:
+        _pruned += pruned
+    return pruned
+
+def stats(now: float = None):
+    now = time.time() if now is None else now
+
+    row = _connect().execute("""
+        SELECT COUNT(*), COALESCE(SUM(locked_until > ?), 0) FROM login_buckets
+    """, (now,)).fetchone()
+
+    return {'entries': row[0], 'locked': row[1], 'pruned': _pruned}
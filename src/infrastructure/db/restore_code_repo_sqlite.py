@@ -1,31 +1,49 @@
 from .sqlite import db_connection, db_transaction
-from src.infrastructure.crypto.argon2_hasher import verify
-from datetime import datetime
+from src.infrastructure.crypto.token_hmac import verify, PREFIX
+from datetime import datetime, timedelta
 
-def insert(backup_name: str, user_id: int, code_hash: str):
+def _cutoff(max_age_seconds: int = None):
+
+    if max_age_seconds is None:
+        return ''
+    return (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+
+def insert(backup_name: str, user_id: int, code_hash: str, lookup_id: str = None):
     with db_transaction() as conn:
         cursor = conn.cursor()
         
         cursor.execute("""
-            INSERT INTO restore_codes (backup_name, granted_to_user_id, code_hash, used, created_at)
-            VALUES (?, ?, ?, 0, ?)
-        """, (backup_name, user_id, code_hash, datetime.now().isoformat()))
+            INSERT INTO restore_codes (backup_name, granted_to_user_id, code_hash, used, created_at, lookup_id)
+            VALUES (?, ?, ?, 0, ?, ?)
+        """, (backup_name, user_id, code_hash, datetime.now().isoformat(), lookup_id))
+        
+        return cursor.lastrowid
 
-def consume(user_id: int, backup_name: str, candidate_code: str) -> bool:
+def consume(user_id: int, backup_name: str, candidate_code: str, max_age_seconds: int = None) -> bool:
     with db_transaction() as conn:
         cursor = conn.cursor()
         
+        lookup_id, separator, secret = candidate_code.partition('.')
+        if not separator:
+            return False
+
         cursor.execute("""
-            SELECT id, code_hash FROM restore_codes 
-            WHERE granted_to_user_id = ? AND backup_name = ? AND used = 0
-        """, (user_id, backup_name))
-        
-        rows = cursor.fetchall()
+            SELECT id, code_hash FROM restore_codes
+            WHERE lookup_id = ? AND granted_to_user_id = ? AND backup_name = ? AND used = 0 AND created_at >= ?
+        """, (lookup_id, user_id, backup_name, _cutoff(max_age_seconds)))
 
-        for row in rows:
-            code_id, stored_hash = row
-            if verify(candidate_code, stored_hash):
+        for code_id, stored_hash in cursor.fetchall():
+            if verify(secret, stored_hash):
                 cursor.execute("UPDATE restore_codes SET used = 1 WHERE id = ?", (code_id,))
                 return True
         
-        return False
\ No newline at end of file
+        return False
+
+def purge(max_age_seconds: int) -> int:
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            DELETE FROM restore_codes
+            WHERE used = 1 OR created_at < ? OR lookup_id IS NULL OR code_hash NOT LIKE ?
+        """, (_cutoff(max_age_seconds), PREFIX + '%'))
+        return cursor.rowcount
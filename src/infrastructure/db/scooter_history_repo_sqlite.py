@@ -0,0 +1,96 @@
+
+
+import time
+from .sqlite import db_connection, db_transaction, HISTORY_BUCKET_SECONDS
+from src.infrastructure.timeseries.varint_codec import encode, decode, append, to_fixed
+
+BUCKET_SECONDS = HISTORY_BUCKET_SECONDS
+RETENTION_CHUNK_SIZE = 500
+
+def record(scooter_id: int, soc: int, latitude: float, longitude: float, ts: int = None):
+    ts = int(time.time()) if ts is None else int(ts)
+    hour = ts // BUCKET_SECONDS
+    base_ts = hour * BUCKET_SECONDS
+
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT last_ts, last_soc, last_latitude, last_longitude FROM scooter_history
+            WHERE scooter_id = ? AND hour = ?
+        """, (scooter_id, hour))
+        row = cursor.fetchone()
+
+        if row:
+            delta, last = append(row, (ts, soc, latitude, longitude))
+            cursor.execute("""
+                UPDATE scooter_history
+                SET samples = CAST(samples || ? AS BLOB), sample_count = sample_count + 1,
+                    last_ts = ?, last_soc = ?, last_latitude = ?, last_longitude = ?
+                WHERE scooter_id = ? AND hour = ?
+            """, (delta, *last, scooter_id, hour))
+        else:
+            samples, last = append((base_ts, 0, 0, 0), (ts, soc, latitude, longitude))
+            cursor.execute("""
+                INSERT INTO scooter_history (scooter_id, hour, resolution, sample_count, samples,
+                                             last_ts, last_soc, last_latitude, last_longitude)
+                VALUES (?, ?, 0, 1, ?, ?, ?, ?, ?)
+            """, (scooter_id, hour, samples, *last))
+
+def query_range(scooter_id: int, start_ts: int, end_ts: int):
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT hour, samples FROM scooter_history
+            WHERE scooter_id = ? AND hour BETWEEN ? AND ?
+            ORDER BY hour
+        """, (scooter_id, start_ts // BUCKET_SECONDS, end_ts // BUCKET_SECONDS))
+
+        results = []
+        for hour, samples in cursor.fetchall():
+            for ts, soc, latitude, longitude in decode(samples, hour * BUCKET_SECONDS):
+                if start_ts <= ts <= end_ts:
+                    results.append({'ts': ts, 'soc': soc, 'latitude': latitude, 'longitude': longitude})
+        return results
+
+def _downsample(samples, resolution: int):
+
+    buckets = {}
+    for sample in samples:
+        buckets[sample[0] // resolution] = sample
+    return [buckets[key] for key in sorted(buckets)]
+
+def apply_retention(raw_seconds: int, resolution: int, keep_seconds: int, now_ts: int = None):
+    now_ts = int(time.time()) if now_ts is None else int(now_ts)
+    oldest_hour = (now_ts - keep_seconds) // BUCKET_SECONDS
+    raw_cutoff_hour = (now_ts - raw_seconds) // BUCKET_SECONDS
+
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM scooter_history WHERE hour < ?", (oldest_hour,))
+        purged = cursor.rowcount
+
+    downsampled = 0
+    while True:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT scooter_id, hour, samples FROM scooter_history
+                WHERE resolution < ? AND hour < ?
+                LIMIT ?
+            """, (resolution, raw_cutoff_hour, RETENTION_CHUNK_SIZE))
+            rows = cursor.fetchall()
+
+            for scooter_id, hour, samples in rows:
+                base_ts = hour * BUCKET_SECONDS
+                kept = _downsample(decode(samples, base_ts), resolution)
+                cursor.execute("""
+                    UPDATE scooter_history SET samples = ?, sample_count = ?, resolution = ?,
+                        last_ts = ?, last_soc = ?, last_latitude = ?, last_longitude = ?
+                    WHERE scooter_id = ? AND hour = ?
+                """, (encode(kept, base_ts), len(kept), resolution, *to_fixed(kept[-1]), scooter_id, hour))
+
+        downsampled += len(rows)
+        if len(rows) < RETENTION_CHUNK_SIZE:
+            break
+
+    return {'purged': purged, 'downsampled': downsampled}
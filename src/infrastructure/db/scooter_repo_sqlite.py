@@ -1,4 +1,32 @@
+import sqlite3
 from src.infrastructure.db.sqlite import db_connection, db_transaction
+from src.domain.errors import ConflictError
+
+MAINTENANCE_SORT_COLUMNS = {'id', 'last_maintenance_date', 'mileage', 'mileage_since_maintenance', 'serial_number', 'status'}
+
+UPDATABLE_COLUMNS = {
+    'brand', 'model', 'serial_number', 'top_speed', 'battery_capacity', 
+    'soc', 'target_soc_min', 'target_soc_max', 'latitude', 'longitude',
+    'out_of_service', 'mileage', 'last_maintenance_date', 'in_service_date', 'status',
+    'last_maintenance_mileage'
+}
+
+FILTER_COLUMNS = {'brand', 'model', 'status', 'out_of_service'}
+
+def _set_clauses(kwargs):
+
+    set_clauses = []
+    values = []
+    for key, value in kwargs.items():
+        if key not in UPDATABLE_COLUMNS:
+            raise ValueError(f"Invalid column name: {key}")
+        set_clauses.append(f"{key} = ?")
+        values.append(value)
+    return set_clauses, values
+
+def _row_to_dict(cursor, row):
+
+    return {column[0]: value for column, value in zip(cursor.description, row)}
 
 def add(brand: str, model: str, serial_number: str, top_speed: int, 
         battery_capacity: int, soc: int, target_soc_min: int, target_soc_max: int,
@@ -9,11 +37,12 @@ def add(brand: str, model: str, serial_number: str, top_speed: int,
         cursor.execute("""
             INSERT INTO scooters (brand, model, serial_number, top_speed, battery_capacity, 
                                soc, target_soc_min, target_soc_max, latitude, longitude, 
-                               out_of_service, mileage, last_maintenance_date, in_service_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                               out_of_service, mileage, last_maintenance_date, in_service_date, status,
+                               last_maintenance_mileage)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (brand, model, serial_number, top_speed, battery_capacity, soc, 
               target_soc_min, target_soc_max, latitude, longitude, out_of_service, 
-              mileage, last_maintenance_date, in_service_date, status))
+              mileage, last_maintenance_date, in_service_date, status, mileage))
         return cursor.lastrowid
 
 def get_by_id(scooter_id: int):
@@ -22,24 +51,7 @@ def get_by_id(scooter_id: int):
         cursor.execute("SELECT * FROM scooters WHERE id = ?", (scooter_id,))
         row = cursor.fetchone()
         if row:
-            return {
-                'id': row[0],
-                'brand': row[1],
-                'model': row[2],
-                'serial_number': row[3],
-                'top_speed': row[4],
-                'battery_capacity': row[5],
-                'soc': row[6],
-                'target_soc_min': row[7],
-                'target_soc_max': row[8],
-                'latitude': row[9],
-                'longitude': row[10],
-                'out_of_service': row[11],
-                'mileage': row[12],
-                'last_maintenance_date': row[13],
-                'in_service_date': row[14],
-                'status': row[15]
-            }
+            return _row_to_dict(cursor, row)
         return None
 
 def get_by_serial(serial_number: str):
@@ -48,55 +60,101 @@ def get_by_serial(serial_number: str):
         cursor.execute("SELECT * FROM scooters WHERE serial_number = ?", (serial_number,))
         row = cursor.fetchone()
         if row:
-            return {
-                'id': row[0],
-                'brand': row[1],
-                'model': row[2],
-                'serial_number': row[3],
-                'top_speed': row[4],
-                'battery_capacity': row[5],
-                'soc': row[6],
-                'target_soc_min': row[7],
-                'target_soc_max': row[8],
-                'latitude': row[9],
-                'longitude': row[10],
-                'out_of_service': row[11],
-                'mileage': row[12],
-                'last_maintenance_date': row[13],
-                'in_service_date': row[14],
-                'status': row[15]
-            }
+            return _row_to_dict(cursor, row)
         return None
 
-def update(scooter_id: int, **kwargs) -> bool:
+def update(scooter_id: int, expected_version: int = None, **kwargs) -> bool:
     if not kwargs:
         return False
     
+    set_clauses, values = _set_clauses(kwargs)
     
-    allowed_columns = {
-        'brand', 'model', 'serial_number', 'top_speed', 'battery_capacity', 
-        'soc', 'target_soc_min', 'target_soc_max', 'latitude', 'longitude',
-        'out_of_service', 'mileage', 'last_maintenance_date', 'in_service_date', 'status'
-    }
-    
-    set_clauses = []
-    values = []
-    for key, value in kwargs.items():
-        if key not in allowed_columns:
-            raise ValueError(f"Invalid column name: {key}")
-        set_clauses.append(f"{key} = ?")
-        values.append(value)
-    
+    set_clauses.append("version = version + 1")
     values.append(scooter_id)
     
+    where = "id = ?"
+    if expected_version is not None:
+        where += " AND version = ?"
+        values.append(expected_version)
+    
     with db_transaction() as conn:
         cursor = conn.cursor()
         cursor.execute(f"""
             UPDATE scooters 
             SET {', '.join(set_clauses)}
-            WHERE id = ?
+            WHERE {where}
         """, values)
-        return cursor.rowcount > 0
+        
+        updated = cursor.rowcount > 0
+        if not updated and expected_version is not None:
+            cursor.execute("SELECT 1 FROM scooters WHERE id = ?", (scooter_id,))
+            if cursor.fetchone():
+                raise ConflictError("Scooter was changed by another user. Reload it and try again.")
+        
+        return updated
+
+def find_ids(**filters):
+    if not filters:
+        return []
+    
+    conditions = []
+    values = []
+    for key, value in filters.items():
+        if key not in FILTER_COLUMNS:
+            raise ValueError(f"Invalid filter: {key}")
+        conditions.append(f"{key} = ?")
+        values.append(value)
+    
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT id FROM scooters WHERE {' AND '.join(conditions)} ORDER BY id", values)
+        return [row[0] for row in cursor.fetchall()]
+
+def update_many(scooter_ids, **kwargs):
+    if not kwargs:
+        return {'updated': [], 'failed': {}}
+    
+    set_clauses, values = _set_clauses(kwargs)
+    if 'last_maintenance_date' in kwargs and 'last_maintenance_mileage' not in kwargs:
+        if 'mileage' in kwargs:
+            set_clauses.append("last_maintenance_mileage = ?")
+            values.append(kwargs['mileage'])
+        else:
+            set_clauses.append("last_maintenance_mileage = mileage")
+    set_clauses.append("version = version + 1")
+    query = f"UPDATE scooters SET {', '.join(set_clauses)} WHERE id = ?"
+    
+    updated = []
+    failed = {}
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        for scooter_id in scooter_ids:
+            try:
+                cursor.execute(query, values + [scooter_id])
+            except sqlite3.IntegrityError as e:
+                failed[scooter_id] = f"constraint failed: {e}"
+                continue
+            
+            if cursor.rowcount > 0:
+                updated.append(scooter_id)
+            else:
+                failed[scooter_id] = "not found"
+    
+    return {'updated': updated, 'failed': failed}
+
+def delete_many(scooter_ids):
+    deleted = []
+    failed = {}
+    with db_transaction() as conn:
+        cursor = conn.cursor()
+        for scooter_id in scooter_ids:
+            cursor.execute("DELETE FROM scooters WHERE id = ?", (scooter_id,))
+            if cursor.rowcount > 0:
+                deleted.append(scooter_id)
+            else:
+                failed[scooter_id] = "not found"
+    
+    return {'deleted': deleted, 'failed': failed}
 
 def search(search_term: str):
     with db_transaction() as conn:
@@ -108,24 +166,7 @@ def search(search_term: str):
         
         results = []
         for row in cursor.fetchall():
-            results.append({
-                'id': row[0],
-                'brand': row[1],
-                'model': row[2],
-                'serial_number': row[3],
-                'top_speed': row[4],
-                'battery_capacity': row[5],
-                'soc': row[6],
-                'target_soc_min': row[7],
-                'target_soc_max': row[8],
-                'latitude': row[9],
-                'longitude': row[10],
-                'out_of_service': row[11],
-                'mileage': row[12],
-                'last_maintenance_date': row[13],
-                'in_service_date': row[14],
-                'status': row[15]
-            })
+            results.append(_row_to_dict(cursor, row))
         return results
 
 def all():
@@ -135,28 +176,79 @@ def all():
         
         results = []
         for row in cursor.fetchall():
-            results.append({
-                'id': row[0],
-                'brand': row[1],
-                'model': row[2],
-                'serial_number': row[3],
-                'top_speed': row[4],
-                'battery_capacity': row[5],
-                'soc': row[6],
-                'target_soc_min': row[7],
-                'target_soc_max': row[8],
-                'latitude': row[9],
-                'longitude': row[10],
-                'out_of_service': row[11],
-                'mileage': row[12],
-                'last_maintenance_date': row[13],
-                'in_service_date': row[14],
-                'status': row[15]
-            })
+            results.append(_row_to_dict(cursor, row))
         return results
 
 def delete(scooter_id: int) -> bool:
     with db_transaction() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM scooters WHERE id = ?", (scooter_id,))
-        return cursor.rowcount > 0
\ No newline at end of file
+        return cursor.rowcount > 0
+
+def fleet_summary():
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT status, scooter_count, soc_total, out_of_service_count, below_target_count
+            FROM fleet_summary
+        """)
+        
+        by_status = {}
+        total = soc_total = out_of_service = below_target = 0
+        for status, count, status_soc_total, status_out_of_service, status_below_target in cursor.fetchall():
+            if count:
+                by_status[status] = count
+            total += count
+            soc_total += status_soc_total
+            out_of_service += status_out_of_service
+            below_target += status_below_target
+        
+        return {
+            'total': total,
+            'by_status': by_status,
+            'average_soc': soc_total / total if total else 0.0,
+            'out_of_service': out_of_service,
+            'below_target_soc_min': below_target
+        }
+
+def maintenance_due(cutoff_date: str = None, mileage_delta: int = None, include_out_of_service: bool = True,
+                    sort_by: str = 'last_maintenance_date', descending: bool = False, limit: int = 20, offset: int = 0):
+    if sort_by not in MAINTENANCE_SORT_COLUMNS:
+        raise ValueError(f"Invalid sort column: {sort_by}")
+    
+    conditions = []
+    values = []
+    
+    if cutoff_date is not None:
+        conditions.append("last_maintenance_date <= ?")
+        values.append(cutoff_date)
+    if mileage_delta is not None:
+        conditions.append("(mileage - last_maintenance_mileage) >= ?")
+        values.append(mileage_delta)
+    if include_out_of_service:
+        conditions.append("out_of_service = 1")
+    
+    if not conditions:
+        return [], 0
+    
+    where = " OR ".join(conditions)
+    order_column = "(mileage - last_maintenance_mileage)" if sort_by == 'mileage_since_maintenance' else sort_by
+    direction = "DESC" if descending else "ASC"
+    
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM scooters WHERE {where}", values)
+        total = cursor.fetchone()[0]
+        
+        cursor.execute(f"""
+            SELECT *, (mileage - last_maintenance_mileage) AS mileage_since_maintenance
+            FROM scooters
+            WHERE {where}
+            ORDER BY {order_column} {direction}, id {direction}
+            LIMIT ? OFFSET ?
+        """, values + [limit, offset])
+        
+        results = []
+        for row in cursor.fetchall():
+            results.append(_row_to_dict(cursor, row))
+        return results, total
@@ -1,21 +1,51 @@
 
 
+import secrets
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import datetime
-from src.infrastructure.config import DATABASE_FILE
+from src.infrastructure.config import DATABASE_FILE, ensure_directories_exist
 from src.domain.constants import ROLES
-from src.infrastructure.crypto.fernet_box import encrypt
+from src.infrastructure.crypto.field_box import encrypt
 from src.infrastructure.crypto.argon2_hasher import hash
+from src.infrastructure.db.instrumentation import InstrumentedConnection
+from src.infrastructure.timeseries.varint_codec import last_sample
+
+HISTORY_BUCKET_SECONDS = 3600
+
+_unit_of_work = threading.local()
+
+CHANGE_TRACKED_TABLES = ('users', 'travellers')
 
 def get_conn():
 
-    conn = sqlite3.connect(DATABASE_FILE)
+    ensure_directories_exist()
+    conn = sqlite3.connect(DATABASE_FILE, factory=InstrumentedConnection)
     return conn
 
+def _active_conn():
+
+    return getattr(_unit_of_work, 'conn', None)
+
+def in_unit_of_work() -> bool:
+    return _active_conn() is not None
+
+def on_commit(callback):
+    """Run callback once the open unit of work commits, or right away when none is open."""
+    if _active_conn() is not None:
+        _unit_of_work.callbacks.append(callback)
+    else:
+        callback()
+
 @contextmanager
 def db_connection():
 
+    conn = _active_conn()
+    if conn is not None:
+        yield conn
+        return
+
     conn = get_conn()
     try:
         yield conn
@@ -25,7 +55,33 @@ def db_connection():
 @contextmanager
 def db_transaction():
 
+    conn = _active_conn()
+    if conn is not None:
+        yield conn
+        return
+
+    conn = get_conn()
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+@contextmanager
+def unit_of_work():
+
+    conn = _active_conn()
+    if conn is not None:
+        yield conn
+        return
+
     conn = get_conn()
+    conn.execute("BEGIN IMMEDIATE")
+    _unit_of_work.conn = conn
+    _unit_of_work.callbacks = []
     try:
         yield conn
         conn.commit()
@@ -33,9 +89,145 @@ def db_transaction():
         conn.rollback()
         raise
     finally:
+        _unit_of_work.conn = None
+        callbacks, _unit_of_work.callbacks = _unit_of_work.callbacks, []
         conn.close()
 
+    for callback in callbacks:
+        callback()
+
+def _migrate_scooter_history(conn):
+
+    for column in ('last_ts', 'last_soc', 'last_latitude', 'last_longitude'):
+        _add_column_if_missing(conn, 'scooter_history', column, 'INTEGER')
+
+    cursor = conn.execute("SELECT scooter_id, hour, samples FROM scooter_history WHERE last_ts IS NULL")
+    for scooter_id, hour, samples in cursor.fetchall():
+        conn.execute("""
+            UPDATE scooter_history SET last_ts = ?, last_soc = ?, last_latitude = ?, last_longitude = ?
+            WHERE scooter_id = ? AND hour = ?
+        """, (*last_sample(samples, hour * HISTORY_BUCKET_SECONDS), scooter_id, hour))
+
+    conn.execute("DELETE FROM scooter_history WHERE scooter_id NOT IN (SELECT id FROM scooters)")
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS scooter_history_delete AFTER DELETE ON scooters
+        BEGIN DELETE FROM scooter_history WHERE scooter_id = OLD.id; END
+    """)
+
+def _add_column_if_missing(conn, table: str, column: str, definition: str) -> bool:
+
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+    if column in columns:
+        return False
+
+    conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return True
+
+def _migrate_fleet_summary(conn):
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fleet_summary (
+            status TEXT PRIMARY KEY,
+            scooter_count INTEGER NOT NULL DEFAULT 0,
+            soc_total INTEGER NOT NULL DEFAULT 0,
+            out_of_service_count INTEGER NOT NULL DEFAULT 0,
+            below_target_count INTEGER NOT NULL DEFAULT 0
+        )
+    """)
+
+    existing = conn.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'scooters_fleet_summary_%'"
+    ).fetchone()[0]
+    if existing == 3:
+        return
+
+    add_new = """
+        INSERT OR IGNORE INTO fleet_summary (status) VALUES (NEW.status);
+        UPDATE fleet_summary SET
+            scooter_count = scooter_count + 1,
+            soc_total = soc_total + NEW.soc,
+            out_of_service_count = out_of_service_count + NEW.out_of_service,
+            below_target_count = below_target_count + (NEW.soc < NEW.target_soc_min)
+        WHERE status = NEW.status;
+    """
+    remove_old = """
+        UPDATE fleet_summary SET
+            scooter_count = scooter_count - 1,
+            soc_total = soc_total - OLD.soc,
+            out_of_service_count = out_of_service_count - OLD.out_of_service,
+            below_target_count = below_target_count - (OLD.soc < OLD.target_soc_min)
+        WHERE status = OLD.status;
+    """
+
+    conn.execute("DROP TRIGGER IF EXISTS scooters_fleet_summary_insert")
+    conn.execute("DROP TRIGGER IF EXISTS scooters_fleet_summary_update")
+    conn.execute("DROP TRIGGER IF EXISTS scooters_fleet_summary_delete")
+    conn.execute(f"CREATE TRIGGER scooters_fleet_summary_insert AFTER INSERT ON scooters BEGIN {add_new} END")
+    conn.execute(f"""
+        CREATE TRIGGER scooters_fleet_summary_update
+        AFTER UPDATE OF status, soc, target_soc_min, out_of_service ON scooters
+        BEGIN {remove_old} {add_new} END
+    """)
+    conn.execute(f"CREATE TRIGGER scooters_fleet_summary_delete AFTER DELETE ON scooters BEGIN {remove_old} END")
+
+    conn.execute("DELETE FROM fleet_summary")
+    conn.execute("""
+        INSERT INTO fleet_summary (status, scooter_count, soc_total, out_of_service_count, below_target_count)
+        SELECT status, COUNT(*), SUM(soc), SUM(out_of_service), SUM(soc < target_soc_min)
+        FROM scooters GROUP BY status
+    """)
+
+def _create_change_tracking(conn):
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log (
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            PRIMARY KEY (table_name, row_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_log_seq ON change_log(seq)")
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS backup_meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        )
+    """)
+    conn.execute("INSERT OR IGNORE INTO backup_meta (key, value) VALUES ('epoch', ?)", (secrets.token_hex(8),))
+
+    for table in CHANGE_TRACKED_TABLES:
+        for operation, row in (('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{operation.lower()}_changes AFTER {operation} ON {table}
+                BEGIN
+                    INSERT OR REPLACE INTO change_log (table_name, row_id, seq)
+                    VALUES ('{table}', {row}.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM change_log));
+                END
+            """)
+
+ISO_DATE_GLOB = '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+
+def _normalize_date(value: str) -> str:
+
+    try:
+        return datetime.strptime(value.strip(), '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return value
+
+def _normalize_scooter_dates(conn):
+
+    for column in ('last_maintenance_date', 'in_service_date'):
+        rows = conn.execute(f"SELECT id, {column} FROM scooters WHERE {column} NOT GLOB ?", (ISO_DATE_GLOB,)).fetchall()
+        updates = [(_normalize_date(value), scooter_id) for scooter_id, value in rows if _normalize_date(value) != value]
+        if updates:
+            conn.executemany(f"UPDATE scooters SET {column} = ? WHERE id = ?", updates)
+
 def migrate():
+    with db_connection() as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
+
     with db_transaction() as conn:
 
         conn.execute("""
@@ -66,10 +258,19 @@ def migrate():
                 email_enc TEXT NOT NULL,
                 phone_enc TEXT NOT NULL,
                 license_enc TEXT NOT NULL,
-                registered_at TEXT NOT NULL
+                registered_at TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                email_hmac TEXT,
+                license_hmac TEXT
             )
         """)
 
+        _add_column_if_missing(conn, 'travellers', 'version', 'INTEGER NOT NULL DEFAULT 1')
+        _add_column_if_missing(conn, 'travellers', 'email_hmac', 'TEXT')
+        _add_column_if_missing(conn, 'travellers', 'license_hmac', 'TEXT')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_travellers_email_hmac ON travellers(email_hmac)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_travellers_license_hmac ON travellers(license_hmac)")
+
         conn.execute("""
             CREATE TABLE IF NOT EXISTS scooters (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -87,7 +288,51 @@ def migrate():
                 mileage INTEGER CHECK(mileage >= 0) NOT NULL,
                 last_maintenance_date TEXT NOT NULL,
                 in_service_date TEXT NOT NULL,
-                status TEXT CHECK(status IN ('active','maintenance','retired')) NOT NULL
+                status TEXT CHECK(status IN ('active','maintenance','retired')) NOT NULL,
+                last_maintenance_mileage INTEGER NOT NULL DEFAULT 0,
+                version INTEGER NOT NULL DEFAULT 1
+            )
+        """)
+
+        _add_column_if_missing(conn, 'scooters', 'version', 'INTEGER NOT NULL DEFAULT 1')
+
+        if _add_column_if_missing(conn, 'scooters', 'last_maintenance_mileage', 'INTEGER NOT NULL DEFAULT 0'):
+            conn.execute("UPDATE scooters SET last_maintenance_mileage = mileage")
+
+        _normalize_scooter_dates(conn)
+
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_scooters_last_maintenance_date ON scooters(last_maintenance_date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_scooters_out_of_service ON scooters(out_of_service)")
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_scooters_mileage_since_maintenance
+            ON scooters((mileage - last_maintenance_mileage))
+        """)
+
+        _migrate_fleet_summary(conn)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scooter_history (
+                scooter_id INTEGER NOT NULL,
+                hour INTEGER NOT NULL,
+                resolution INTEGER NOT NULL DEFAULT 0,
+                sample_count INTEGER NOT NULL,
+                samples BLOB NOT NULL,
+                PRIMARY KEY (scooter_id, hour)
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_scooter_history_resolution ON scooter_history(resolution, hour)")
+        _migrate_scooter_history(conn)
+
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS reencryption_progress (
+                target TEXT PRIMARY KEY,
+                generation TEXT NOT NULL,
+                last_id INTEGER NOT NULL DEFAULT 0,
+                processed INTEGER NOT NULL DEFAULT 0,
+                total INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                done INTEGER NOT NULL DEFAULT 0,
+                updated_at TEXT NOT NULL
             )
         """)
 
@@ -98,10 +343,17 @@ def migrate():
                 granted_to_user_id INTEGER NOT NULL,
                 code_hash TEXT NOT NULL,
                 used INTEGER DEFAULT 0,
-                created_at TEXT NOT NULL
+                created_at TEXT NOT NULL,
+                lookup_id TEXT
             )
         """)
 
+        _add_column_if_missing(conn, 'restore_codes', 'lookup_id', 'TEXT')
+        conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_restore_codes_lookup_id ON restore_codes(lookup_id)")
+        conn.execute("""
+            DELETE FROM restore_codes WHERE lookup_id IS NULL OR code_hash NOT LIKE 'hmac-sha256$%'
+        """)
+
         conn.execute("""
             CREATE TABLE IF NOT EXISTS log_state (
                 user_id INTEGER PRIMARY KEY,
@@ -109,6 +361,8 @@ def migrate():
             )
         """)
 
+        _create_change_tracking(conn)
+
         conn.execute("""
             INSERT OR IGNORE INTO users (username_norm, username_enc, pw_hash, role, first_name_enc, last_name_enc, registered_at)
             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -1,7 +1,16 @@
 
 
 from .sqlite import db_connection, db_transaction
-from src.infrastructure.crypto.fernet_box import encrypt
+from src.infrastructure.crypto.field_box import encrypt, decrypt
+from src.infrastructure.crypto.lookup_hmac import lookup_hash
+from src.domain.errors import ConflictError
+
+BACKFILL_CHUNK_SIZE = 500
+LOOKUP_CHUNK_SIZE = 500
+
+def _row_to_dict(cursor, row):
+
+    return {column[0]: value for column, value in zip(cursor.description, row)}
 
 def add(customer_id: str, first_name: str, last_name: str, birthday: str, gender: str,
         street: str, house_no: str, zip_code: str, city: str, email: str, phone: str, license: str, registered_at: str):
@@ -10,8 +19,9 @@ def add(customer_id: str, first_name: str, last_name: str, birthday: str, gender
         
         cursor.execute("""
             INSERT INTO travellers (customer_id, first_name_enc, last_name_enc, birthday, gender,
-                                  street_enc, house_no_enc, zip_enc, city, email_enc, phone_enc, license_enc, registered_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                  street_enc, house_no_enc, zip_enc, city, email_enc, phone_enc, license_enc, registered_at,
+                                  email_hmac, license_hmac)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """, (
             customer_id,
             encrypt(first_name),
@@ -25,7 +35,9 @@ def add(customer_id: str, first_name: str, last_name: str, birthday: str, gender
             encrypt(email),
             encrypt(phone),
             encrypt(license),
-            registered_at
+            registered_at,
+            lookup_hash('email', email),
+            lookup_hash('license', license)
         ))
         
         return cursor.lastrowid
@@ -38,22 +50,7 @@ def all():
         
         result = []
         for row in rows:
-            result.append({
-                'id': row[0],
-                'customer_id': row[1],
-                'first_name_enc': row[2],
-                'last_name_enc': row[3],
-                'birthday': row[4],
-                'gender': row[5],
-                'street_enc': row[6],
-                'house_no_enc': row[7],
-                'zip_enc': row[8],
-                'city': row[9],
-                'email_enc': row[10],
-                'phone_enc': row[11],
-                'license_enc': row[12],
-                'registered_at': row[13]
-            })
+            result.append(_row_to_dict(cursor, row))
         
         return result
 
@@ -66,33 +63,12 @@ def get_by_id(traveller_id: int):
         if not row:
             return None
             
-        return {
-            'id': row[0],
-            'customer_id': row[1],
-            'first_name_enc': row[2],
-            'last_name_enc': row[3],
-            'birthday': row[4],
-            'gender': row[5],
-            'street_enc': row[6],
-            'house_no_enc': row[7],
-            'zip_enc': row[8],
-            'city': row[9],
-            'email_enc': row[10],
-            'phone_enc': row[11],
-            'license_enc': row[12],
-            'registered_at': row[13]
-        }
-
-def update(traveller_id: int, **kwargs):
+        return _row_to_dict(cursor, row)
+
+def update(traveller_id: int, expected_version: int = None, **kwargs):
     with db_transaction() as conn:
         cursor = conn.cursor()
         
-        
-        cursor.execute("SELECT id FROM travellers WHERE id = ?", (traveller_id,))
-        if not cursor.fetchone():
-            return False
-        
-        
         update_fields = []
         values = []
         
@@ -115,12 +91,16 @@ def update(traveller_id: int, **kwargs):
             elif field == 'email':
                 update_fields.append('email_enc = ?')
                 values.append(encrypt(value))
+                update_fields.append('email_hmac = ?')
+                values.append(lookup_hash('email', value))
             elif field == 'phone':
                 update_fields.append('phone_enc = ?')
                 values.append(encrypt(value))
             elif field == 'license':
                 update_fields.append('license_enc = ?')
                 values.append(encrypt(value))
+                update_fields.append('license_hmac = ?')
+                values.append(lookup_hash('license', value))
             elif field in ['birthday', 'gender', 'city']:
                 update_fields.append(f'{field} = ?')
                 values.append(value)
@@ -128,14 +108,84 @@ def update(traveller_id: int, **kwargs):
         if not update_fields:
             return False
         
+        update_fields.append('version = version + 1')
         values.append(traveller_id)
         query = f"UPDATE travellers SET {', '.join(update_fields)} WHERE id = ?"
+        if expected_version is not None:
+            query += " AND version = ?"
+            values.append(expected_version)
         cursor.execute(query, values)
         
-        return cursor.rowcount > 0
+        updated = cursor.rowcount > 0
+        if not updated and expected_version is not None:
+            cursor.execute("SELECT 1 FROM travellers WHERE id = ?", (traveller_id,))
+            if cursor.fetchone():
+                raise ConflictError("Traveller was changed by another user. Reload it and try again.")
+        
+        return updated
 
 def delete(traveller_id: int):
     with db_transaction() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM travellers WHERE id = ?", (traveller_id,))
         return cursor.rowcount > 0
+
+def find_registered(emails=(), licenses=(), exclude_id: int = None):
+    lookups = {}
+    for field, values in (('email', emails), ('license', licenses)):
+        for value in values:
+            lookups[(field, lookup_hash(field, value))] = value
+
+    found = {'email': set(), 'license': set()}
+    keys = list(lookups)
+
+    with db_connection() as conn:
+        cursor = conn.cursor()
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+            email_hashes = [digest for field, digest in chunk if field == 'email']
+            license_hashes = [digest for field, digest in chunk if field == 'license']
+
+            cursor.execute(f"""
+                SELECT email_hmac, license_hmac FROM travellers
+                WHERE (email_hmac IN ({', '.join('?' * len(email_hashes)) or 'NULL'})
+                    OR license_hmac IN ({', '.join('?' * len(license_hashes)) or 'NULL'}))
+                  AND id != ?
+            """, email_hashes + license_hashes + [exclude_id if exclude_id is not None else -1])
+
+            for email_hmac, license_hmac in cursor.fetchall():
+                if ('email', email_hmac) in lookups:
+                    found['email'].add(lookups[('email', email_hmac)])
+                if ('license', license_hmac) in lookups:
+                    found['license'].add(lookups[('license', license_hmac)])
+
+    return found
+
+def backfill_lookup_hashes(chunk_size: int = BACKFILL_CHUNK_SIZE):
+    last_id = 0
+    filled = 0
+
+    while True:
+        with db_transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, email_enc, license_enc FROM travellers
+                WHERE id > ? AND (email_hmac IS NULL OR license_hmac IS NULL)
+                ORDER BY id LIMIT ?
+            """, (last_id, chunk_size))
+            rows = cursor.fetchall()
+
+            updates = []
+            for traveller_id, email_enc, license_enc in rows:
+                try:
+                    updates.append((lookup_hash('email', decrypt(email_enc)),
+                                    lookup_hash('license', decrypt(license_enc)), traveller_id))
+                except Exception:
+                    continue
+
+            cursor.executemany("UPDATE travellers SET email_hmac = ?, license_hmac = ? WHERE id = ?", updates)
+
+        filled += len(updates)
+        if len(rows) < chunk_size:
+            return filled
+        last_id = rows[-1][0]
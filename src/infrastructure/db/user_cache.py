@@ -0,0 +1,89 @@
+import threading
+import time
+from collections import OrderedDict
+
+class UserCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 30.0, clock=time.monotonic):
+        if max_entries < 1 or ttl_seconds <= 0:
+            raise ValueError("Cache limits must be positive")
+
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._ids = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def _drop(self, username_norm: str):
+
+        expires_at, record, version = self._entries.pop(username_norm)
+        self._ids.pop(record['id'], None)
+
+    def get(self, username_norm: str):
+        with self._lock:
+            entry = self._entries.get(username_norm)
+            if entry is not None and entry[0] <= self._clock():
+                self._drop(username_norm)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(username_norm)
+            self.hits += 1
+            return dict(entry[1]), entry[2]
+
+    def put(self, record: dict, generation: int, version=None):
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            username_norm = record['username_norm']
+            if username_norm in self._entries:
+                self._drop(username_norm)
+
+            self._entries[username_norm] = (self._clock() + self.ttl_seconds, dict(record), version)
+            self._ids[record['id']] = username_norm
+
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, username_norm: str = None, user_id: int = None):
+        with self._lock:
+            self._generation += 1
+            if username_norm is None and user_id is not None:
+                username_norm = self._ids.get(user_id)
+            if username_norm in self._entries:
+                self._drop(username_norm)
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._ids.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
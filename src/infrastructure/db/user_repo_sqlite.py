@@ -1,16 +1,70 @@
+import sqlite3
+import threading
+from .sqlite import db_connection, in_unit_of_work, on_commit
+from .instrumentation import InstrumentedConnection
+from .user_cache import UserCache
+from src.infrastructure.config import DATABASE_FILE, USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS
+from src.infrastructure.crypto.field_box import encrypt, decrypt
 
+_cache = UserCache(USER_CACHE_MAX_ENTRIES, USER_CACHE_TTL_SECONDS)
+_version_conn = None
+_version_lock = threading.Lock()
 
-from .sqlite import db_connection
-from src.infrastructure.crypto.fernet_box import encrypt, decrypt
+ROW_VERSION_SQL = """
+    (SELECT seq FROM change_log WHERE table_name = 'users' AND row_id = users.id),
+    (SELECT value FROM backup_meta WHERE key = 'epoch')
+"""
 
 def get_by_username_norm(username_norm: str):
+    if in_unit_of_work():
+        return _load(username_norm)[0]
+
+    cached = _cache.get(username_norm)
+    if cached is not None:
+        record, version = cached
+        if _current_version(username_norm) == version:
+            return record
+        _cache.invalidate(username_norm)
+
+    generation = _cache.generation()
+    record, version = _load(username_norm)
+    if record is not None:
+        _cache.put(record, generation, version)
+    return record
+
+def _current_version(username_norm: str):
+    global _version_conn
+
+    with _version_lock:
+        if _version_conn is None:
+            _version_conn = sqlite3.connect(DATABASE_FILE, factory=InstrumentedConnection,
+                                            isolation_level=None, check_same_thread=False)
+        row = _version_conn.execute(
+            f"SELECT id, {ROW_VERSION_SQL} FROM users WHERE username_norm = ?", (username_norm,)
+        ).fetchone()
+    return tuple(row) if row else None
+
+def _close_version_conn():
+    global _version_conn
+
+    with _version_lock:
+        if _version_conn is not None:
+            _version_conn.close()
+            _version_conn = None
+
+def _load(username_norm: str):
+
     with db_connection() as conn:
         cursor = conn.cursor()
-        cursor.execute("SELECT * FROM users WHERE username_norm = ?", (username_norm,))
+        cursor.execute(f"""
+            SELECT id, username_norm, username_enc, pw_hash, role, first_name_enc, last_name_enc, registered_at,
+                   {ROW_VERSION_SQL}
+            FROM users WHERE username_norm = ?
+        """, (username_norm,))
         row = cursor.fetchone()
         
         if not row:
-            return None
+            return None, None
 
         return {
             'id': row[0],
@@ -21,7 +75,7 @@ def get_by_username_norm(username_norm: str):
             'first_name': decrypt(row[5]),
             'last_name': decrypt(row[6]),
             'registered_at': row[7]
-        }
+        }, (row[0], row[8], row[9])
 
 def add(username_norm: str, pw_hash: str, role: str, first_name: str, last_name: str, registered_at: str):
     from .sqlite import db_transaction
@@ -41,14 +95,20 @@ def add(username_norm: str, pw_hash: str, role: str, first_name: str, last_name:
             registered_at
         ))
         
-        return cursor.lastrowid
+        user_id = cursor.lastrowid
+
+    on_commit(lambda: _cache.invalidate(username_norm))
+    return user_id
 
 def update_password(user_id: int, new_hash: str):
     from .sqlite import db_transaction
     with db_transaction() as conn:
         cursor = conn.cursor()
         cursor.execute("UPDATE users SET pw_hash = ? WHERE id = ?", (new_hash, user_id))
-        return cursor.rowcount > 0
+        updated = cursor.rowcount > 0
+
+    on_commit(lambda: _cache.invalidate(user_id=user_id))
+    return updated
 
 def update_profile(user_id: int, **kwargs):
     from .sqlite import db_transaction
@@ -75,12 +135,24 @@ def update_profile(user_id: int, **kwargs):
         values.append(user_id)
         query = f"UPDATE users SET {', '.join(set_clauses)} WHERE id = ?"
         cursor.execute(query, values)
-        
-        return cursor.rowcount > 0
+        updated = cursor.rowcount > 0
+
+    on_commit(lambda: _cache.invalidate(user_id=user_id))
+    return updated
 
 def delete(user_id: int):
     from .sqlite import db_transaction
     with db_transaction() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM users WHERE id = ?", (user_id,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+
+    on_commit(lambda: _cache.invalidate(user_id=user_id))
+    return deleted
+
+def clear_cache():
+    _cache.clear()
+    _close_version_conn()
+
+def cache_stats():
+    return _cache.stats()
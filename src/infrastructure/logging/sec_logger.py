@@ -1,34 +1,102 @@
 
 
+import fcntl
 import json
+import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from src.infrastructure.config import ENCRYPTION_LOGS_FILE
+from src.infrastructure.config import ENCRYPTION_LOGS_FILE, ENCRYPTION_LOGS_LOCK_FILE, ensure_directories_exist
 from src.infrastructure.crypto.fernet_box import encrypt, decrypt
 
+_write_lock = threading.Lock()
+_listeners = []
+_rowid_state = {'inode': None, 'offset': 0, 'max_rowid': 0}
+
+@contextmanager
+def write_lock():
+    with _write_lock:
+        ensure_directories_exist()
+        with open(ENCRYPTION_LOGS_LOCK_FILE, 'a') as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def add_listener(listener):
+    _listeners.append(listener)
+
+def remove_listener(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def _notify(record: dict):
+
+    for listener in list(_listeners):
+        try:
+            listener(record)
+        except Exception as e:
+            _append('log_listener_failed', 'system',
+                    {'listener': getattr(listener, '__qualname__', repr(listener)),
+                     'event': record['event'], 'error': f"{type(e).__name__}: {e}"}, True)
+
 def _get_next_rowid():
 
-    existing_logs = read_all()
-    if not existing_logs:
+    try:
+        stat = os.stat(ENCRYPTION_LOGS_FILE)
+    except FileNotFoundError:
+        _rowid_state.update(inode=None, offset=0, max_rowid=0)
         return 1
-    
-    max_rowid = max(log.get('rowid', 0) for log in existing_logs)
-    return max_rowid + 1
+
+    if stat.st_ino != _rowid_state['inode'] or stat.st_size < _rowid_state['offset']:
+        _rowid_state.update(inode=stat.st_ino, offset=0, max_rowid=0)
+
+    if stat.st_size > _rowid_state['offset']:
+        with open(ENCRYPTION_LOGS_FILE, 'rb') as f:
+            f.seek(_rowid_state['offset'])
+            data = f.read()
+
+        end = data.rfind(b'\n') + 1
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rowid = json.loads(decrypt(line.decode(), use_cache=False)).get('rowid', 0)
+            except Exception:
+                continue
+            _rowid_state['max_rowid'] = max(_rowid_state['max_rowid'], rowid)
+        _rowid_state['offset'] += end
+
+    return _rowid_state['max_rowid'] + 1
+
+def _append(event: str, user: str = None, details: dict = None, suspicious: bool = False):
+    with write_lock():
+        record = {
+            'ts': datetime.now().isoformat(),
+            'user': user,
+            'event': event,
+            'details': details or {},
+            'suspicious': suspicious,
+            'rowid': _get_next_rowid()
+        }
+        
+        json_line = json.dumps(record)
+        encrypted_line = encrypt(json_line)
+        
+        ensure_directories_exist()
+        with open(ENCRYPTION_LOGS_FILE, 'a') as f:
+            caught_up = f.tell() == _rowid_state['offset']
+            f.write(encrypted_line + '\n')
+            if caught_up:
+                f.flush()
+                _rowid_state.update(inode=os.fstat(f.fileno()).st_ino, offset=f.tell(), max_rowid=record['rowid'])
+
+    return record
 
 def log(event: str, user: str = None, details: dict = None, suspicious: bool = False):
-    record = {
-        'ts': datetime.now().isoformat(),
-        'user': user,
-        'event': event,
-        'details': details or {},
-        'suspicious': suspicious,
-        'rowid': _get_next_rowid()
-    }
-    
-    json_line = json.dumps(record)
-    encrypted_line = encrypt(json_line)
-    
-    with open(ENCRYPTION_LOGS_FILE, 'a') as f:
-        f.write(encrypted_line + '\n')
+    _notify(_append(event, user, details, suspicious))
 
 def read_all():
     if not ENCRYPTION_LOGS_FILE.exists():
@@ -40,7 +108,7 @@ def read_all():
             line = line.strip()
             if line:
                 try:
-                    decrypted = decrypt(line)
+                    decrypted = decrypt(line, use_cache=False)
                     record = json.loads(decrypted)
                     records.append(record)
                 except:
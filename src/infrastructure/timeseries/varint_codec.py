@@ -0,0 +1,74 @@
+
+
+COORDINATE_SCALE = 1_000_000
+
+def _zigzag(value: int) -> int:
+
+    return (value << 1) ^ (value >> 63)
+
+def _unzigzag(value: int) -> int:
+
+    return (value >> 1) ^ -(value & 1)
+
+def _write_varint(buffer: bytearray, value: int):
+
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def _read_varint(data: bytes, position: int):
+
+    result = 0
+    shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, position
+        shift += 7
+
+def to_fixed(sample):
+
+    ts, soc, latitude, longitude = sample
+    return (int(ts), int(soc), round(latitude * COORDINATE_SCALE), round(longitude * COORDINATE_SCALE))
+
+def encode(samples, base_ts: int) -> bytes:
+    buffer = bytearray()
+    previous = (base_ts, 0, 0, 0)
+
+    for sample in samples:
+        current = to_fixed(sample)
+        for value, previous_value in zip(current, previous):
+            _write_varint(buffer, _zigzag(value - previous_value))
+        previous = current
+
+    return bytes(buffer)
+
+def decode(data: bytes, base_ts: int):
+    samples = []
+    previous = [base_ts, 0, 0, 0]
+    position = 0
+
+    while position < len(data):
+        current = []
+        for previous_value in previous:
+            delta, position = _read_varint(data, position)
+            current.append(previous_value + _unzigzag(delta))
+        previous = current
+        samples.append((current[0], current[1], current[2] / COORDINATE_SCALE, current[3] / COORDINATE_SCALE))
+
+    return samples
+
+def append(last, sample):
+    current = to_fixed(sample)
+    buffer = bytearray()
+    for value, previous_value in zip(current, last):
+        _write_varint(buffer, _zigzag(value - previous_value))
+
+    return bytes(buffer), current
+
+def last_sample(data: bytes, base_ts: int):
+    samples = decode(data, base_ts)
+    return to_fixed(samples[-1]) if samples else (base_ts, 0, 0, 0)
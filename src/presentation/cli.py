@@ -7,6 +7,7 @@ from src.domain.validators import (
     validate_username, validate_email, validate_house_number
 )
 from src.domain.constants import ROLES
+from src.domain.policies import RESTORE_CODE_TTL_HOURS
 
 def run(app):
     current_user: Optional[CurrentUser] = None
@@ -104,9 +105,11 @@ def super_admin_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
         print("C) Create Backup")
         print("D) Restore Backup (Direct)")
         print("E) View Logs")
-        print("F) Logout")
+        print("F) View Query Statistics")
+        print("G) Encryption Keys")
+        print("H) Logout")
         
-        choice = input("\nChoose option (A-F): ")
+        choice = input("\nChoose option (A-H): ")
         
         if choice == "A":
             create_system_admin(app, current_user)
@@ -119,9 +122,13 @@ def super_admin_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
         elif choice == "E":
             view_logs(app, current_user)
         elif choice == "F":
+            view_query_stats_flow(app, current_user)
+        elif choice == "G":
+            encryption_keys_flow(app, current_user)
+        elif choice == "H":
             return None
         else:
-            print("Invalid option. Please choose A-F.")
+            print("Invalid option. Please choose A-H.")
 
 def sys_admin_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
 
@@ -145,9 +152,13 @@ def sys_admin_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
         print("N) Restore from Backup (with code)")
         print("O) Create Backup")
         print("P) View Logs")
-        print("Q) Logout")
+        print("Q) View Query Statistics")
+        print("R) Fleet Summary")
+        print("S) Maintenance Due")
+        print("T) Batch Scooter Operation")
+        print("U) Logout")
         
-        choice = input("\nChoose option (A-Q): ")
+        choice = input("\nChoose option (A-U): ")
         
         if choice == "A":
             change_password_flow(app, current_user)
@@ -182,9 +193,17 @@ def sys_admin_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
         elif choice == "P":
             view_logs(app, current_user)
         elif choice == "Q":
+            view_query_stats_flow(app, current_user)
+        elif choice == "R":
+            fleet_summary_flow(app, current_user)
+        elif choice == "S":
+            maintenance_due_flow(app, current_user)
+        elif choice == "T":
+            batch_scooter_flow(app, current_user)
+        elif choice == "U":
             return None
         else:
-            print("Invalid option. Please choose A-O.")
+            print("Invalid option. Please choose A-U.")
 
 def engineer_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
 
@@ -199,9 +218,10 @@ def engineer_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
         print("E) Delete Traveller")
         print("F) Search Scooter")
         print("G) Update Scooter")
-        print("H) Logout")
+        print("H) Maintenance Due")
+        print("I) Logout")
         
-        choice = input("\nChoose option (A-H): ")
+        choice = input("\nChoose option (A-I): ")
         
         if choice == "A":
             change_password_flow(app, current_user)
@@ -218,9 +238,11 @@ def engineer_menu(app, current_user: CurrentUser) -> Optional[CurrentUser]:
         elif choice == "G":
             update_scooter_flow(app, current_user)
         elif choice == "H":
+            maintenance_due_flow(app, current_user)
+        elif choice == "I":
             return None
         else:
-            print("Invalid option. Please choose A-H.")
+            print("Invalid option. Please choose A-I.")
 
 def create_system_admin(app, current_user: CurrentUser):
 
@@ -337,8 +359,8 @@ def search_traveller_flow(app, current_user: CurrentUser):
             print(f"\nFound {len(matches)} traveller(s):")
             print("-" * 60)
             for traveller in matches:
-                first_name = app.crypto.decrypt(traveller['first_name_enc'])
-                last_name = app.crypto.decrypt(traveller['last_name_enc'])
+                first_name = app.crypto_box.decrypt(traveller['first_name_enc'])
+                last_name = app.crypto_box.decrypt(traveller['last_name_enc'])
                 print(f"ID: {traveller['id']} | Customer: {traveller['customer_id']} | Name: {first_name} {last_name}")
         else:
             print("No travellers found matching your search.")
@@ -412,7 +434,7 @@ def update_traveller_flow(app, current_user: CurrentUser):
             return
         
         
-        success = app.update_traveller(current_user, traveller_id, **update_data)
+        success = app.update_traveller(current_user, traveller_id, expected_version=traveller['version'], **update_data)
         
         if success:
             print("Traveller updated successfully!")
@@ -461,8 +483,18 @@ def create_backup_flow(app, current_user: CurrentUser):
     print("CREATE BACKUP")
     print("-"*30)
     
+    modes = {'F': 'full', 'I': 'incremental', 'D': 'differential'}
+    choice = input("Backup type - (F)ull, (I)ncremental, (D)ifferential [F]: ").strip().upper() or 'F'
+    if choice not in modes:
+        print("Invalid backup type.")
+        return
+    
+    def show_progress(copied, total):
+        print(f"\rCopying database: {copied}/{total} pages", end="", flush=True)
+    
     try:
-        backup_name = app.create_backup(current_user)
+        backup_name = app.create_backup(current_user, progress=show_progress, mode=modes[choice])
+        print()
         print(f"Backup created: {backup_name}")
         
     except Exception as e:
@@ -492,6 +524,7 @@ def generate_restore_code(app, current_user: CurrentUser):
         print("SAVE THIS CODE NOW - IT WON'T BE SHOWN AGAIN!")
         print("="*60)
         print(f"Restore Code: {restore_code}")
+        print(f"Valid for {RESTORE_CODE_TTL_HOURS} hours.")
         print("="*60)
         
     except ValidationError as e:
@@ -616,6 +649,102 @@ def view_logs(app, current_user: CurrentUser):
     except Exception as e:
         print("Failed to read logs. Please try again.")
 
+def view_query_stats_flow(app, current_user: CurrentUser):
+
+    print("\n" + "-"*30)
+    print("QUERY STATISTICS")
+    print("-"*30)
+    
+    try:
+        stats = app.view_query_stats(current_user)
+        
+        print(f"Connections opened: {stats['connections_opened']}")
+        print(f"Slow query threshold: {stats['slow_query_threshold_ms']} ms")
+        
+        cache = stats.get('decrypt_cache')
+        if cache:
+            print(f"Decrypt cache: {cache['entries']} entries, {cache['hits']} hits, "
+                  f"{cache['misses']} misses ({cache['hit_rate']:.0%} hit rate)")
+        
+        user_cache = stats.get('user_cache')
+        if user_cache:
+            print(f"User cache: {user_cache['entries']} entries, {user_cache['hits']} hits, "
+                  f"{user_cache['misses']} misses ({user_cache['hit_rate']:.0%} hit rate)")
+        
+        detector = stats.get('anomaly_detector')
+        if detector:
+            print(f"Anomaly detector: {detector['entries']} active windows, {detector['flagged']} flagged")
+        
+        limiter = stats.get('login_rate_limiter')
+        if limiter:
+            details = ', '.join(f"{value} {key.replace('_', ' ')}" for key, value in limiter.items() if key != 'entries')
+            print(f"Login rate limiter: {limiter['entries']} tracked names ({details})")
+        
+        if not stats['statements']:
+            print("No statements recorded.")
+            return
+        
+        print("-" * 80)
+        print(f"{'Count':>7} {'Avg ms':>9} {'Max ms':>9} {'Rows':>8}  Statement")
+        print("-" * 80)
+        
+        for entry in stats['statements'][:20]:
+            statement = entry['statement'][:40]
+            print(f"{entry['count']:>7} {entry['avg_ms']:>9.2f} {entry['max_ms']:>9.2f} {entry['rows']:>8}  {statement}")
+        
+        reset = input("\nReset statistics? (yes/no): ").strip().lower()
+        if reset == 'yes':
+            app.reset_query_stats(current_user)
+            print("Statistics reset.")
+        
+    except ValidationError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print("Failed to read query statistics. Please try again.")
+
+def encryption_keys_flow(app, current_user: CurrentUser):
+
+    print("\n" + "-"*30)
+    print("ENCRYPTION KEYS")
+    print("-"*30)
+    
+    try:
+        status = app.encryption_key_status(current_user)
+        
+        print(f"Primary key: {status['primary_key']}")
+        print(f"Keys in use: {status['key_count']}")
+        print(f"Re-encryption running: {'yes' if status['running'] else 'no'}")
+        
+        for target in status['targets']:
+            total = target['total'] if target['total'] is not None else '?'
+            state = 'done' if target['done'] else 'pending'
+            print(f"  {target['target']:<12} {target['processed']}/{total} {state}"
+                  + (f" ({target['failed']} failed)" if target['failed'] else ""))
+        
+        print("\nA) Rotate key")
+        print("B) Retire old keys")
+        print("C) Back")
+        choice = input("\nChoose option (A-C): ").strip().upper()
+        
+        if choice == "A":
+            confirm = input("Rotate the encryption key and re-encrypt all data in the background? (yes/no): ").strip().lower()
+            if confirm == 'yes':
+                status = app.rotate_encryption_key(current_user)
+                print(f"Key rotated. New primary key: {status['primary_key']}")
+                print("Re-encryption is running in the background.")
+        elif choice == "B":
+            print("Warning: backups created before the last rotation can no longer be restored once old keys are retired.")
+            print("Retiring is refused if any value could not be re-encrypted.")
+            confirm = input("Retire old keys? (yes/no): ").strip().lower()
+            if confirm == 'yes':
+                retired = app.retire_old_encryption_keys(current_user)
+                print(f"Retired {retired} old key(s).")
+        
+    except ValidationError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print("Failed to manage encryption keys. Please try again.")
+
 def add_scooter_flow(app, current_user: CurrentUser):
 
     print("\n" + "-"*30)
@@ -694,6 +823,77 @@ def search_scooter_flow(app, current_user: CurrentUser):
     except Exception as e:
         print("Failed to search scooters. Please try again.")
 
+def fleet_summary_flow(app, current_user: CurrentUser):
+
+    print("\n" + "-"*30)
+    print("FLEET SUMMARY")
+    print("-"*30)
+    
+    try:
+        summary = app.fleet_summary(current_user)
+        
+        print(f"Total scooters: {summary['total']}")
+        for status, count in sorted(summary['by_status'].items()):
+            print(f"  {status}: {count}")
+        print(f"Average SoC: {summary['average_soc']:.1f}%")
+        print(f"Out of service: {summary['out_of_service']}")
+        print(f"Below target SoC min: {summary['below_target_soc_min']}")
+        
+    except ValidationError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print("Failed to load fleet summary. Please try again.")
+
+def maintenance_due_flow(app, current_user: CurrentUser):
+
+    print("\n" + "-"*30)
+    print("MAINTENANCE DUE")
+    print("-"*30)
+    
+    try:
+        max_days = input("Days since last maintenance (Enter for default): ").strip()
+        max_mileage = input("Mileage since last maintenance (Enter for default): ").strip()
+        sort_by = input("Sort by (last_maintenance_date/mileage_since_maintenance/mileage/id) [last_maintenance_date]: ").strip()
+        
+        options = {}
+        if max_days:
+            options['max_days'] = int(max_days)
+        if max_mileage:
+            options['max_mileage_delta'] = int(max_mileage)
+        if sort_by:
+            options['sort_by'] = sort_by
+        
+        page = 1
+        while True:
+            result = app.maintenance_due(current_user, page=page, **options)
+            
+            if not result['scooters']:
+                print("No scooters due for maintenance.")
+                return
+            
+            print(f"\nPage {result['page']}/{result['pages']} ({result['total']} scooter(s) due):")
+            print("-" * 80)
+            for scooter in result['scooters']:
+                out_of_service = "Yes" if scooter['out_of_service'] else "No"
+                print(f"ID: {scooter['id']} | Serial: {scooter['serial_number']} | "
+                      f"Last maintenance: {scooter['last_maintenance_date']} | "
+                      f"Km since: {scooter['mileage_since_maintenance']} | Out of service: {out_of_service}")
+            
+            if page >= result['pages']:
+                return
+            
+            more = input("\nShow next page? (yes/no): ").strip().lower()
+            if more != 'yes':
+                return
+            page += 1
+            
+    except ValueError as e:
+        print(f"Invalid input: {e}")
+    except ValidationError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print("Failed to load maintenance report. Please try again.")
+
 def update_scooter_flow(app, current_user: CurrentUser):
 
     print("\n" + "-"*30)
@@ -738,11 +938,19 @@ def update_scooter_flow(app, current_user: CurrentUser):
         if new_status:
             updates['status'] = new_status
         
+        new_mileage = input(f"New Mileage (current: {scooter['mileage']}): ")
+        if new_mileage:
+            updates['mileage'] = int(new_mileage)
+        
+        new_maintenance_date = input(f"New Last Maintenance Date (current: {scooter['last_maintenance_date']}): ")
+        if new_maintenance_date:
+            updates['last_maintenance_date'] = new_maintenance_date
+        
         if not updates:
             print("No changes made.")
             return
         
-        success = app.update_scooter(current_user, scooter_id, **updates)
+        success = app.update_scooter(current_user, scooter_id, expected_version=scooter['version'], **updates)
         
         if success:
             print("Scooter updated successfully!")
@@ -756,6 +964,65 @@ def update_scooter_flow(app, current_user: CurrentUser):
     except Exception as e:
         print("Failed to update scooter. Please try again.")
 
+def batch_scooter_flow(app, current_user: CurrentUser):
+
+    print("\n" + "-"*30)
+    print("BATCH SCOOTER OPERATION")
+    print("-"*30)
+    
+    try:
+        operation = input("Operation (update/delete): ").strip().lower()
+        if operation not in ('update', 'delete'):
+            print("Invalid operation.")
+            return
+        
+        print("Select scooters by comma-separated IDs, or leave empty to filter by brand/model/status.")
+        id_list = input("Scooter IDs: ").strip()
+        
+        scooter_ids = None
+        filters = {}
+        if id_list:
+            scooter_ids = [int(part) for part in id_list.split(',') if part.strip()]
+        else:
+            for field in ('brand', 'model', 'status'):
+                value = input(f"Filter {field} (Enter to skip): ").strip()
+                if value:
+                    filters[field] = value
+        
+        if operation == 'update':
+            updates = {}
+            new_status = input("New Status (active/maintenance/retired, Enter to skip): ").strip()
+            if new_status:
+                updates['status'] = new_status
+            out_of_service = input("Out of service (true/false, Enter to skip): ").strip().lower()
+            if out_of_service:
+                updates['out_of_service'] = out_of_service == 'true'
+            
+            if not updates:
+                print("No changes made.")
+                return
+            
+            result = app.batch_update_scooters(current_user, scooter_ids=scooter_ids, filters=filters, **updates)
+            print(f"Updated {len(result['updated'])} scooter(s).")
+        else:
+            confirm = input("Are you sure you want to delete the selected scooters? (yes/no): ").strip().lower()
+            if confirm != 'yes':
+                print("Deletion cancelled.")
+                return
+            
+            result = app.batch_delete_scooters(current_user, scooter_ids=scooter_ids, filters=filters)
+            print(f"Deleted {len(result['deleted'])} scooter(s).")
+        
+        for scooter_id, reason in result['failed'].items():
+            print(f"  Scooter {scooter_id}: {reason}")
+            
+    except ValueError as e:
+        print(f"Invalid input: {e}")
+    except ValidationError as e:
+        print(f"Error: {e}")
+    except Exception as e:
+        print("Failed to run batch operation. Please try again.")
+
 def delete_scooter_flow(app, current_user: CurrentUser):
 
     print("\n" + "-"*30)
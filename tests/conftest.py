@@ -0,0 +1,69 @@
+import json
+import os
+import pytest
+
+@pytest.fixture(scope='session', autouse=True)
+def data_dir(tmp_path_factory):
+    directory = tmp_path_factory.mktemp('um')
+    previous = os.getcwd()
+    os.chdir(directory)
+
+    from src.infrastructure.config import ARGON2_PARAMS_FILE
+    ARGON2_PARAMS_FILE.parent.mkdir(parents=True, exist_ok=True)
+    ARGON2_PARAMS_FILE.write_text(json.dumps({'memory_cost': 8192, 'time_cost': 1, 'parallelism': 1}))
+
+    yield directory
+    os.chdir(previous)
+
+@pytest.fixture(scope='session')
+def app(data_dir):
+    from src.infrastructure.db.sqlite import migrate
+    from src.application.facade import App
+    from src.infrastructure.adapters.user_repo_sqlite import UserRepoSqlite
+    from src.infrastructure.adapters.traveller_repo_sqlite import TravellerRepoSqlite
+    from src.infrastructure.adapters.scooter_repo_sqlite import ScooterRepoSqlite
+    from src.infrastructure.adapters.restore_code_repo_sqlite import RestoreCodeRepoSqlite
+    from src.infrastructure.adapters.log_state_repo_sqlite import LogStateRepoSqlite
+    from src.infrastructure.adapters.password_hasher_argon2 import PasswordHasherArgon2
+    from src.infrastructure.adapters.crypto_box_aesgcm import CryptoBoxAesGcm
+    from src.infrastructure.adapters.sec_logger_encrypted import SecLoggerEncrypted
+    from src.infrastructure.adapters.backup_store_zip import BackupStoreZip
+    from src.infrastructure.adapters.unit_of_work_sqlite import UnitOfWorkSqlite
+    from src.infrastructure.adapters.query_stats_sqlite import QueryStatsSqlite
+    from src.infrastructure.adapters.scooter_history_repo_sqlite import ScooterHistoryRepoSqlite
+    from src.infrastructure.adapters.key_manager_fernet import KeyManagerFernet
+    from src.infrastructure.adapters.token_hasher_hmac import TokenHasherHmac
+    from src.infrastructure.adapters.login_rate_limiter_sqlite import LoginRateLimiterSqlite
+
+    migrate()
+
+    app = App(UserRepoSqlite(), TravellerRepoSqlite(), ScooterRepoSqlite(), RestoreCodeRepoSqlite(),
+              LogStateRepoSqlite(), PasswordHasherArgon2(), CryptoBoxAesGcm(), SecLoggerEncrypted(),
+              BackupStoreZip(), UnitOfWorkSqlite(), QueryStatsSqlite(), ScooterHistoryRepoSqlite(),
+              KeyManagerFernet(), TokenHasherHmac(), LoginRateLimiterSqlite())
+
+    super_admin = app.login('super_admin', 'Admin_123?')
+    app.create_sys_admin(super_admin, 'admin_one', 'Secretpass123!')
+
+    yield app
+    app.close()
+
+@pytest.fixture
+def super_admin(app):
+    return app.login('super_admin', 'Admin_123?')
+
+@pytest.fixture
+def admin(app):
+    return app.login('admin_one', 'Secretpass123!')
+
+_traveller_numbers = iter(range(1, 10**7))
+
+@pytest.fixture
+def add_traveller(app, admin):
+    def add(city='Rotterdam'):
+        n = next(_traveller_numbers)
+        customer_id = app.add_traveller(admin, 'Ann', 'Lee', '1990-01-01', 'female', 'Main', '1', '1234AB', city,
+                                        f't{n}@example.com', '12345678', f'AB{n:07d}')
+        return app.search_travellers(admin, customer_id)[0]
+
+    return add
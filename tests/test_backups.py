@@ -0,0 +1,88 @@
+import json
+import zipfile
+import pytest
+from src.domain.errors import ValidationError
+from src.infrastructure.config import BACKUP_FOLDER, DATABASE_FILE
+
+def _manifest(backup_name):
+    with zipfile.ZipFile(BACKUP_FOLDER / backup_name) as archive:
+        return json.loads(archive.read('manifest.json')), archive.namelist()
+
+def _restore(app, super_admin, admin, backup_name):
+    code = app.generate_restore_code(super_admin, backup_name, 'admin_one')
+    return app.restore_with_code(admin, backup_name, code)
+
+def _customer_ids(app, admin):
+    return {traveller['customer_id'] for traveller in app.search_travellers(admin, '')}
+
+def test_incremental_chain_restores_each_point_in_time(app, super_admin, admin, add_traveller):
+    first = add_traveller()
+    full = app.create_backup(super_admin)
+    at_full = _customer_ids(app, admin)
+
+    second = add_traveller()
+    app.delete_traveller(admin, first['id'])
+    incremental = app.create_backup(super_admin, mode='incremental')
+    at_incremental = _customer_ids(app, admin)
+
+    app.update_traveller(admin, second['id'], city='Breda')
+    add_traveller()
+    differential = app.create_backup(super_admin, mode='differential')
+    at_differential = _customer_ids(app, admin)
+
+    add_traveller()
+
+    manifest, names = _manifest(incremental)
+    assert manifest['type'] == 'incremental'
+    assert manifest['parent'] == full
+    assert manifest['changed']['travellers'] == {'upserted': 1, 'deleted': 1}
+    assert DATABASE_FILE.name not in names
+
+    manifest, _ = _manifest(differential)
+    assert manifest['parent'] == full
+    assert manifest['base'] == full
+
+    for backup_name, expected in ((full, at_full), (incremental, at_incremental), (differential, at_differential)):
+        _restore(app, super_admin, admin, backup_name)
+        assert _customer_ids(app, admin) == expected
+
+    assert app.get_traveller(admin, second['id'])['city'] == 'Breda'
+    assert app.login('admin_one', 'Secretpass123!').role == admin.role
+
+def test_first_backup_after_restore_starts_a_new_chain(app, super_admin, admin):
+    full = app.create_backup(super_admin)
+    _restore(app, super_admin, admin, full)
+
+    backup_name = app.create_backup(super_admin, mode='incremental')
+    manifest, _ = _manifest(backup_name)
+    assert manifest['type'] == 'full'
+
+def test_restore_code_is_single_use(app, super_admin, admin):
+    full = app.create_backup(super_admin)
+    code = app.generate_restore_code(super_admin, full, 'admin_one')
+
+    assert app.restore_with_code(admin, full, code)
+    with pytest.raises(ValidationError):
+        app.restore_with_code(admin, full, code)
+
+def test_super_admin_cannot_restore_directly(app, super_admin):
+    full = app.create_backup(super_admin)
+    with pytest.raises(ValidationError):
+        app.restore_any_backup(super_admin, full)
+
+def test_restore_rejects_a_broken_chain(app, super_admin, admin, add_traveller):
+    full = app.create_backup(super_admin)
+    add_traveller()
+    incremental = app.create_backup(super_admin, mode='incremental')
+    (BACKUP_FOLDER / full).unlink()
+
+    with pytest.raises(ValueError):
+        _restore(app, super_admin, admin, incremental)
+
+def test_unknown_backup_mode_is_rejected(app, super_admin):
+    with pytest.raises(ValidationError):
+        app.create_backup(super_admin, mode='weird')
+
+def test_backup_temp_files_are_cleaned_up(app, super_admin):
+    app.create_backup(super_admin)
+    assert [path.name for path in BACKUP_FOLDER.iterdir() if path.suffix != '.zip'] == []
@@ -0,0 +1,34 @@
+import pytest
+from src.domain.errors import ConflictError
+
+def test_scooter_update_with_stale_version_conflicts(app, admin):
+    scooter_id = app.add_scooter(admin, 'Seg', 'X1', 'SNCONFLICT01', 25, 500, 50, 20, 90, 51.9, 4.4, False, 10,
+                                 '2024-01-01', '2023-01-01')
+    version = app.get_scooter(admin, scooter_id)['version']
+
+    app.update_scooter(admin, scooter_id, expected_version=version, soc=60)
+    with pytest.raises(ConflictError):
+        app.update_scooter(admin, scooter_id, expected_version=version, soc=70)
+
+    scooter = app.get_scooter(admin, scooter_id)
+    assert scooter['soc'] == 60
+    assert scooter['version'] == version + 1
+
+def test_traveller_update_with_stale_version_conflicts(app, admin, add_traveller):
+    traveller = add_traveller()
+
+    app.update_traveller(admin, traveller['id'], expected_version=traveller['version'], city='Breda')
+    with pytest.raises(ConflictError):
+        app.update_traveller(admin, traveller['id'], expected_version=traveller['version'], city='Utrecht')
+
+    assert app.get_traveller(admin, traveller['id'])['city'] == 'Breda'
+
+def test_update_without_expected_version_still_applies(app, admin, add_traveller):
+    traveller = add_traveller()
+
+    app.update_traveller(admin, traveller['id'], city='Breda')
+    app.update_traveller(admin, traveller['id'], city='Utrecht')
+
+    updated = app.get_traveller(admin, traveller['id'])
+    assert updated['city'] == 'Utrecht'
+    assert updated['version'] == traveller['version'] + 2
@@ -0,0 +1,56 @@
+import time
+import pytest
+from src.domain.errors import ValidationError
+from src.infrastructure.crypto import field_box, reencryption
+from src.infrastructure.db.sqlite import get_conn
+
+def _wait_for_reencryption(app, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while app.key_manager.reencryption_status()['running']:
+        assert time.monotonic() < deadline, "re-encryption did not finish"
+        time.sleep(0.05)
+
+def _set_last_name(username_norm, value):
+    conn = get_conn()
+    try:
+        conn.execute("UPDATE users SET last_name_enc = ? WHERE username_norm = ?", (value, username_norm))
+        conn.commit()
+    finally:
+        conn.close()
+
+def test_rotation_reencrypts_and_retirement_keeps_data_readable(app, super_admin, admin, add_traveller):
+    traveller = add_traveller(city='Breda')
+
+    app.rotate_encryption_key(super_admin)
+    _wait_for_reencryption(app)
+    status = app.encryption_key_status(super_admin)
+    assert status['complete']
+    assert status['key_count'] >= 2
+
+    assert app.retire_old_encryption_keys(super_admin) >= 1
+    assert reencryption.key_count() == 1
+    assert app.search_travellers(admin, traveller['customer_id'])[0]['id'] == traveller['id']
+    assert app.login('admin_one', 'Secretpass123!').role == admin.role
+
+def test_retirement_is_refused_while_a_value_fails_to_reencrypt(app, super_admin):
+    app.rotate_encryption_key(super_admin)
+    _wait_for_reencryption(app)
+    key_count = reencryption.key_count()
+
+    _set_last_name('admin_one', b'\x01corrupted')
+    try:
+        with pytest.raises(ValidationError, match="old keys were kept"):
+            app.retire_old_encryption_keys(super_admin)
+        assert reencryption.key_count() == key_count
+    finally:
+        _set_last_name('admin_one', field_box.encrypt(''))
+
+    assert app.retire_old_encryption_keys(super_admin) >= 1
+    assert reencryption.key_count() == 1
+
+def test_retirement_without_old_keys_is_rejected(app, super_admin):
+    if reencryption.key_count() > 1:
+        app.retire_old_encryption_keys(super_admin)
+
+    with pytest.raises(ValidationError):
+        app.retire_old_encryption_keys(super_admin)
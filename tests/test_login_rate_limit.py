@@ -0,0 +1,68 @@
+import pytest
+from src.domain.errors import ValidationError
+from src.domain.policies import FAILED_LOGIN_THRESHOLD, LOGIN_COOLDOWN_MINUTES
+from src.application.security import suspicious
+from src.application.security.expiring_lru import ExpiringLRU
+from src.infrastructure.adapters.login_rate_limiter_memory import LoginRateLimiterMemory
+from src.infrastructure.db import rate_limit_sqlite
+
+NOW = 1_700_000_000.0
+
+def test_bucket_locks_after_threshold_and_unlocks_after_cooldown():
+    username = 'bucket_user'
+    results = [rate_limit_sqlite.record_failure(username, NOW) for _ in range(FAILED_LOGIN_THRESHOLD)]
+
+    assert results == [False] * (FAILED_LOGIN_THRESHOLD - 1) + [True]
+    assert rate_limit_sqlite.is_locked(username, NOW + 1)
+    assert not rate_limit_sqlite.is_locked(username, NOW + LOGIN_COOLDOWN_MINUTES * 60 + 1)
+
+def test_bucket_refills_between_spaced_failures():
+    username = 'slow_user'
+    spacing = 1 / rate_limit_sqlite.REFILL_PER_SECOND
+
+    for attempt in range(FAILED_LOGIN_THRESHOLD * 3):
+        assert not rate_limit_sqlite.record_failure(username, NOW + attempt * spacing)
+
+def test_clear_resets_the_bucket():
+    username = 'cleared_user'
+    for _ in range(FAILED_LOGIN_THRESHOLD - 1):
+        rate_limit_sqlite.record_failure(username, NOW)
+
+    rate_limit_sqlite.clear(username)
+    assert not rate_limit_sqlite.record_failure(username, NOW)
+
+def test_prune_never_drops_an_active_lockout(monkeypatch):
+    monkeypatch.setattr(rate_limit_sqlite, 'MAX_ROWS', 10)
+    for _ in range(FAILED_LOGIN_THRESHOLD):
+        rate_limit_sqlite.record_failure('prune_target', NOW)
+    for i in range(30):
+        rate_limit_sqlite.record_failure(f'prune_junk_{i}', NOW)
+
+    rate_limit_sqlite.prune(NOW)
+    assert rate_limit_sqlite.is_locked('prune_target', NOW)
+    assert rate_limit_sqlite.stats(NOW)['entries'] <= 10
+
+def test_memory_limiter_keeps_lockouts_under_a_spray(monkeypatch):
+    monkeypatch.setattr(suspicious, '_failed_logins', ExpiringLRU(5, 300))
+    monkeypatch.setattr(suspicious, '_cooldowns', ExpiringLRU(5, 120, evict_when_full=False))
+    limiter = LoginRateLimiterMemory()
+
+    for _ in range(FAILED_LOGIN_THRESHOLD):
+        limiter.record_failure('victim')
+    assert limiter.is_locked('victim')
+
+    for i in range(20):
+        for _ in range(FAILED_LOGIN_THRESHOLD):
+            limiter.record_failure(f'junk{i}')
+    assert limiter.is_locked('victim')
+
+def test_login_locks_out_after_repeated_failures(app):
+    for _ in range(FAILED_LOGIN_THRESHOLD):
+        with pytest.raises(ValidationError):
+            app.login('admin_one', 'Wrongpassword1!')
+
+    with pytest.raises(ValidationError, match="wait"):
+        app.login('admin_one', 'Secretpass123!')
+
+    app.login_rate_limiter.clear('admin_one')
+    assert app.login('admin_one', 'Secretpass123!')
@@ -0,0 +1,43 @@
+import pytest
+from src.infrastructure.timeseries.varint_codec import encode, decode, append, last_sample, to_fixed
+
+BASE_TS = 1_700_000_000 - 1_700_000_000 % 3600
+
+def _samples(count):
+    return [(BASE_TS + i * 7, (50 + i) % 101, 51.9 + i * 1e-5, 4.4 - i * 3e-5) for i in range(count)]
+
+def _rounded(samples):
+    return [(ts, soc, round(latitude, 6), round(longitude, 6)) for ts, soc, latitude, longitude in samples]
+
+def test_round_trip():
+    samples = _samples(500)
+    assert _rounded(decode(encode(samples, BASE_TS), BASE_TS)) == _rounded(samples)
+
+def test_empty():
+    assert encode([], BASE_TS) == b''
+    assert decode(b'', BASE_TS) == []
+    assert last_sample(b'', BASE_TS) == (BASE_TS, 0, 0, 0)
+
+@pytest.mark.parametrize('sample', [
+    (BASE_TS, 0, -90.0, -180.0),
+    (BASE_TS + 3599, 100, 90.0, 180.0),
+    (BASE_TS - 10, 100, 0.000001, -0.000001),
+])
+def test_extreme_values(sample):
+    assert _rounded(decode(encode([sample], BASE_TS), BASE_TS)) == _rounded([sample])
+
+def test_append_matches_full_encode():
+    samples = _samples(100)
+    data, last = append((BASE_TS, 0, 0, 0), samples[0])
+    for sample in samples[1:]:
+        delta, last = append(last, sample)
+        data += delta
+
+    assert data == encode(samples, BASE_TS)
+    assert last == to_fixed(samples[-1])
+    assert last_sample(data, BASE_TS) == last
+
+def test_append_encodes_only_the_delta():
+    data = encode(_samples(1000), BASE_TS)
+    delta, _ = append(last_sample(data, BASE_TS), (BASE_TS + 7000, 51, 51.91, 4.39))
+    assert len(delta) < 16
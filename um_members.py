@@ -6,22 +6,30 @@ import os
 if __name__ == "__main__":
     sys.path.insert(0, os.path.dirname(__file__))
 
-from src.infrastructure.db.sqlite import migrate
-from src.application.facade import App
-from src.presentation import cli
-from src.infrastructure.adapters.user_repo_sqlite import UserRepoSqlite
-from src.infrastructure.adapters.traveller_repo_sqlite import TravellerRepoSqlite
-from src.infrastructure.adapters.scooter_repo_sqlite import ScooterRepoSqlite
-from src.infrastructure.adapters.restore_code_repo_sqlite import RestoreCodeRepoSqlite
-from src.infrastructure.adapters.log_state_repo_sqlite import LogStateRepoSqlite
-from src.infrastructure.adapters.password_hasher_argon2 import PasswordHasherArgon2
-from src.infrastructure.adapters.crypto_box_fernet import CryptoBoxFernet
-from src.infrastructure.adapters.sec_logger_encrypted import SecLoggerEncrypted
-from src.infrastructure.adapters.backup_store_zip import BackupStoreZip
-
 def main():
     print("App starting…")
 
+    from src.infrastructure.config import FIELD_ENCRYPTION
+    from src.infrastructure.db.sqlite import migrate
+    from src.application.facade import App
+    from src.presentation import cli
+    from src.infrastructure.adapters.user_repo_sqlite import UserRepoSqlite
+    from src.infrastructure.adapters.traveller_repo_sqlite import TravellerRepoSqlite
+    from src.infrastructure.adapters.scooter_repo_sqlite import ScooterRepoSqlite
+    from src.infrastructure.adapters.restore_code_repo_sqlite import RestoreCodeRepoSqlite
+    from src.infrastructure.adapters.log_state_repo_sqlite import LogStateRepoSqlite
+    from src.infrastructure.adapters.password_hasher_argon2 import PasswordHasherArgon2
+    from src.infrastructure.adapters.crypto_box_fernet import CryptoBoxFernet
+    from src.infrastructure.adapters.crypto_box_aesgcm import CryptoBoxAesGcm
+    from src.infrastructure.adapters.sec_logger_encrypted import SecLoggerEncrypted
+    from src.infrastructure.adapters.backup_store_zip import BackupStoreZip
+    from src.infrastructure.adapters.unit_of_work_sqlite import UnitOfWorkSqlite
+    from src.infrastructure.adapters.query_stats_sqlite import QueryStatsSqlite
+    from src.infrastructure.adapters.scooter_history_repo_sqlite import ScooterHistoryRepoSqlite
+    from src.infrastructure.adapters.key_manager_fernet import KeyManagerFernet
+    from src.infrastructure.adapters.token_hasher_hmac import TokenHasherHmac
+    from src.infrastructure.adapters.login_rate_limiter_sqlite import LoginRateLimiterSqlite
+
     migrate()
 
     user_repo = UserRepoSqlite()
@@ -30,14 +38,28 @@ def main():
     restore_code_repo = RestoreCodeRepoSqlite()
     log_state_repo = LogStateRepoSqlite()
     password_hasher = PasswordHasherArgon2()
-    crypto_box = CryptoBoxFernet()
+    if FIELD_ENCRYPTION == 'aesgcm':
+        crypto_box = CryptoBoxAesGcm(legacy_cache_entries=4096)
+    else:
+        crypto_box = CryptoBoxFernet(cache_entries=4096)
     logger = SecLoggerEncrypted()
     backup_store = BackupStoreZip()
+    unit_of_work = UnitOfWorkSqlite()
+    query_stats = QueryStatsSqlite()
+    scooter_history = ScooterHistoryRepoSqlite()
+    key_manager = KeyManagerFernet()
+    token_hasher = TokenHasherHmac()
+    login_rate_limiter = LoginRateLimiterSqlite()
 
     app = App(user_repo, traveller_repo, scooter_repo, restore_code_repo, log_state_repo, 
-              password_hasher, crypto_box, logger, backup_store)
+              password_hasher, crypto_box, logger, backup_store, unit_of_work,
+              query_stats, scooter_history, key_manager, token_hasher, login_rate_limiter)
 
-    cli.run(app)
+    try:
+        app.run_maintenance_jobs()
+        cli.run(app)
+    finally:
+        app.close()
 
 if __name__ == "__main__":
     main()